@@ -0,0 +1,131 @@
+# benchmarks/bench_ingest.py
+"""
+Ingest throughput against the local ALFRED stand-in (no network, no API key).
+
+  python benchmarks/bench_ingest.py --sizes 24,120 --series 1,8 --concurrency 1,4 \
+      --batch-size 1,50 --latency 0.01 [--error-rate 0.02] [--json out.json]
+
+For every combination it runs `persist_all_vintages` (one series) or
+`ingest_from_registry` (several series) into a fresh temp tree and reports
+vintages/sec, requests/sec, retries and wall time.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+
+from nowcast_gdp import alfred
+from nowcast_gdp.delta import clear_state_cache
+from nowcast_gdp.fakealfred import AlfredStandIn, FaultConfig, synthetic_series
+from nowcast_gdp.ingest_alfred import ingest_from_registry, persist_all_vintages
+
+
+def _ints(s: str) -> List[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+def run_case(
+    srv: AlfredStandIn,
+    series: List[str],
+    concurrency: int,
+    batch_size: int,
+    storage: str = "full",
+) -> Dict[str, float]:
+    alfred.reset_request_stats()
+    clear_state_cache()
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        t0 = time.perf_counter()
+        if len(series) == 1:
+            written = persist_all_vintages(
+                series[0],
+                base=base,
+                concurrency=concurrency,
+                batch_size=batch_size,
+                storage=storage,
+            )
+            n = len(written)
+        else:
+            reg = base / "series.toml"
+            reg.write_text(
+                "".join(f'[series.{s}]\nfred_id = "{s}"\n\n' for s in series), encoding="utf-8"
+            )
+            with redirect_stdout(io.StringIO()):  # per-series progress lines
+                ingest_from_registry(
+                    reg,
+                    active_only=False,
+                    concurrency=concurrency,
+                    batch_size=batch_size,
+                    storage=storage,
+                    base=base,
+                )
+            n = sum(len(list((base / s).glob("*.csv"))) - 1 for s in series)  # minus index.csv
+        wall = time.perf_counter() - t0
+    st = alfred.request_stats()
+    return {
+        "vintages": n,
+        "requests": st.requests,
+        "retries": st.retries,
+        "wall_s": round(wall, 4),
+        "vintages_per_s": round(n / wall, 1) if wall else 0.0,
+        "requests_per_s": round(st.requests / wall, 1) if wall else 0.0,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Benchmark ingest against the local ALFRED stand-in")
+    ap.add_argument("--sizes", default="24,120", help="Vintages per series (comma list)")
+    ap.add_argument("--obs", type=int, default=300, help="Observations per vintage")
+    ap.add_argument("--series", default="1,4", help="Number of series (comma list)")
+    ap.add_argument("--concurrency", default="1,4", help="Worker counts (comma list)")
+    ap.add_argument("--batch-size", default="1,50", help="Vintages per request (comma list)")
+    ap.add_argument("--storage", choices=["full", "delta"], default="full")
+    ap.add_argument("--latency", type=float, default=0.005, help="Server latency per request")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="Server requests/sec (0 = off)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Server 503 probability")
+    ap.add_argument("--json", default=None, help="Also write results to this JSON file")
+    args = ap.parse_args(argv)
+
+    os.environ.setdefault(alfred.API_KEY_ENV, "bench")
+    alfred.RETRY_BACKOFF = 0.05
+    alfred.set_rate_limit(requests_per_minute=1e6, burst=1e3)  # measure the server, not FRED
+
+    results = []
+    header = f"{'vint':>5} {'ser':>4} {'conc':>5} {'batch':>6} {'vint/s':>9} {'req/s':>8} "
+    print(header + f"{'reqs':>6} {'retry':>6} {'wall_s':>8}")
+    for size, n_series in product(_ints(args.sizes), _ints(args.series)):
+        ids = [f"S{i:03d}" for i in range(n_series)]
+        fixture = {sid: synthetic_series(size, args.obs, seed=i) for i, sid in enumerate(ids)}
+        faults = FaultConfig(
+            latency=args.latency,
+            rate_limit=args.rate_limit,
+            retry_after=1,
+            error_rate=args.error_rate,
+        )
+        with AlfredStandIn(fixture, faults) as srv:
+            alfred.set_base_url(srv.url)
+            for conc, batch in product(_ints(args.concurrency), _ints(args.batch_size)):
+                r = run_case(srv, ids, conc, batch, storage=args.storage)
+                r.update(size=size, series=n_series, concurrency=conc, batch_size=batch)
+                results.append(r)
+                print(
+                    f"{size:>5} {n_series:>4} {conc:>5} {batch:>6} {r['vintages_per_s']:>9} "
+                    f"{r['requests_per_s']:>8} {r['requests']:>6} {r['retries']:>6} "
+                    f"{r['wall_s']:>8}"
+                )
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,240 @@
+# benchmarks/suite.py
+"""
+Synthetic-scale benchmarks for the read/write hot paths, with a regression gate.
+
+  python benchmarks/suite.py --scales small,medium --out results.json
+  python benchmarks/suite.py --scales small --compare benchmarks/baseline.json --threshold 1.0
+
+Each scale generates a vintage tree: index.csv lists every vintage, and full vintage
+CSVs are written for a sample of vintages (the latest ones plus evenly spaced ones),
+since 10k x 50k fully materialised vintages would be ~10 GB. Every case reports the
+min and median wall time over `--repeat` runs; `--compare` exits 1 when a case's min
+time exceeds the baseline's by more than `--threshold` (relative) and `--min-delta`
+seconds (absolute, to ignore timer noise on tiny cases).
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from nowcast_gdp import dataio
+from nowcast_gdp.backtest import run_backtest
+from nowcast_gdp.baselines.batch import drift_forecast_batch
+from nowcast_gdp.baselines.bl1 import drift_forecast
+from nowcast_gdp.io import update_index, write_index_unique_sorted
+from nowcast_gdp.resultcache import ResultCache
+from nowcast_gdp.store import compact_series
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    vintages: int
+    obs: int
+    files: int  # vintages materialised as full CSVs
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale("tiny", 50, 500, 4),
+    "small": Scale("small", 500, 5_000, 8),
+    "medium": Scale("medium", 2_000, 20_000, 8),
+    "large": Scale("large", 10_000, 50_000, 8),
+}
+
+SERIES = "BENCH"
+BT_SERIES = "BENCHBT"  # every vintage materialised, for the backtest cases
+BT_OBS = 240
+V0 = date(2000, 1, 3)
+OBS0 = date(1900, 1, 1)
+
+
+# ---------- synthetic tree ----------
+def generate_tree(root: Path, scale: Scale, seed: int = 0) -> List[date]:
+    """Write `root/BENCH` for `scale`; returns the vintage dates (ascending)."""
+    sdir = root / SERIES
+    sdir.mkdir(parents=True, exist_ok=True)
+    vintages = [V0 + timedelta(days=i) for i in range(scale.vintages)]
+    (sdir / "index.csv").write_text(
+        "\n".join(v.isoformat() for v in vintages) + "\n", encoding="utf-8"
+    )
+
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64(OBS0), np.datetime64(OBS0) + scale.obs).astype(str)
+    level = 100 + rng.normal(size=scale.obs).cumsum()
+    picks = set(np.linspace(0, scale.vintages - 1, scale.files // 2, dtype=int).tolist())
+    picks |= set(range(max(0, scale.vintages - scale.files // 2), scale.vintages))
+    for i in sorted(picks):
+        n = max(1, scale.obs - (scale.vintages - 1 - i) // 10)  # later vintages know more
+        vals = level[:n] + rng.normal(scale=0.01, size=n)
+        body = "\n".join(f"{d},{x:.6f}" for d, x in zip(dates[:n], vals))
+        (sdir / f"{vintages[i].isoformat()}.csv").write_text(
+            "date,value\n" + body + "\n", encoding="utf-8"
+        )
+    return vintages
+
+
+def generate_backtest_tree(root: Path, scale: Scale, seed: int = 1) -> None:
+    """Write `root/BENCHBT`: `scale.vintages` short vintages, every one stored."""
+    sdir = root / BT_SERIES
+    sdir.mkdir(parents=True, exist_ok=True)
+    vintages = [V0 + timedelta(days=i) for i in range(scale.vintages)]
+    (sdir / "index.csv").write_text(
+        "\n".join(v.isoformat() for v in vintages) + "\n", encoding="utf-8"
+    )
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64(OBS0), np.datetime64(OBS0) + BT_OBS).astype(str)
+    level = 100 + rng.normal(size=BT_OBS).cumsum()
+    for i, v in enumerate(vintages):
+        n = BT_OBS // 2 + i * (BT_OBS // 2) // scale.vintages
+        body = "\n".join(f"{d},{x:.4f}" for d, x in zip(dates[:n], level[:n]))
+        (sdir / f"{v.isoformat()}.csv").write_text("date,value\n" + body + "\n", "utf-8")
+
+
+# ---------- timing ----------
+def _time(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None):
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return {"min_s": min(runs), "median_s": statistics.median(runs), "repeat": repeat}
+
+
+def _cold() -> None:
+    dataio.clear_cache()
+    dataio.clear_vintage_cache()
+
+
+def run_scale(root: Path, scale: Scale, repeat: int) -> Dict[str, Dict[str, float]]:
+    vintages = generate_tree(root, scale)
+    # index mutations run on a copy so the tree's index keeps matching its files
+    idx = root / "index_scratch.csv"
+    idx.write_bytes((root / SERIES / "index.csv").read_bytes())
+    stored = sorted(dataio._scan_vintages_from_files(root / SERIES))
+    asof = stored[len(stored) // 4]
+    _cold()
+    _, latest_vals = dataio.read_latest_series(SERIES, root)
+    matrix = np.tile(np.asarray(latest_vals[-2_000:]), (256, 1))
+    nxt = iter(range(1, 1_000_000))
+
+    cases: Dict[str, Dict[str, float]] = {}
+    cases["index_read"] = _time(lambda: dataio.list_vintages(SERIES, root), repeat, _cold)
+    cases["index_append"] = _time(
+        lambda: update_index(idx, [(vintages[-1] + timedelta(days=next(nxt))).isoformat()]),
+        repeat,
+    )
+    cases["index_rewrite"] = _time(
+        lambda: write_index_unique_sorted(idx, [(V0 - timedelta(days=next(nxt))).isoformat()]),
+        repeat,
+    )
+    cases["latest_vintage"] = _time(lambda: dataio.latest_vintage(SERIES, root), repeat, _cold)
+    cases["read_latest_cold"] = _time(
+        lambda: dataio.read_latest_series(SERIES, root), repeat, _cold
+    )
+    cases["read_latest_warm"] = _time(lambda: dataio.read_latest_series(SERIES, root), repeat)
+    cases["read_asof_cold"] = _time(
+        lambda: dataio.read_series_as_of(SERIES, asof, root), repeat, _cold
+    )
+    cases["drift_forecast"] = _time(lambda: drift_forecast(latest_vals, 8, window=4), repeat)
+    cases["drift_batch_256"] = _time(lambda: drift_forecast_batch(matrix, 8, window=4), repeat)
+
+    # the result cache must not cost more than recomputing the (cheap) baselines
+    generate_backtest_tree(root, scale)
+    compact_series(root / BT_SERIES)  # both cases read the columnar store
+    cache = ResultCache.for_base(root)
+    run_backtest([BT_SERIES], h=4, base=root, cache=cache)  # warm it
+    cases["backtest_nocache"] = _time(lambda: run_backtest([BT_SERIES], h=4, base=root), repeat)
+    cases["backtest_cache_warm"] = _time(
+        lambda: run_backtest([BT_SERIES], h=4, base=root, cache=cache), repeat
+    )
+    return cases
+
+
+def run_suite(scales: List[str], repeat: int = 5, workdir: Optional[Path] = None) -> Dict:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for name in scales:
+            root = Path(tmp) / name
+            for case, r in run_scale(root, SCALES[name], repeat).items():
+                results[f"{name}/{case}"] = r
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "scales": {n: SCALES[n].__dict__ for n in scales},
+        },
+        "results": results,
+    }
+
+
+# ---------- regression gate ----------
+def compare(
+    current: Dict, baseline: Dict, threshold: float = 0.25, min_delta: float = 0.002
+) -> List[str]:
+    """Names (with ratios) of cases whose min time regressed beyond both limits."""
+    bad = []
+    for case, base in baseline.get("results", {}).items():
+        cur = current.get("results", {}).get(case)
+        if cur is None:
+            continue
+        b, c = base["min_s"], cur["min_s"]
+        if c > b * (1 + threshold) and c - b > min_delta:
+            bad.append(f"{case}: {c * 1000:.2f} ms vs baseline {b * 1000:.2f} ms ({c / b:.2f}x)")
+    return bad
+
+
+def _print(results: Dict, baseline: Optional[Dict]) -> None:
+    print(f"{'case':<28} {'min ms':>10} {'median ms':>10} {'baseline':>10}")
+    for case, r in results["results"].items():
+        b = (baseline or {}).get("results", {}).get(case)
+        ref = f"{b['min_s'] * 1000:10.2f}" if b else f"{'-':>10}"
+        print(f"{case:<28} {r['min_s'] * 1000:10.2f} {r['median_s'] * 1000:10.2f} {ref}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Synthetic-scale benchmark suite with regression gate")
+    ap.add_argument("--scales", default="small", help=f"Comma list of {', '.join(SCALES)}")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per case (min is compared)")
+    ap.add_argument("--out", default=None, help="Write results JSON here")
+    ap.add_argument("--compare", default=None, help="Baseline JSON to gate against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    ap.add_argument("--min-delta", type=float, default=0.002, help="Ignore slowdowns below (s)")
+    ap.add_argument("--workdir", default=None, help="Where to generate the synthetic trees")
+    args = ap.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        ap.error(f"unknown scale(s): {', '.join(unknown)}")
+    results = run_suite(scales, repeat=max(1, args.repeat), workdir=args.workdir)
+    baseline = json.loads(Path(args.compare).read_text("utf-8")) if args.compare else None
+    _print(results, baseline)
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if baseline is not None:
+        bad = compare(results, baseline, args.threshold, args.min_delta)
+        for line in bad:
+            print(f"[regression] {line}")
+        if bad:
+            return 1
+        print(f"[metrics-gate] OK ({len(results['results'])} cases within {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
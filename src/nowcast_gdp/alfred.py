@@ -4,22 +4,97 @@ import os
 import time
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
+import numpy as np
 import requests
 
-BASE_URL = "https://api.stlouisfed.org/fred"
+from .jsonstream import batched, iter_array_items
+from .metrics import METRICS
+from .observations import Observation, ObservationBlock
+from .ratelimit import TokenBucket
+
+# FRED_BASE_URL points the client at a stand-in (see nowcast_gdp.fakealfred)
+BASE_URL = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org/fred").rstrip("/")
 API_KEY_ENV = "FRED_API_KEY"
 
+# FRED allows 120 requests/minute per API key. Stay a little under it and keep the
+# burst small so that burst + refill never exceeds the limit in any 60s window.
+DEFAULT_REQUESTS_PER_MINUTE = 110.0
+DEFAULT_BURST = 10.0
+
+# observations endpoint paging limit (FRED max is 100000 rows per response)
+OBSERVATIONS_PAGE_LIMIT = 100000
+# vintages requested per batched observations call
+DEFAULT_VINTAGE_CHUNK = 100
+
+# streamed observation responses: bytes per socket read, rows per chunk handed on
+STREAM_READ_BYTES = 64 * 1024
+STREAM_CHUNK_ROWS = 10_000
+# re-requests (from the last row received) after a connection drops mid-body
+MAX_STREAM_RESTARTS = 3
+
+# first retry delay for 5xx / connection errors (doubles per attempt, capped at 30s)
+RETRY_BACKOFF = 1.0
+
+_BUCKET = TokenBucket(rate=DEFAULT_REQUESTS_PER_MINUTE / 60.0, capacity=DEFAULT_BURST)
+
+
+def set_rate_limit(
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    burst: float = DEFAULT_BURST,
+) -> TokenBucket:
+    """Replace the process-wide token bucket used by every FRED request."""
+    global _BUCKET
+    _BUCKET = TokenBucket(rate=requests_per_minute / 60.0, capacity=burst)
+    return _BUCKET
+
+
+def get_rate_limiter() -> TokenBucket:
+    return _BUCKET
+
+
+def set_base_url(url: str) -> None:
+    """Point every FRED request at `url` (e.g. a local stand-in server)."""
+    global BASE_URL
+    BASE_URL = url.rstrip("/")
+
 
 @dataclass(frozen=True)
-class Observation:
-    date: date
-    value: Optional[float]  # None when FRED provides blanks/NaN
+class RequestStats:
+    requests: int  # HTTP attempts, including retries
+    retries: int  # attempts that were retried (429, 5xx, connection errors)
+    throttled: int  # 429 responses
+    server_errors: int  # 5xx responses
+    failures: int  # calls that gave up after all attempts
+
+
+def request_stats() -> RequestStats:
+    """Process-wide request counters since start (or the last reset); see `metrics.METRICS`."""
+    t = METRICS.totals()
+    return RequestStats(
+        requests=int(t["attempts"]),
+        retries=int(t["attempts"] - t["calls"]),
+        throttled=int(t["throttled"]),
+        server_errors=int(t["server_errors"]),
+        failures=int(t["failures"]),
+    )
+
+
+def reset_request_stats() -> None:
+    METRICS.reset()
 
 
-def _get(path: str, **params: Any) -> Dict[str, Any]:
-    """GET JSON with retries + 429 (Retry-After) handling."""
+def _get(path: str, _stream: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+    """
+    GET JSON with retries + 429 (Retry-After) handling.
+    Every attempt takes a token from the shared bucket; a 429 pauses the bucket
+    so all concurrent workers back off together.
+
+    With `_stream="observations"` the body is not read up front: the returned dict's
+    `observations` is an iterator parsing rows off the socket, and the other members
+    (count, offset, ...) appear in the dict as the parser passes them.
+    """
     api_key = os.getenv(API_KEY_ENV)
     if not api_key:
         raise RuntimeError(f"{API_KEY_ENV} is not set; export your FRED API key")
@@ -28,20 +103,47 @@ def _get(path: str, **params: Any) -> Dict[str, Any]:
     q = {"api_key": api_key, "file_type": "json", **params}
 
     max_attempts = 6
-    backoff = 1.0
+    backoff = RETRY_BACKOFF
     last_exc: Optional[Exception] = None
+    series_id = params.get("series_id")
 
     for attempt in range(1, max_attempts + 1):
+        waited = _BUCKET.acquire()
+        METRICS.record_sleep(path, "ratelimit", waited)
+        t0 = time.perf_counter()
         try:
-            resp = requests.get(url, params=q, timeout=30)
+            resp = requests.get(url, params=q, timeout=30, stream=_stream is not None)
+        except requests.RequestException as exc:
+            METRICS.record_attempt(
+                path, "error", time.perf_counter() - t0, series_id=series_id, attempt=attempt
+            )
+            last_exc = exc
+            if attempt == max_attempts:
+                break
+            time.sleep(backoff)
+            METRICS.record_sleep(path, "backoff", backoff)
+            backoff = min(backoff * 2, 30.0)
+            continue
+        ok_stream = _stream is not None and resp.status_code < 400
+        if not ok_stream:
+            METRICS.record_attempt(
+                path,
+                str(resp.status_code),
+                time.perf_counter() - t0,
+                len(resp.content),
+                series_id=series_id,
+                attempt=attempt,
+            )
 
+        try:
             # 429: respect Retry-After if provided, else backoff
             if resp.status_code == 429:
                 ra = resp.headers.get("Retry-After")
                 sleep_for = float(ra) if (ra and ra.isdigit()) else backoff
                 if attempt == max_attempts:
                     resp.raise_for_status()
-                time.sleep(sleep_for)
+                _BUCKET.pause(sleep_for)
+                METRICS.record_sleep(path, "throttle", sleep_for)
                 backoff = min(backoff * 2, 30.0)
                 continue
 
@@ -50,48 +152,202 @@ def _get(path: str, **params: Any) -> Dict[str, Any]:
                 if attempt == max_attempts:
                     resp.raise_for_status()
                 time.sleep(backoff)
+                METRICS.record_sleep(path, "backoff", backoff)
                 backoff = min(backoff * 2, 30.0)
                 continue
 
             resp.raise_for_status()
-            return resp.json()
+            if ok_stream:
+                # recorded once the body has been read: bytes counted off the socket
+                # (Content-Length is absent for chunked responses), latency incl. transfer
+                def _done(nbytes: int) -> None:
+                    METRICS.record_attempt(
+                        path,
+                        str(resp.status_code),
+                        time.perf_counter() - t0,
+                        nbytes,
+                        series_id=series_id,
+                        attempt=attempt,
+                    )
 
+                payload = _stream_payload(resp, _stream, _done)
+            else:
+                payload = resp.json()
         except requests.RequestException as exc:
             last_exc = exc
             if attempt == max_attempts:
                 break
             time.sleep(backoff)
+            METRICS.record_sleep(path, "backoff", backoff)
             backoff = min(backoff * 2, 30.0)
+            continue
+        METRICS.record_call(path, ok=True)
+        return payload
 
+    METRICS.record_call(path, ok=False)
     raise RuntimeError(f"FRED request failed for {path} with params {q}") from last_exc
 
 
-def list_vintage_dates(series_id: str) -> List[date]:
-    """Return all ALFRED vintage dates for a series."""
-    j = _get("series/vintagedates", series_id=series_id)
+def _stream_payload(
+    resp: requests.Response, key: str, on_done: Callable[[int], None] = lambda n: None
+) -> Dict[str, Any]:
+    header: Dict[str, Any] = {}
+    nbytes = 0
+
+    def _counted() -> Iterator[bytes]:
+        nonlocal nbytes
+        for chunk in resp.iter_content(STREAM_READ_BYTES):
+            nbytes += len(chunk)
+            yield chunk
+
+    def _items():
+        try:
+            with resp:  # releases the connection when done or abandoned
+                yield from iter_array_items(_counted(), key, header)
+        finally:
+            on_done(nbytes)
+
+    header[key] = _items()
+    return header
+
+
+def list_vintage_dates(series_id: str, realtime_start: Optional[date] = None) -> List[date]:
+    """
+    Return the ALFRED vintage dates for a series; with `realtime_start` only the
+    vintages from that date on (a tiny response when polling for new vintages).
+    """
+    params: Dict[str, Any] = {"series_id": series_id}
+    if realtime_start is not None:
+        params["realtime_start"] = realtime_start.isoformat()
+    j = _get("series/vintagedates", **params)
     return [date.fromisoformat(s) for s in (j.get("vintage_dates", []) or [])]
 
 
-def fetch_observations_for_vintage(series_id: str, vintage: date) -> List[Observation]:
-    """Fetch observations for a series at a given vintage date."""
-    j = _get(
-        "series/observations",
-        series_id=series_id,
-        vintage_dates=vintage.isoformat(),
-    )
-    out: List[Observation] = []
-    for row in j.get("observations", []) or []:
-        d = date.fromisoformat(row["date"])
-        vs = row.get("value", "")
-        if vs in ("", ".", "NaN", "nan"):
-            v: Optional[float] = None
-        else:
-            try:
-                v = float(vs)
-            except ValueError:
-                v = None
-        out.append(Observation(date=d, value=v))
+def list_release_dates(release_id: int, realtime_start: Optional[date] = None) -> List[date]:
+    """
+    Scheduled and past dates of a FRED release (e.g. 53 = GDP), including future
+    dates that have no data yet, ascending.
+    """
+    params: Dict[str, Any] = {
+        "release_id": int(release_id),
+        "include_release_dates_with_no_data": "true",
+        "realtime_end": "9999-12-31",
+        "sort_order": "asc",
+    }
+    if realtime_start is not None:
+        params["realtime_start"] = realtime_start.isoformat()
+    j = _get("release/dates", **params)
+    return sorted({date.fromisoformat(r["date"]) for r in (j.get("release_dates") or [])})
+
+
+def fetch_observations_for_vintage(series_id: str, vintage: date) -> ObservationBlock:
+    """
+    Fetch observations for a series at a given vintage date, as an array-backed
+    block (iterating it yields `Observation` rows). The response is parsed as it
+    streams in, so no JSON tree of the whole body is ever built.
+    """
+    return ObservationBlock.concat(iter_vintage_blocks(series_id, vintage))
+
+
+def iter_vintage_blocks(
+    series_id: str, vintage: date, chunk_rows: int = STREAM_CHUNK_ROWS
+) -> Iterator[ObservationBlock]:
+    """One vintage as blocks of at most `chunk_rows` rows, for writing as they arrive."""
+    return iter_observation_blocks(series_id, chunk_rows, vintage_dates=vintage.isoformat())
+
+
+def iter_observation_blocks(
+    series_id: str, chunk_rows: int = STREAM_CHUNK_ROWS, **params: Any
+) -> Iterator[ObservationBlock]:
+    """Observations as blocks of at most `chunk_rows` rows, in response order."""
+    for rows in _iter_observation_pages(series_id, chunk_rows=chunk_rows, **params):
+        yield ObservationBlock.from_json_rows(rows)
+
+
+def _iter_observation_pages(
+    series_id: str, chunk_rows: int = STREAM_CHUNK_ROWS, **params: Any
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of a (possibly large, paged) observations request in lists of at
+    most `chunk_rows`, parsed incrementally off the socket. A connection dropped
+    mid-body is resumed from the last row received.
+    """
+    offset = 0
+    restarts = 0
+    while True:
+        j = _get(
+            "series/observations",
+            _stream="observations",
+            series_id=series_id,
+            limit=OBSERVATIONS_PAGE_LIMIT,
+            offset=offset,
+            **params,
+        )
+        got = 0
+        try:
+            for rows in batched(j.get("observations", []) or [], chunk_rows):
+                got += len(rows)
+                yield rows
+        except (requests.RequestException, ValueError) as exc:
+            restarts += 1
+            if restarts > MAX_STREAM_RESTARTS:
+                raise RuntimeError(f"observations stream for {series_id} kept failing") from exc
+            offset += got
+            continue
+        offset += got
+        count = int(j.get("count", 0) or 0)
+        if not got or offset >= count:
+            return
+
+
+def fetch_observations_for_vintages(
+    series_id: str, vintages: Sequence[date]
+) -> Dict[date, ObservationBlock]:
+    """
+    Fetch several vintages in a single request and split them locally.
+
+    ALFRED answers a comma-separated `vintage_dates` list with one row per
+    realtime period (realtime_start..realtime_end); a row belongs to every
+    requested vintage that falls inside its period. Returns {vintage: block}
+    with observations sorted by date, one entry per requested vintage.
+    """
+    vs = sorted(set(vintages))
+    if not vs:
+        return {}
+    # rows -> compact arrays one chunk at a time; only the arrays are kept
+    first, last = vs[0].isoformat(), vs[-1].isoformat()
+    blocks, starts, ends = [], [], []
+    for rows in _iter_observation_pages(
+        series_id, vintage_dates=",".join(v.isoformat() for v in vs)
+    ):
+        blocks.append(ObservationBlock.from_json_rows(rows))
+        starts.append(np.array([r.get("realtime_start") or first for r in rows], "datetime64[D]"))
+        ends.append(np.array([r.get("realtime_end") or last for r in rows], "datetime64[D]"))
+    if not blocks:
+        return {v: ObservationBlock.empty() for v in vs}
+    block, rs, re_ = ObservationBlock.concat(blocks), np.concatenate(starts), np.concatenate(ends)
+    order = np.argsort(block.days, kind="stable")
+    block, rs, re_ = block.take(order), rs[order], re_[order]
+    out: Dict[date, ObservationBlock] = {}
+    for v in vs:
+        v64 = np.datetime64(v, "D")
+        out[v] = block.take(((rs <= v64) & (re_ >= v64)).nonzero()[0])
     return out
 
 
-__all__ = ["Observation", "list_vintage_dates", "fetch_observations_for_vintage"]
+__all__ = [
+    "Observation",
+    "ObservationBlock",
+    "list_vintage_dates",
+    "list_release_dates",
+    "fetch_observations_for_vintage",
+    "fetch_observations_for_vintages",
+    "iter_observation_blocks",
+    "iter_vintage_blocks",
+    "set_rate_limit",
+    "get_rate_limiter",
+    "set_base_url",
+    "RequestStats",
+    "request_stats",
+    "reset_request_stats",
+]
@@ -0,0 +1,387 @@
+# src/nowcast_gdp/backtest.py
+"""
+Pseudo-real-time backtest of the baselines over every stored vintage.
+
+For each vintage the model sees only that vintage's data and forecasts the next
+`h` observation periods; forecasts are scored against the first release and the
+latest release of each target period.
+
+  python -m nowcast_gdp.backtest --series GDP --model bl0,bl1 --h 4 --workers 4 \\
+      --out backtest.csv --scores-out scores.csv
+"""
+
+from __future__ import annotations
+
+import math
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .baselines.batch import drift_forecast_batch, forecast_last_batch, last_valid_index
+from .dataio import _series_dir, list_vintages
+from .resultcache import DEFAULT_MAX_BYTES, ResultCache, column_digests, result_key
+from .store import Triangle, build_triangle, has_store, load_triangle
+
+MODELS = ("bl0", "bl1")
+
+FORECAST_COLUMNS = [
+    "series",
+    "model",
+    "vintage",
+    "origin",
+    "horizon",
+    "target_date",
+    "forecast",
+    "first_release",
+    "latest_release",
+    "err_first",
+    "err_latest",
+]
+
+
+# ---------- models ----------
+def forecast_batch(model: str, y: np.ndarray, h: int, window: int = 4) -> np.ndarray:
+    """Dispatch to a batched baseline: rows of `y` -> (n, h) forecasts."""
+    if model == "bl0":
+        return forecast_last_batch(y, h)
+    if model == "bl1":
+        return drift_forecast_batch(y, h, window=window)
+    raise ValueError(f"Unknown model {model!r}; choose from {', '.join(MODELS)}")
+
+
+def _forecast_block(
+    model: str, h: int, window: int, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forecast every vintage column of an (n_obs, k) block.
+    Returns ((k, h) forecasts, (k,) row index of the last observation; -1 if empty).
+    Runs in worker processes, so it only takes picklable arguments.
+    """
+    cols = values.T
+    return forecast_batch(model, cols, h, window), last_valid_index(cols)
+
+
+# ---------- data ----------
+def load_series_triangle(series_id: str, base: Path | None = None) -> Triangle:
+    """The columnar store when compacted, otherwise a triangle parsed from the vintage CSVs."""
+    sdir = _series_dir(series_id, base)
+    if has_store(sdir):
+        return load_triangle(sdir)
+    return build_triangle(sdir, list_vintages(series_id, base))
+
+
+def release_values(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per observation row: (first published value, latest published value); NaN if never."""
+    mask = ~np.isnan(values)
+    has = mask.any(axis=1)
+    rows = np.arange(values.shape[0])
+    first_j = mask.argmax(axis=1)
+    last_j = values.shape[1] - 1 - mask[:, ::-1].argmax(axis=1)
+    first = np.where(has, values[rows, first_j], np.nan)
+    latest = np.where(has, values[rows, last_j], np.nan)
+    return first, latest
+
+
+def _shift_dates(origins: np.ndarray, steps: np.ndarray, obs_dates: np.ndarray) -> np.ndarray:
+    """Extrapolate `steps` periods past `origins` using the spacing of the observation grid."""
+    if len(obs_dates) < 2:
+        return np.full(steps.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+    gap = int(np.median(np.diff(obs_dates[-12:]).astype(np.int64)))
+    if gap >= 28:  # monthly or coarser: step in calendar months
+        months = max(1, round(gap / 30.44))
+        return (origins.astype("datetime64[M]") + steps * months).astype("datetime64[D]")
+    return origins + steps * gap
+
+
+# ---------- engine ----------
+def _chunks(n: int, parts: int) -> List[Tuple[int, int]]:
+    size = max(1, math.ceil(n / max(1, parts)))
+    return [(i, min(n, i + size)) for i in range(0, n, size)]
+
+
+def model_params(model: str, h: int, window: int) -> Dict[str, int]:
+    """The parameters a model's forecasts depend on (part of the result-cache key)."""
+    return {"h": h, "window": window} if model == "bl1" else {"h": h}
+
+
+def _entry_dtype(h: int) -> np.dtype:
+    """A backtest cache row: vintage digest, last observed day (NaN if none), h forecasts."""
+    return np.dtype([("digest", "S32"), ("day", "f8"), ("fc", "f8", (h,))])
+
+
+def _cached_columns(
+    entry: Optional[np.ndarray],
+    digests: np.ndarray,
+    obs_days: np.ndarray,
+    fc: np.ndarray,
+    last: np.ndarray,
+) -> np.ndarray:
+    """Fill `fc`/`last` rows whose digest the block entry holds; return the positions left."""
+    if entry is None:
+        return np.arange(len(digests))
+    rows = {d: i for i, d in enumerate(entry["digest"].tolist())}
+    idx = np.array([rows.get(d, -1) for d in digests.tolist()], dtype=np.int64)
+    hit = idx >= 0
+    fc[hit] = entry["fc"][idx[hit]]
+    day = entry["day"][idx[hit]]
+    seen = ~np.isnan(day)
+    pos = np.flatnonzero(hit)
+    last[pos[seen]] = np.searchsorted(obs_days, day[seen].astype(np.int64))
+    return np.flatnonzero(~hit)
+
+
+def _merged_entry(
+    entry: Optional[np.ndarray],
+    digests: np.ndarray,
+    obs_days: np.ndarray,
+    fc: np.ndarray,
+    last: np.ndarray,
+    computed: np.ndarray,
+) -> np.ndarray:
+    """The block entry plus rows for the `computed` columns (replacing equal digests)."""
+    new = np.zeros(len(computed), dtype=_entry_dtype(fc.shape[1]))
+    new["digest"] = digests[computed]
+    lc = last[computed]
+    new["day"] = np.where(lc >= 0, obs_days[np.maximum(lc, 0)], np.nan)
+    new["fc"] = fc[computed]
+    if entry is None:
+        return new
+    return np.concatenate([entry[~np.isin(entry["digest"], new["digest"])], new])
+
+
+def run_backtest(
+    series: Sequence[str],
+    models: Sequence[str] = MODELS,
+    h: int = 4,
+    window: int = 4,
+    base: Path | None = None,
+    workers: int = 1,
+    vintage_start: Optional[date] = None,
+    vintage_end: Optional[date] = None,
+    cache: Optional[ResultCache] = None,
+) -> pd.DataFrame:
+    """
+    Forecast from every vintage of every series with every model; one tidy row per
+    (series, model, vintage, horizon) with the first/latest release and errors.
+    `workers > 1` spreads vintage blocks over a process pool. With a `cache`, only
+    vintages whose content has no stored result for the model/params are computed;
+    each (series, model) block is one cache entry, and the frame's `attrs` hold how
+    many vintage forecasts were "reused" and "computed".
+    """
+    if h < 1:
+        raise ValueError("h must be >= 1")
+    for m in models:
+        if m not in MODELS:
+            raise ValueError(f"Unknown model {m!r}; choose from {', '.join(MODELS)}")
+
+    # actuals come from the full history; only the forecast origins are restricted
+    tris = {sid: load_series_triangle(sid, base) for sid in series}
+    values = {sid: np.asarray(tri.values) for sid, tri in tris.items()}
+    releases = {sid: release_values(v) for sid, v in values.items()}
+    obs_days = {
+        sid: tri.obs_dates.astype("datetime64[D]").astype(np.int64) for sid, tri in tris.items()
+    }
+
+    # one output block per (series, model); tasks cover the vintage columns to compute
+    parts = max(1, workers) * 4
+    blocks = []
+    tasks = []
+    cached: Dict[int, Tuple[str, Optional[np.ndarray], np.ndarray, np.ndarray]] = {}
+    for sid in series:
+        lo, hi = _vintage_bounds(tris[sid].vintages, vintage_start, vintage_end)
+        if hi == lo:
+            continue
+        digests = None
+        if cache is not None:
+            digests = np.array(
+                column_digests(tris[sid].obs_dates, values[sid][:, lo:hi]), dtype="S32"
+            )
+        for m in models:
+            fc = np.full((hi - lo, h), np.nan)
+            last = np.full(hi - lo, -1, dtype=np.int64)
+            todo = np.arange(hi - lo)
+            b = len(blocks)
+            if cache is not None:
+                key = result_key(m, model_params(m, h, window), sid, "", kind="backtest")
+                entry = cache.get(key, dtype=_entry_dtype(h))
+                todo = _cached_columns(entry, digests, obs_days[sid], fc, last)
+                cached[b] = (key, entry, digests, todo)
+            blocks.append((sid, m, lo, hi, fc, last))
+            tasks.extend((b, todo[i0:i1]) for i0, i1 in _chunks(len(todo), parts))
+
+    def _args(t):
+        b, cols = t
+        sid, m, lo = blocks[b][:3]
+        return m, h, window, np.ascontiguousarray(values[sid][:, lo + cols])
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = [_forecast_block(*_args(t)) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futs = [pool.submit(_forecast_block, *_args(t)) for t in tasks]
+            results = [f.result() for f in futs]
+
+    for (b, cols), (fc_part, last_part) in zip(tasks, results):
+        fc, last = blocks[b][4:]
+        fc[cols], last[cols] = fc_part, last_part
+    for b, (key, entry, digests, todo) in cached.items():
+        if len(todo):  # a fully reused block costs no write
+            sid, _, _, _, fc, last = blocks[b]
+            cache.put(key, _merged_entry(entry, digests, obs_days[sid], fc, last, todo))
+
+    frames = [
+        _frame(sid, m, tris[sid], releases[sid], lo, hi, fc, last)
+        for sid, m, lo, hi, fc, last in blocks
+    ]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FORECAST_COLUMNS)
+    if cache is not None:
+        computed = sum(len(todo) for _, _, _, todo in cached.values())
+        total = sum(hi - lo for _, _, lo, hi, _, _ in blocks)
+        df.attrs.update(reused=total - computed, computed=computed)
+    return df
+
+
+def _vintage_bounds(
+    vintages: np.ndarray, start: Optional[date], end: Optional[date]
+) -> Tuple[int, int]:
+    lo = 0 if start is None else int(np.searchsorted(vintages, np.datetime64(start, "D")))
+    hi = (
+        len(vintages)
+        if end is None
+        else int(np.searchsorted(vintages, np.datetime64(end, "D"), side="right"))
+    )
+    return lo, max(lo, hi)
+
+
+def _frame(
+    series_id: str,
+    model: str,
+    tri: Triangle,
+    releases: Tuple[np.ndarray, np.ndarray],
+    j0: int,
+    j1: int,
+    fc: np.ndarray,
+    last: np.ndarray,
+) -> pd.DataFrame:
+    keep = last >= 0
+    fc, last = fc[keep], last[keep]
+    vint = tri.vintages[j0:j1][keep]
+    k, h = fc.shape
+    n_obs = len(tri.obs_dates)
+    first, latest = releases
+
+    steps = np.arange(1, h + 1)
+    idx = last[:, None] + steps[None, :]
+    in_grid = idx < n_obs
+    safe = np.minimum(idx, n_obs - 1)
+    origin = tri.obs_dates[last]
+    target = np.where(
+        in_grid,
+        tri.obs_dates[safe],
+        _shift_dates(origin[:, None], steps[None, :], tri.obs_dates),
+    )
+    a_first = np.where(in_grid, first[safe], np.nan)
+    a_latest = np.where(in_grid, latest[safe], np.nan)
+
+    df = pd.DataFrame(
+        {
+            "series": series_id,
+            "model": model,
+            "vintage": np.repeat(vint, h),
+            "origin": np.repeat(origin, h),
+            "horizon": np.tile(steps, k),
+            "target_date": target.ravel(),
+            "forecast": fc.ravel(),
+            "first_release": a_first.ravel(),
+            "latest_release": a_latest.ravel(),
+        }
+    )
+    df["err_first"] = df["forecast"] - df["first_release"]
+    df["err_latest"] = df["forecast"] - df["latest_release"]
+    return df[FORECAST_COLUMNS]
+
+
+def score_backtest(df: pd.DataFrame) -> pd.DataFrame:
+    """RMSE/MAE per (series, model, horizon) against each benchmark, in long (tidy) form."""
+    keys = ["series", "model", "horizon"]
+    out = []
+    for bench in ("first", "latest"):
+        err = df[keys + [f"err_{bench}"]].rename(columns={f"err_{bench}": "err"}).dropna()
+        g = err.assign(sq=err["err"] ** 2, ab=err["err"].abs()).groupby(keys, sort=True)
+        s = g.agg(n=("err", "size"), mse=("sq", "mean"), mae=("ab", "mean")).reset_index()
+        s["rmse"] = np.sqrt(s.pop("mse"))
+        s.insert(3, "benchmark", bench)
+        out.append(s[keys + ["benchmark", "n", "rmse", "mae"]])
+    return pd.concat(out, ignore_index=True).sort_values(keys + ["benchmark"], ignore_index=True)
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Pseudo-real-time backtest of the baselines over all vintages")
+    ap.add_argument("--series", required=True, help="Comma-separated series IDs, e.g., GDP,PCE")
+    ap.add_argument("--model", default="bl0,bl1", help="Comma-separated models (bl0, bl1)")
+    ap.add_argument("--h", type=int, default=4, help="Forecast horizon (periods)")
+    ap.add_argument("--window", type=int, default=4, help="Window of diffs for BL-1 drift")
+    ap.add_argument("--workers", type=int, default=1, help="Process pool size (1 = in-process)")
+    ap.add_argument("--start", default=None, help="First vintage to forecast from (YYYY-MM-DD)")
+    ap.add_argument("--end", default=None, help="Last vintage to forecast from (YYYY-MM-DD)")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    ap.add_argument("--out", default=None, help="Write the forecast table to this CSV")
+    ap.add_argument("--scores-out", default=None, help="Write the score table to this CSV")
+    ap.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse forecasts of unchanged vintages (the baselines recompute about as fast)",
+    )
+    ap.add_argument(
+        "--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES >> 20, help="Result cache size cap"
+    )
+    args = ap.parse_args(argv)
+
+    cache = None
+    if args.cache:
+        cache = ResultCache.for_base(Path(args.base), max_bytes=args.cache_max_mb << 20)
+
+    df = run_backtest(
+        [s.strip() for s in args.series.split(",") if s.strip()],
+        models=[m.strip() for m in args.model.split(",") if m.strip()],
+        h=args.h,
+        window=args.window,
+        base=Path(args.base),
+        workers=max(1, args.workers),
+        vintage_start=date.fromisoformat(args.start) if args.start else None,
+        vintage_end=date.fromisoformat(args.end) if args.end else None,
+        cache=cache,
+    )
+    scores = score_backtest(df)
+    if args.out:
+        df.to_csv(args.out, index=False)
+    if args.scores_out:
+        scores.to_csv(args.scores_out, index=False)
+    if cache is not None:
+        n_reused, n_computed = df.attrs["reused"], df.attrs["computed"]
+        print(f"[backtest] {len(df)} forecasts ({n_reused} vintages reused, {n_computed} computed)")
+    else:
+        print(f"[backtest] {len(df)} forecasts")
+    print(scores.to_string(index=False))
+    return 0
+
+
+__all__ = [
+    "MODELS",
+    "forecast_batch",
+    "load_series_triangle",
+    "model_params",
+    "release_values",
+    "run_backtest",
+    "score_backtest",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
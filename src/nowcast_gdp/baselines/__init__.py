@@ -1,4 +1,5 @@
 # src/nowcast_gdp/baselines/__init__.py
+from .batch import drift_forecast_batch, forecast_last_batch
 from .bl0 import forecast_last
 
-__all__ = ["forecast_last"]
+__all__ = ["forecast_last", "forecast_last_batch", "drift_forecast_batch"]
@@ -5,7 +5,9 @@ from argparse import ArgumentParser
 from pathlib import Path
 from typing import List
 
+from nowcast_gdp.backtest import model_params
 from nowcast_gdp.dataio import read_latest_series
+from nowcast_gdp.resultcache import ResultCache, result_key, vintage_digest
 
 from .bl0 import forecast_last as carry_forward_forecast
 from .bl1 import drift_forecast
@@ -33,15 +35,33 @@ def main(argv: List[str] | None = None) -> int:
         default="data/raw/alfred",
         help="Base path to ALFRED raw data",
     )
+    ap.add_argument("--no-cache", action="store_true", help="Recompute without the result cache")
     args = ap.parse_args(argv)
 
     base = Path(args.base)
     dates, values = read_latest_series(args.series, base)
 
+    cache = key = None
+    if not args.no_cache:
+        cache = ResultCache.for_base(base)
+        key = result_key(
+            args.model,
+            model_params(args.model, args.h, args.window),
+            args.series,
+            vintage_digest(dates, values),
+            kind="forecast",
+        )
+        hit = cache.get(key, shape=(args.h,))
+        if hit is not None:
+            print(f"[{args.model}] {args.series} h={args.h} → {hit.tolist()}")
+            return 0
+
     if args.model == "bl0":
         fcst = carry_forward_forecast(values, args.h)
     else:  # bl1
         fcst = drift_forecast(values, args.h, window=args.window)
+    if cache is not None:
+        cache.put(key, fcst)
 
     print(f"[{args.model}] {args.series} h={args.h} → {fcst}")
     return 0
@@ -0,0 +1,89 @@
+# src/nowcast_gdp/baselines/batch.py
+"""
+Array-native BL-0 / BL-1 kernels: one call forecasts every row of a 2-D array.
+
+Rows are independent series (or vintages of one series, e.g. `Triangle.values.T`),
+columns are time, NaN marks a missing value. Each row gets the same answer as the
+scalar baseline applied to that row with its NaNs dropped.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple, Union
+
+import numpy as np
+
+
+def _as_2d(y) -> np.ndarray:
+    arr = np.asarray(y, dtype=np.float64)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    if arr.ndim != 2:
+        raise ValueError("y must be a 1-D or 2-D array")
+    return arr
+
+
+def _compact(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Shift each row's valid values to the front (order kept) -> (compacted, n_valid)."""
+    valid = ~np.isnan(y)
+    order = np.argsort(~valid, axis=1, kind="stable")
+    return np.take_along_axis(y, order, axis=1), valid.sum(axis=1)
+
+
+def last_valid_index(y) -> np.ndarray:
+    """Column index of each row's last non-NaN value (-1 for an all-NaN row)."""
+    valid = ~np.isnan(_as_2d(y))
+    idx = valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    return np.where(valid.any(axis=1), idx, -1)
+
+
+def forecast_last_batch(y, h: int = 1) -> np.ndarray:
+    """
+    BL-0 carry-forward for every row -> (n, h): each row's last observed value.
+    Rows without any observation give NaN (the scalar version raises instead).
+    """
+    if h < 1:
+        raise ValueError("h must be >= 1")
+    arr = _as_2d(y)
+    n = arr.shape[0]
+    last = last_valid_index(arr)
+    vals = arr[np.arange(n), np.maximum(last, 0)] if arr.shape[1] else np.full(n, np.nan)
+    vals = np.where(last >= 0, vals, np.nan)
+    return np.repeat(vals[:, None], h, axis=1)
+
+
+def drift_forecast_batch(y, h: int, window: Union[int, np.ndarray] = 4) -> np.ndarray:
+    """
+    BL-1 drift for every row -> (n, h), matching `drift_forecast` row by row:
+    diffs between consecutive *valid* points, mean of the last `window` of them
+    (all of them when window <= 0), extrapolated from the last valid value;
+    fewer than 2 valid points -> carry-forward (NaN when there are none).
+
+    The mean of the last u diffs telescopes to (v[m-1] - v[m-1-u]) / u on the
+    compacted row, i.e. a difference of the cumulative sum of diffs, so there is
+    no per-row loop. `window` may be an int or one value per row.
+    """
+    if h < 1:
+        raise ValueError("h must be >= 1")
+    arr = _as_2d(y)
+    n = arr.shape[0]
+    if arr.shape[1] == 0:
+        return np.full((n, h), np.nan)
+    comp, m = _compact(arr)
+    rows = np.arange(n)
+
+    w = np.broadcast_to(np.asarray(window, dtype=np.int64), (n,))
+    n_diffs = np.maximum(m - 1, 0)
+    u = np.where(w > 0, np.minimum(w, n_diffs), n_diffs)
+
+    last = comp[rows, np.maximum(m - 1, 0)]
+    first = comp[rows, np.maximum(m - 1 - u, 0)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.where(u > 0, (last - first) / np.maximum(u, 1), 0.0)
+    avg = np.where(m >= 2, avg, 0.0)  # carry-forward
+    start = np.where(m >= 1, last, np.nan)
+    steps = np.arange(1, h + 1, dtype=np.float64)
+    return start[:, None] + avg[:, None] * steps[None, :]
+
+
+__all__ = ["forecast_last_batch", "drift_forecast_batch", "last_valid_index"]
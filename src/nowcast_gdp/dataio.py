@@ -1,11 +1,19 @@
 # src/nowcast_gdp/dataio.py
 from __future__ import annotations
 
+import threading
+from bisect import bisect_right
 from datetime import date
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from .io import read_csv_dicts
+import numpy as np
+
+from .cache import CacheStats, LRUCache
+from .delta import full_path, list_stored_vintages, read_vintage_rows, vintage_file
+from .io import read_date_value_arrays
+from .observations import ObservationBlock
+from .store import Triangle, has_store, load_triangle, rows_to_arrays
 
 
 # ---------- paths ----------
@@ -34,19 +42,102 @@ def _read_nonempty_lines(p: Path) -> list[str]:
 
 
 def _scan_vintages_from_files(series_dir: Path) -> list[date]:
-    """Fallback if index.csv is missing: scan *.csv filenames (except index.csv)."""
-    vintages: list[date] = []
-    if not series_dir.exists():
-        return vintages
-    for fp in series_dir.glob("*.csv"):
-        if fp.name == "index.csv":
-            continue
+    """Fallback if index.csv is missing: scan vintage filenames (full or delta)."""
+    return list_stored_vintages(series_dir)
+
+
+# ---------- vintage list cache ----------
+# series dir -> ((source, mtime_ns, size), sorted unique vintages). Keyed on the identity
+# of index.csv (or of the directory when scanning), so a new ingest invalidates it.
+_VINTAGE_CACHE: Dict[Path, Tuple[Tuple[str, int, int], List[date]]] = {}
+_VINTAGE_LOCK = threading.Lock()
+
+
+def _identity(p: Path, source: str) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        return None
+    return (source, st.st_mtime_ns, st.st_size)
+
+
+def list_vintages(series_id: str, base: Path | None = None) -> List[date]:
+    """
+    Sorted, de-duplicated vintage dates of a series from index.csv (file scan fallback).
+    Parsed once and cached until index.csv (or the series directory) changes.
+    """
+    sdir = _series_dir(series_id, base)
+    idx = _index_path(series_id, base)
+    key = _identity(idx, "index")
+    if key is None or key[2] == 0:
+        key = _identity(sdir, "scan")
+        if key is None:
+            return []
+    with _VINTAGE_LOCK:
+        hit = _VINTAGE_CACHE.get(sdir)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+
+    if key[0] == "index":
+        vintages = sorted(_parse_index_lines(_read_nonempty_lines(idx)))
+    else:
+        vintages = _scan_vintages_from_files(sdir)
+    with _VINTAGE_LOCK:
+        _VINTAGE_CACHE[sdir] = (key, vintages)
+    return vintages
+
+
+def _parse_index_lines(lines: List[str]) -> set[date]:
+    # a torn last line (crash mid-append) is skipped; `ingest_alfred --verify` reports it
+    out: set[date] = set()
+    for ln in lines:
         try:
-            vintages.append(date.fromisoformat(fp.stem))
-        except Exception:
-            # Ignore non-vintage files
-            pass
-    return sorted(vintages)
+            out.add(date.fromisoformat(ln))
+        except ValueError:
+            continue
+    return out
+
+
+def clear_vintage_cache() -> None:
+    with _VINTAGE_LOCK:
+        _VINTAGE_CACHE.clear()
+
+
+# ---------- parsed-vintage read cache ----------
+def _sizeof_series(value) -> int:
+    dts, vals = value
+    return dts.nbytes + vals.nbytes + 200
+
+
+_READ_CACHE = LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024, sizeof=_sizeof_series)
+
+
+def configure_cache(max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+    """Resize the process-level read cache (0 disables it); evicts down to the new limits."""
+    _READ_CACHE.configure(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def cache_stats() -> CacheStats:
+    """Hit/miss/eviction counters and current size of the read cache."""
+    return _READ_CACHE.stats()
+
+
+def clear_cache() -> None:
+    """Drop every cached vintage read and vintage listing."""
+    _READ_CACHE.clear()
+    clear_vintage_cache()
+
+
+def _read_key(series_id: str, vintage: date, base: Path | None):
+    """(series, vintage, path, mtime, size) of the file backing a vintage, or None."""
+    fp = vintage_file(_series_dir(series_id, base), vintage)
+    if fp is None:
+        return None
+    try:
+        st = fp.stat()
+    except FileNotFoundError:
+        return None
+    return (series_id, vintage, str(fp), st.st_mtime_ns, st.st_size)
 
 
 # ---------- public API ----------
@@ -55,13 +146,7 @@ def latest_vintage(series_id: str, base: Path | None = None) -> date:
     Return the latest vintage date for a series by reading index.csv.
     Falls back to scanning files if index is absent.
     """
-    idx = _index_path(series_id, base)
-    lines = _read_nonempty_lines(idx)
-    if lines:
-        # index is sorted ascending by our ingest helpers
-        return date.fromisoformat(lines[-1])
-    # fallback scan
-    vintages = _scan_vintages_from_files(_series_dir(series_id, base))
+    vintages = list_vintages(series_id, base)
     if not vintages:
         raise FileNotFoundError(
             f"No vintages found for series '{series_id}' under {_series_dir(series_id, base)}"
@@ -69,28 +154,147 @@ def latest_vintage(series_id: str, base: Path | None = None) -> date:
     return vintages[-1]
 
 
+def vintage_as_of(series_id: str, asof: date, base: Path | None = None) -> date:
+    """Last vintage on or before `asof` (binary search over the cached index)."""
+    vintages = list_vintages(series_id, base)
+    i = bisect_right(vintages, asof)
+    if i == 0:
+        if not vintages:
+            raise FileNotFoundError(
+                f"No vintages found for series '{series_id}' under {_series_dir(series_id, base)}"
+            )
+        raise LookupError(f"No vintage of '{series_id}' on or before {asof} (first: {vintages[0]})")
+    return vintages[i - 1]
+
+
+def read_vintage_series(
+    series_id: str, vintage: date, base: Path | None = None
+) -> Tuple[List[date], List[float]]:
+    """
+    Load one vintage -> (dates, values), skipping empty/missing values.
+    Built from `read_vintage_arrays`, so repeat reads of an unchanged vintage come
+    from the LRU cache; the lists are fresh on every call.
+    """
+    dts, vals = read_vintage_arrays(series_id, vintage, base)
+    keep = ~np.isnan(vals)
+    return dts[keep].tolist(), vals[keep].tolist()
+
+
 def read_latest_series(series_id: str, base: Path | None = None) -> Tuple[List[date], List[float]]:
     """
     Load the *latest* vintage CSV -> (dates, values), skipping empty/missing values.
     CSV schema (from ingest): header 'date,value'
+    Delta-encoded vintages are rebuilt transparently.
     """
-    v = latest_vintage(series_id, base)
-    path = _vintage_csv(series_id, v, base)
-    rows = read_csv_dicts(path)
+    return read_vintage_series(series_id, latest_vintage(series_id, base), base)
 
-    dts: list[date] = []
-    vals: list[float] = []
-    for r in rows:
-        s_val = r.get("value", "")
-        if not s_val:
-            continue  # skip blanks
-        try:
-            dts.append(date.fromisoformat(r["date"]))
-            vals.append(float(s_val))
-        except Exception:
-            # Robust to occasional bad rows
-            continue
-    return dts, vals
+
+def read_vintage_arrays(
+    series_id: str, vintage: date, base: Path | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fast path: one vintage -> (datetime64[D] dates, float64 values with NaN for blanks).
+    Keyframe CSVs are parsed by pandas' C engine. Results live in the process-level
+    LRU cache keyed on the backing file's identity (a re-ingested file misses) and
+    are returned read-only, without copying.
+    """
+    ckey = _read_key(series_id, vintage, base)
+    hit = _READ_CACHE.get(ckey) if ckey is not None else None
+    if hit is None:
+        sdir = _series_dir(series_id, base)
+        fp = full_path(sdir, vintage)
+        if fp.exists():
+            dts, vals = read_date_value_arrays(fp)
+        else:
+            dts, vals = rows_to_arrays(read_vintage_rows(sdir, vintage))
+        dts.flags.writeable = False
+        vals.flags.writeable = False
+        hit = (dts, vals)
+        if ckey is not None:
+            _READ_CACHE.put(ckey, hit)
+    return hit
+
+
+def read_vintage_block(series_id: str, vintage: date, base: Path | None = None) -> ObservationBlock:
+    """One vintage as an `ObservationBlock` (blanks kept as NaN), via the array reader."""
+    return ObservationBlock.from_arrays(*read_vintage_arrays(series_id, vintage, base))
+
+
+def read_latest_series_arrays(
+    series_id: str, base: Path | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Latest vintage as (datetime64[D], float64) arrays; blanks kept as NaN."""
+    return read_vintage_arrays(series_id, latest_vintage(series_id, base), base)
+
+
+def read_series_as_of(
+    series_id: str, asof: date, base: Path | None = None
+) -> Tuple[List[date], List[float]]:
+    """The series as it was known on `asof`: the last vintage on or before that date."""
+    return read_vintage_series(series_id, vintage_as_of(series_id, asof, base), base)
+
+
+def revision_path(
+    series_id: str, obs_date: date, base: Path | None = None
+) -> Tuple[List[date], List[Optional[float]]]:
+    """
+    One observation's value across vintages -> (vintages, values), restricted to the
+    vintages that contain `obs_date`. Uses the columnar store when the series has one
+    (a single row read; blanks are then indistinguishable from unpublished and omitted);
+    otherwise reads every vintage and reports blanks as None.
+    """
+    sdir = _series_dir(series_id, base)
+    if has_store(sdir):
+        tri = load_triangle(sdir)
+        d64 = np.datetime64(obs_date, "D")
+        i = int(np.searchsorted(tri.obs_dates, d64))
+        if i >= len(tri.obs_dates) or tri.obs_dates[i] != d64:
+            return [], []
+        row = np.asarray(tri.values[i, :])
+        keep = ~np.isnan(row)
+        return tri.vintages[keep].tolist(), row[keep].tolist()
+
+    key = obs_date.isoformat()
+    vs: List[date] = []
+    vals: List[Optional[float]] = []
+    for v in list_vintages(series_id, base):
+        for r in read_vintage_rows(sdir, v):
+            if r["date"] == key:
+                vs.append(v)
+                vals.append(float(r["value"]) if r.get("value") else None)
+                break
+    return vs, vals
+
+
+# ---------- columnar store readers ----------
+def read_all_vintages(series_id: str, base: Path | None = None) -> Triangle:
+    """
+    Memory-mapped observation-date x vintage triangle for a series.
+    Requires a compacted store (`python -m nowcast_gdp.store --series ...`).
+    """
+    return load_triangle(_series_dir(series_id, base))
+
+
+def read_vintage_array(
+    series_id: str, vintage: date, base: Path | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """One vintage from the store -> (datetime64[D] dates, float64 values), blanks dropped."""
+    tri = read_all_vintages(series_id, base)
+    col = np.asarray(tri.column(vintage))
+    keep = ~np.isnan(col)
+    return tri.obs_dates[keep], col[keep]
+
+
+def read_triangle_slice(
+    series_id: str,
+    obs_start: Optional[date] = None,
+    obs_end: Optional[date] = None,
+    vintage_start: Optional[date] = None,
+    vintage_end: Optional[date] = None,
+    base: Path | None = None,
+) -> Triangle:
+    """Sub-triangle by inclusive observation/vintage date bounds (memory-mapped views)."""
+    return read_all_vintages(series_id, base).slice(obs_start, obs_end, vintage_start, vintage_end)
 
 
 # ---------- aliases & niceties ----------
@@ -99,11 +303,17 @@ read_latest_vintage = latest_vintage
 
 
 def read_latest_series_df(series_id: str, base: Path | None = None):
-    """Return latest series as a pandas DataFrame with Date index."""
+    """
+    Return latest series as a pandas DataFrame with a DatetimeIndex named 'date'.
+    Built straight from the array reader; blanks are dropped like read_latest_series.
+    """
     import pandas as pd
 
-    dts, vals = read_latest_series(series_id, base)
-    return pd.DataFrame({"date": dts, "value": vals}).set_index("date")
+    dts, vals = read_latest_series_arrays(series_id, base)
+    keep = ~np.isnan(vals)
+    if not keep.all():
+        dts, vals = dts[keep], vals[keep]
+    return pd.DataFrame({"value": vals}, index=pd.DatetimeIndex(dts, name="date"), copy=False)
 
 
 __all__ = [
@@ -111,4 +321,19 @@ __all__ = [
     "read_latest_vintage",
     "read_latest_series",
     "read_latest_series_df",
+    "read_vintage_arrays",
+    "read_vintage_block",
+    "read_latest_series_arrays",
+    "list_vintages",
+    "vintage_as_of",
+    "read_vintage_series",
+    "read_series_as_of",
+    "revision_path",
+    "clear_vintage_cache",
+    "clear_cache",
+    "cache_stats",
+    "configure_cache",
+    "read_all_vintages",
+    "read_vintage_array",
+    "read_triangle_slice",
 ]
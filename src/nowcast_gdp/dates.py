@@ -1,8 +1,22 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, timedelta
+from functools import lru_cache
 
-__all__ = ["week_ending", "quarter_start", "quarter_end"]
+import numpy as np
+
+__all__ = [
+    "week_ending",
+    "quarter_start",
+    "quarter_end",
+    "week_ending_array",
+    "quarter_start_array",
+    "quarter_end_array",
+    "quarter_index_array",
+    "CalendarTable",
+    "calendar_table",
+]
 
 
 def week_ending(d: date) -> date:
@@ -22,3 +36,88 @@ def quarter_end(d: date) -> date:
     else:
         next_q_start = date(d.year, start_month + 3, 1)
     return next_q_start - timedelta(days=1)
+
+
+# ---------- vectorized (datetime64[D] arrays) ----------
+# Same results as the scalar helpers, element-wise; NaT stays NaT.
+_NAT = np.datetime64("NaT", "D")
+
+
+def _days(d) -> np.ndarray:
+    return np.asarray(d, dtype="datetime64[D]")
+
+
+def week_ending_array(d) -> np.ndarray:
+    """Vectorized `week_ending`."""
+    arr = _days(d)
+    n = arr.astype(np.int64)
+    # 1970-01-01 was a Thursday, so (6 - isoweekday) % 7 == (2 - days) % 7
+    out = arr + ((2 - n) % 7).astype("timedelta64[D]")
+    return np.where(np.isnat(arr), _NAT, out)
+
+
+def quarter_index_array(d) -> np.ndarray:
+    """Quarters since 1970Q1 as int64 (undefined for NaT entries; mask them first)."""
+    months = _days(d).astype("datetime64[M]").astype(np.int64)
+    return months // 3
+
+
+def quarter_start_array(d) -> np.ndarray:
+    """Vectorized `quarter_start`."""
+    arr = _days(d)
+    out = (quarter_index_array(arr) * 3).astype("datetime64[M]").astype("datetime64[D]")
+    return np.where(np.isnat(arr), _NAT, out)
+
+
+def quarter_end_array(d) -> np.ndarray:
+    """Vectorized `quarter_end`."""
+    arr = _days(d)
+    nxt = (quarter_index_array(arr) * 3 + 3).astype("datetime64[M]").astype("datetime64[D]")
+    return np.where(np.isnat(arr), _NAT, nxt - np.timedelta64(1, "D"))
+
+
+# ---------- precomputed calendar ----------
+@dataclass(frozen=True)
+class CalendarTable:
+    """
+    Day -> period lookup arrays over a fixed date range; mapping any date array is
+    one offset computation and a gather. Arrays are read-only (the table is shared).
+    """
+
+    start: np.datetime64  # first day covered
+    week_ending: np.ndarray  # datetime64[D], one entry per day
+    quarter: np.ndarray  # int64 quarters since 1970Q1
+    quarter_start: np.ndarray  # datetime64[D]
+    quarter_end: np.ndarray  # datetime64[D]
+
+    def __len__(self) -> int:
+        return len(self.week_ending)
+
+    def offsets(self, d) -> np.ndarray:
+        """Row of each date in the table; ValueError outside the covered range or on NaT."""
+        arr = _days(d)
+        idx = (arr - self.start).astype(np.int64)
+        if np.isnat(arr).any() or (idx.size and (idx.min() < 0 or idx.max() >= len(self))):
+            raise ValueError("dates outside the calendar table range")
+        return idx
+
+    def lookup(self, d, field: str) -> np.ndarray:
+        """Gather one column (`week_ending`, `quarter`, `quarter_start`, `quarter_end`)."""
+        if field not in ("week_ending", "quarter", "quarter_start", "quarter_end"):
+            raise KeyError(field)
+        return getattr(self, field)[self.offsets(d)]
+
+
+@lru_cache(maxsize=8)
+def calendar_table(start: date = date(1900, 1, 1), end: date = date(2100, 12, 31)) -> CalendarTable:
+    """Build (once per range) the calendar table covering [start, end] inclusive."""
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    cols = {
+        "week_ending": week_ending_array(days),
+        "quarter": quarter_index_array(days),
+        "quarter_start": quarter_start_array(days),
+        "quarter_end": quarter_end_array(days),
+    }
+    for arr in cols.values():
+        arr.flags.writeable = False
+    return CalendarTable(start=days[0], **cols)
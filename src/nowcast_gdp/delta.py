@@ -0,0 +1,282 @@
+# src/nowcast_gdp/delta.py
+"""
+Revision-delta encoded vintage storage.
+
+A vintage is stored either as a full keyframe (the usual `{YYYY-MM-DD}.csv`,
+header `date,value`) or as a delta against an earlier vintage:
+
+  {YYYY-MM-DD}.delta.csv      header: date,value,op
+      base,2025-06-26,base    # first row names the vintage this delta applies to
+      2025-01-01,101.000000,  # changed or appended observation
+      2019-04-01,,d           # observation dropped from the vintage
+
+Values are compared as the formatted strings the ingest writes, so reconstruction
+is byte-exact. Chains are bounded: after `keyframe_every - 1` consecutive deltas
+the next vintage is written as a full keyframe.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .io import read_csv_dicts, write_csv
+
+DELTA_SUFFIX = ".delta.csv"
+DELTA_HEADER = ["date", "value", "op"]
+DEFAULT_KEYFRAME_EVERY = 32
+
+_BASE_MARK = "base"
+_DELETE = "d"
+
+Rows = List[Dict[str, str]]
+
+
+# ---------- paths ----------
+def full_path(series_dir: Path, vintage: date) -> Path:
+    return series_dir / f"{vintage.isoformat()}.csv"
+
+
+def delta_path(series_dir: Path, vintage: date) -> Path:
+    return series_dir / f"{vintage.isoformat()}{DELTA_SUFFIX}"
+
+
+def vintage_file(series_dir: Path, vintage: date) -> Optional[Path]:
+    """The file holding `vintage` (keyframe preferred), or None if not stored."""
+    for p in (full_path(series_dir, vintage), delta_path(series_dir, vintage)):
+        if p.exists():
+            return p
+    return None
+
+
+def vintage_exists(series_dir: Path, vintage: date) -> bool:
+    return vintage_file(series_dir, vintage) is not None
+
+
+def vintage_from_filename(name: str) -> Optional[date]:
+    """Parse `YYYY-MM-DD.csv` / `YYYY-MM-DD.delta.csv`; None for any other file."""
+    if not name.endswith(".csv"):
+        return None
+    stem = name[: -len(DELTA_SUFFIX)] if name.endswith(DELTA_SUFFIX) else name[: -len(".csv")]
+    try:
+        return date.fromisoformat(stem)
+    except ValueError:
+        return None
+
+
+def list_stored_vintages(series_dir: Path) -> List[date]:
+    if not series_dir.exists():
+        return []
+    out = {v for fp in series_dir.glob("*.csv") if (v := vintage_from_filename(fp.name))}
+    return sorted(out)
+
+
+# ---------- codec ----------
+def encode_delta(prev: Rows, new: Rows) -> Rows:
+    """Rows that turn `prev` into `new`: changed/appended values plus deletions."""
+    before = {r["date"]: r.get("value", "") for r in prev}
+    out: Rows = []
+    seen = set()
+    for r in new:
+        d, v = r["date"], r.get("value", "")
+        seen.add(d)
+        if before.get(d) != v:
+            out.append({"date": d, "value": v, "op": ""})
+    for d in before:
+        if d not in seen:
+            out.append({"date": d, "value": "", "op": _DELETE})
+    return out
+
+
+def apply_delta(prev: Rows, delta: Rows) -> Rows:
+    state = {r["date"]: r.get("value", "") for r in prev}
+    for r in delta:
+        if r.get("op") == _DELETE:
+            state.pop(r["date"], None)
+        else:
+            state[r["date"]] = r.get("value", "")
+    # ISO dates sort lexicographically == chronologically
+    return [{"date": d, "value": state[d]} for d in sorted(state)]
+
+
+def _read_delta(path: Path) -> Tuple[date, Rows]:
+    rows = read_csv_dicts(path)
+    if not rows or rows[0].get("date") != _BASE_MARK:
+        raise ValueError(f"{path} is not a delta file (missing base row)")
+    return date.fromisoformat(rows[0]["value"]), rows[1:]
+
+
+def delta_base(path: Path) -> date:
+    """Base vintage of a delta file (reads only its first data row)."""
+    with path.open(encoding="utf-8") as f:
+        f.readline()  # header
+        first = f.readline().strip().split(",")
+    if len(first) < 2 or first[0] != _BASE_MARK:
+        raise ValueError(f"{path} is not a delta file (missing base row)")
+    return date.fromisoformat(first[1])
+
+
+# ---------- reconstruction ----------
+class _StateCache:
+    """Tiny LRU of reconstructed vintages; consecutive reads/writes reuse the previous state."""
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.maxsize = maxsize
+        self._d: "OrderedDict[Tuple[Path, date], Rows]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Path, date]) -> Optional[Rows]:
+        with self._lock:
+            rows = self._d.get(key)
+            if rows is not None:
+                self._d.move_to_end(key)
+            return rows
+
+    def put(self, key: Tuple[Path, date], rows: Rows) -> None:
+        with self._lock:
+            self._d[key] = rows
+            self._d.move_to_end(key)
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._d.clear()
+
+
+_STATES = _StateCache()
+
+
+def read_vintage_rows(series_dir: Path, vintage: date) -> Rows:
+    """Rows (`date`,`value` strings) of a vintage, rebuilding it from deltas if needed."""
+    key = (series_dir.resolve(), vintage)
+    cached = _STATES.get(key)
+    if cached is not None:
+        return cached
+
+    # walk back to the nearest keyframe (or cached state), then replay forward
+    chain: List[Rows] = []
+    cur = vintage
+    seen = set()
+    while True:
+        hit = _STATES.get((key[0], cur))
+        if hit is not None:
+            rows = hit
+            break
+        fp = full_path(series_dir, cur)
+        if fp.exists():
+            rows = [{"date": r["date"], "value": r.get("value", "")} for r in read_csv_dicts(fp)]
+            break
+        dp = delta_path(series_dir, cur)
+        if not dp.exists():
+            raise FileNotFoundError(f"Vintage {cur} not stored under {series_dir}")
+        if cur in seen:
+            raise ValueError(f"Delta chain cycle at {dp}")
+        seen.add(cur)
+        cur, drows = _read_delta(dp)
+        chain.append(drows)
+    if not chain:
+        return rows  # plain keyframe read; not worth caching
+    for drows in reversed(chain):
+        rows = apply_delta(rows, drows)
+    _STATES.put(key, rows)
+    return rows
+
+
+def chain_length(series_dir: Path, vintage: date) -> int:
+    """Number of deltas between `vintage` and its keyframe (0 for a keyframe)."""
+    n = 0
+    cur = vintage
+    while not full_path(series_dir, cur).exists():
+        dp = delta_path(series_dir, cur)
+        if not dp.exists():
+            raise FileNotFoundError(f"Vintage {cur} not stored under {series_dir}")
+        cur = delta_base(dp)
+        n += 1
+    return n
+
+
+# ---------- writing ----------
+def write_vintage(
+    series_dir: Path,
+    vintage: date,
+    rows: Rows,
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+) -> Path:
+    """
+    Store `rows` for `vintage` as a delta against the closest earlier stored vintage,
+    or as a full keyframe when there is none, the chain is at its limit, or the
+    delta would not be meaningfully smaller than the full file.
+    """
+    sdir = series_dir.resolve()
+    prev_chain = _previous(sdir, vintage)
+    if prev_chain is not None and keyframe_every > 1:
+        prev, chain = prev_chain
+        if chain + 1 < keyframe_every:
+            drows = encode_delta(read_vintage_rows(sdir, prev), rows)
+            if len(drows) * 2 < len(rows):
+                path = delta_path(sdir, vintage)
+                base_row = {"date": _BASE_MARK, "value": prev.isoformat(), "op": _BASE_MARK}
+                write_csv(path, [base_row, *drows], header=DELTA_HEADER)
+                _remember(sdir, vintage, rows, chain + 1)
+                return path
+    path = full_path(sdir, vintage)
+    write_csv(path, rows, header=["date", "value"])
+    _remember(sdir, vintage, rows, 0)
+    return path
+
+
+# last vintage written per series dir -> (vintage, chain length); lets an ascending
+# backfill find its delta base without rescanning the directory for every vintage
+_LAST_WRITTEN: Dict[Path, Tuple[date, int]] = {}
+_LAST_LOCK = threading.Lock()
+
+
+def _remember(sdir: Path, vintage: date, rows: Rows, chain: int) -> None:
+    _STATES.put((sdir, vintage), rows)
+    with _LAST_LOCK:
+        last = _LAST_WRITTEN.get(sdir)
+        if last is None or vintage >= last[0]:
+            _LAST_WRITTEN[sdir] = (vintage, chain)
+
+
+def _previous(sdir: Path, vintage: date) -> Optional[Tuple[date, int]]:
+    """Closest earlier stored vintage and its chain length (any earlier one is a valid base)."""
+    with _LAST_LOCK:
+        last = _LAST_WRITTEN.get(sdir)
+    if last is not None and last[0] < vintage and vintage_exists(sdir, last[0]):
+        return last
+    earlier = [v for v in list_stored_vintages(sdir) if v < vintage]
+    if not earlier:
+        return None
+    return earlier[-1], chain_length(sdir, earlier[-1])
+
+
+def iter_vintage_rows(series_dir: Path, vintages: Iterable[date]):
+    """Yield (vintage, rows) in ascending order; sequential replay keeps each step O(delta)."""
+    for v in sorted(set(vintages)):
+        yield v, read_vintage_rows(series_dir, v)
+
+
+def clear_state_cache() -> None:
+    _STATES.clear()
+    with _LAST_LOCK:
+        _LAST_WRITTEN.clear()
+
+
+__all__ = [
+    "DEFAULT_KEYFRAME_EVERY",
+    "encode_delta",
+    "apply_delta",
+    "read_vintage_rows",
+    "iter_vintage_rows",
+    "write_vintage",
+    "vintage_exists",
+    "vintage_file",
+    "list_stored_vintages",
+    "chain_length",
+    "clear_state_cache",
+]
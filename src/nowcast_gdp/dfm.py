@@ -0,0 +1,555 @@
+# src/nowcast_gdp/dfm.py
+"""
+Dynamic factor nowcast of quarterly GDP growth from monthly indicators.
+
+Model (monthly time grid, everything in standardized growth rates):
+
+  x_it = lambda_i' f_t + e_it                      monthly indicator i
+  y_t  = lambda_q' (f_t + 2f_{t-1} + 3f_{t-2} + 2f_{t-3} + f_{t-4}) + e_qt
+                                                   quarterly GDP, in the quarter's 3rd month
+  f_t  = A f_{t-1} + u_t                           r factors, VAR(1)
+
+The quarterly equation uses the Mariano-Murasawa weights, so the state holds the
+factors and four lags. Parameters are estimated in two steps (principal components,
+then OLS; Doz, Giannone & Reichlin 2011) and the factors are extracted with a Kalman
+filter and RTS smoother that handle the ragged edge (NaN = not yet published).
+
+The filtered/predicted moments are cached per month. When a new vintage of one
+series arrives, `update` re-runs the filter only from the first month whose data
+changed, with the parameters held fixed, and decomposes the nowcast change into a
+revision effect plus the news of each new observation (weight x (actual - expected)).
+The covariance recursions depend only on which cells are observed, so the news
+weights come from the same pass: the filter carries one state column per data
+version.
+
+  python -m nowcast_gdp.dfm --target GDP --indicators INDPRO,PAYEMS,RSAFS --factors 1
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .dataio import latest_vintage, read_vintage_arrays, vintage_as_of
+
+MM_WEIGHTS = np.array([1.0, 2.0, 3.0, 2.0, 1.0])
+LAGS = len(MM_WEIGHTS)
+_VAR_FLOOR = 1e-4
+# largest modulus allowed for the factor VAR's roots; an estimate at or beyond the
+# unit circle is scaled back onto this radius so the state has a stationary P0
+MAX_ROOT = 0.98
+
+Series = Tuple[np.ndarray, np.ndarray]  # (datetime64[D] dates, float64 levels)
+
+
+# ---------- data preparation ----------
+def _months(dates: np.ndarray) -> np.ndarray:
+    return np.asarray(dates, dtype="datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def _growth(levels: np.ndarray, log: bool) -> np.ndarray:
+    """Period-on-period growth: 100 x log difference, or the plain difference."""
+    out = np.full(levels.shape, np.nan)
+    if len(levels) > 1:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:] = 100 * np.diff(np.log(levels)) if log else np.diff(levels)
+    return out
+
+
+def _use_log(levels: np.ndarray) -> bool:
+    v = levels[~np.isnan(levels)]
+    return bool(len(v)) and bool((v > 0).all())
+
+
+@dataclass(frozen=True)
+class _Column:
+    name: str
+    quarterly: bool
+    log: bool
+    mean: float
+    std: float
+
+
+def _raw_column(
+    dates: np.ndarray, levels: np.ndarray, quarterly: bool, log: bool, m0: int, T: int
+) -> np.ndarray:
+    """Growth rates on the monthly grid (T rows from month m0); NaN where unknown."""
+    months = _months(dates)
+    levels = np.asarray(levels, dtype=np.float64)
+    out = np.full(T, np.nan)
+    if not len(months):
+        return out
+    if quarterly:
+        q = (months - m0) // 3  # quarter slot relative to the grid start
+        grid = np.full(q.max() - q.min() + 1, np.nan)
+        grid[q - q.min()] = levels
+        g = _growth(grid, log)
+        rows = (np.arange(len(grid)) + q.min()) * 3 + 2  # 3rd month of each quarter
+    else:
+        lo = months.min()
+        grid = np.full(months.max() - lo + 1, np.nan)
+        grid[months - lo] = levels  # later duplicates within a month win
+        g = _growth(grid, log)
+        rows = np.arange(len(grid)) + (lo - m0)
+    ok = (rows >= 0) & (rows < T)
+    out[rows[ok]] = g[ok]
+    return out
+
+
+# ---------- Kalman filter / smoother ----------
+@dataclass(frozen=True)
+class StateSpace:
+    Z: np.ndarray  # (n, m) loadings on the state
+    R: np.ndarray  # (n,) idiosyncratic variances
+    A: np.ndarray  # (m, m) transition
+    Q: np.ndarray  # (m, m) state noise covariance
+    a0: np.ndarray  # (m,)
+    P0: np.ndarray  # (m, m)
+
+
+def kalman_filter(
+    ss: StateSpace,
+    Y: np.ndarray,
+    mask: np.ndarray,
+    a_pred0: np.ndarray,
+    P_pred0: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Filter several data versions that share one missing-data pattern.
+    Y: (k, T, n) with `mask` (T, n) marking observed cells; a_pred0: (m, k).
+    Returns a_pred (T, m, k), P_pred (T, m, m), a_filt (T, m, k), P_filt (T, m, m),
+    where *_pred[t] conditions on data before t.
+    """
+    k, T, _ = Y.shape
+    m = ss.A.shape[0]
+    a_pred = np.empty((T, m, k))
+    a_filt = np.empty((T, m, k))
+    P_pred = np.empty((T, m, m))
+    P_filt = np.empty((T, m, m))
+    a, P = a_pred0, P_pred0
+    for t in range(T):
+        a_pred[t], P_pred[t] = a, P
+        obs = mask[t]
+        if obs.any():
+            Zo = ss.Z[obs]
+            PZ = P @ Zo.T
+            F = Zo @ PZ + np.diag(ss.R[obs])
+            K = np.linalg.solve(F, PZ.T).T  # P Z' F^-1
+            a = a + K @ (Y[:, t, obs].T - Zo @ a)
+            P = P - K @ PZ.T
+            P = (P + P.T) / 2
+        a_filt[t], P_filt[t] = a, P
+        a = ss.A @ a
+        P = ss.A @ P @ ss.A.T + ss.Q
+    return a_pred, P_pred, a_filt, P_filt
+
+
+def smooth_states(
+    A: np.ndarray,
+    a_pred: np.ndarray,
+    P_pred: np.ndarray,
+    a_filt: np.ndarray,
+    P_filt: np.ndarray,
+    t_min: int = 0,
+) -> np.ndarray:
+    """RTS smoothed means for t >= t_min -> (T - t_min, m, k); one backward pass."""
+    T = a_filt.shape[0]
+    out = np.empty((T - t_min,) + a_filt.shape[1:])
+    a_s = a_filt[-1]
+    out[-1] = a_s
+    for t in range(T - 2, t_min - 1, -1):
+        # J' = P_pred[t+1]^-1 A P_filt[t]
+        try:
+            Jt = np.linalg.solve(P_pred[t + 1], A @ P_filt[t])
+        except np.linalg.LinAlgError:
+            Jt = np.linalg.pinv(P_pred[t + 1]) @ A @ P_filt[t]
+        a_s = a_filt[t] + Jt.T @ (a_s - a_pred[t + 1])
+        out[t - t_min] = a_s
+    return out
+
+
+# ---------- news ----------
+@dataclass(frozen=True)
+class NewsItem:
+    series: str
+    month: date  # observation period (first day of the month / quarter-end month)
+    actual: float  # growth rate, series units
+    expected: float  # model forecast of it before the release
+    weight: float  # nowcast change per unit of news
+    impact: float  # weight x (actual - expected), nowcast units
+
+    @property
+    def news(self) -> float:
+        return self.actual - self.expected
+
+
+@dataclass(frozen=True)
+class NewsReport:
+    quarter: date
+    old: float  # nowcast before the update
+    revised: float  # after revisions to already published values only
+    new: float  # after the update
+    items: List[NewsItem]
+
+    @property
+    def revision_effect(self) -> float:
+        return self.revised - self.old
+
+    @property
+    def news_effect(self) -> float:
+        return sum(i.impact for i in self.items)
+
+
+# ---------- model ----------
+class DynamicFactorModel:
+    """Fitted DFM plus the cached filter output for its current data."""
+
+    def __init__(
+        self,
+        columns: List[_Column],
+        m0: int,
+        Y: np.ndarray,
+        ss: StateSpace,
+        factors: int,
+    ) -> None:
+        self.columns = columns
+        self.m0 = m0
+        self.Y = Y  # (T, n) standardized growth, NaN = not observed
+        self.ss = ss
+        self.factors = factors
+        self._cache: Optional[Tuple[np.ndarray, ...]] = None
+        self._refilter(0)
+
+    @property
+    def names(self) -> List[str]:
+        return [c.name for c in self.columns]
+
+    @property
+    def target(self) -> str:
+        return self.columns[-1].name
+
+    # ---- estimation ----
+    @classmethod
+    def fit(
+        cls,
+        indicators: Dict[str, Series],
+        target: Tuple[str, np.ndarray, np.ndarray],
+        factors: int = 1,
+        extra_months: int = 6,
+    ) -> "DynamicFactorModel":
+        """
+        Two-step estimate from monthly indicator levels and quarterly target levels
+        (dates are observation dates; quarterly ones are the quarter's first day).
+        The grid runs `extra_months` past the last observation to hold nowcasts.
+        """
+        tname, tdates, tlevels = target
+        all_months = [_months(d) for d, _ in indicators.values()] + [_months(tdates) + 2]
+        m0 = int(min(x.min() for x in all_months if len(x)))
+        m0 -= m0 % 3  # grid starts on a quarter
+        T = int(max(x.max() for x in all_months if len(x))) - m0 + 1 + extra_months
+        specs = [(n, d, v, False) for n, (d, v) in indicators.items()] + [
+            (tname, tdates, tlevels, True)
+        ]
+        columns: List[_Column] = []
+        raw = np.full((T, len(specs)), np.nan)
+        for j, (name, d, v, quarterly) in enumerate(specs):
+            log = _use_log(np.asarray(v, dtype=np.float64))
+            raw[:, j] = _raw_column(d, v, quarterly, log, m0, T)
+            col = raw[:, j][~np.isnan(raw[:, j])]
+            if len(col) < 3:
+                raise ValueError(f"{name}: too few observations to fit")
+            columns.append(
+                _Column(name, quarterly, log, float(col.mean()), float(col.std()) or 1.0)
+            )
+        mu = np.array([c.mean for c in columns])
+        sd = np.array([c.std for c in columns])
+        Y = (raw - mu) / sd
+        ss = _estimate(Y, factors)
+        return cls(columns, m0, Y, ss, factors)
+
+    @classmethod
+    def from_store(
+        cls,
+        target: str,
+        indicators: Sequence[str],
+        base: Path | None = None,
+        asof: Optional[date] = None,
+        factors: int = 1,
+    ) -> "DynamicFactorModel":
+        """Fit on the stored vintages in force on `asof` (latest by default)."""
+
+        def _read(sid: str) -> Series:
+            v = vintage_as_of(sid, asof, base) if asof else latest_vintage(sid, base)
+            return read_vintage_arrays(sid, v, base)
+
+        return cls.fit(
+            {sid: _read(sid) for sid in indicators}, (target, *_read(target)), factors=factors
+        )
+
+    # ---- filtering cache ----
+    def _refilter(self, t0: int) -> None:
+        """Re-run the filter from month t0 on, reusing the cached moments before it."""
+        mask = ~np.isnan(self.Y)
+        if self._cache is None or t0 == 0:
+            a0, P0 = self.ss.a0[:, None], self.ss.P0
+            t0 = 0
+        else:
+            a0, P0 = self._cache[0][t0], self._cache[1][t0]
+        Yv = np.nan_to_num(self.Y[t0:])[None]
+        tail = kalman_filter(self.ss, Yv, mask[t0:], a0, P0)
+        if t0 == 0 or self._cache is None:
+            self._cache = tail
+        else:
+            self._cache = tuple(np.concatenate([c[:t0], x]) for c, x in zip(self._cache, tail))
+
+    def _extend(self, T: int) -> None:
+        """Grow the grid to T months (new months unobserved); filters only the new rows."""
+        old = self.Y.shape[0]
+        if T <= old:
+            return
+        self.Y = np.vstack([self.Y, np.full((T - old, self.Y.shape[1]), np.nan)])
+        a_p, P_p, a_f, P_f = self._cache
+        A, Q = self.ss.A, self.ss.Q
+        a_last, P_last = A @ a_f[-1], A @ P_f[-1] @ A.T + Q
+        tail = kalman_filter(
+            self.ss,
+            np.zeros((a_last.shape[1], T - old, self.Y.shape[1])),
+            np.zeros((T - old, self.Y.shape[1]), bool),
+            a_last,
+            P_last,
+        )
+        self._cache = tuple(np.concatenate([c, x]) for c, x in zip(self._cache, tail))
+
+    # ---- nowcasts ----
+    def _row(self, quarter: date) -> int:
+        m = int(np.datetime64(quarter, "M").astype(np.int64))
+        return m - m % 3 + 2 - self.m0
+
+    def _quarter(self, row: int) -> date:
+        return np.datetime64(self.m0 + row - 2, "M").astype("datetime64[D]").item()
+
+    def current_quarter(self) -> date:
+        """Quarter of the latest month with indicator data (ragged-edge nowcast target)."""
+        obs = ~np.isnan(self.Y[:, :-1])
+        last = int(np.nonzero(obs.any(axis=1))[0].max())
+        return self._quarter(last - last % 3 + 2)
+
+    def _predict(self, row: int, cache: Tuple[np.ndarray, ...]) -> np.ndarray:
+        """Target (standardized) at `row` per data version, from smoothed states."""
+        a_s = smooth_states(self.ss.A, *cache, t_min=row)[0]
+        return self.ss.Z[-1] @ a_s
+
+    def _to_units(self, x: np.ndarray) -> np.ndarray:
+        c = self.columns[-1]
+        return c.mean + c.std * x
+
+    def nowcast(self, quarter: Optional[date] = None) -> float:
+        """Expected target growth for `quarter` (default: `current_quarter()`)."""
+        row = self._row(quarter or self.current_quarter())
+        self._extend(row + 1)
+        return float(self._to_units(self._predict(row, self._cache))[0])
+
+    # ---- incremental update ----
+    def update(
+        self,
+        series: str,
+        dates: np.ndarray,
+        levels: np.ndarray,
+        quarter: Optional[date] = None,
+    ) -> NewsReport:
+        """
+        Replace one series with its new vintage (levels as stored) and re-filter from
+        the first changed month only. Returns the nowcast change split into the effect
+        of revisions to published values and the news of each new observation.
+        """
+        j = self.names.index(series)
+        col = self.columns[j]
+        quarter = quarter or self.current_quarter()
+        row = self._row(quarter)
+        months = _months(dates)
+        need = int(months.max()) - self.m0 + (3 if col.quarterly else 1) if len(months) else 0
+        self._extend(max(row + 1, need))
+        T = self.Y.shape[0]
+        new = (_raw_column(dates, levels, col.quarterly, col.log, self.m0, T) - col.mean) / col.std
+        old = self.Y[:, j]
+        changed = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+        y_old = self.nowcast(quarter)
+        if not changed.any():
+            return NewsReport(quarter, y_old, y_old, y_old, [])
+
+        t0 = int(np.nonzero(changed)[0][0])
+        fresh = np.nonzero(np.isnan(old) & ~np.isnan(new))[0]
+        Y_rev = self.Y.copy()
+        revised = changed.copy()
+        revised[fresh] = False
+        Y_rev[revised, j] = new[revised]
+
+        # step 1: revisions only (old availability pattern, minus withdrawn values)
+        a_p, P_p = self._cache[0][t0], self._cache[1][t0]
+        tail = kalman_filter(
+            self.ss, np.nan_to_num(Y_rev[t0:])[None], ~np.isnan(Y_rev[t0:]), a_p, P_p
+        )
+        rev_cache = self._merge(tail, t0, 1)
+        lo = min(row, t0)
+        s_rev = smooth_states(self.ss.A, *rev_cache, t_min=lo)
+        y_rev = float(self._to_units(self.ss.Z[-1] @ s_rev[row - lo])[0])
+        expected = np.array([float(self.ss.Z[j] @ s_rev[t - lo][:, 0]) for t in fresh])
+
+        # step 2: one data version per new observation (+ base and actual), one pass
+        Y_base = Y_rev.copy()
+        Y_base[fresh, j] = expected
+        k = len(fresh) + 2
+        Yv = np.repeat(np.nan_to_num(Y_base[t0:])[None], k, axis=0)
+        for i, t in enumerate(fresh):
+            Yv[i + 1, t - t0, j] += 1.0
+            Yv[k - 1, t - t0, j] = new[t]
+        mask = ~np.isnan(Y_base[t0:])
+        tail = kalman_filter(self.ss, Yv, mask, np.repeat(a_p, k, axis=1), P_p)
+        versions = self._merge(tail, t0, k)
+        y = self._to_units(self._predict(row, versions))
+        weights = (y[1:-1] - y[0]) / col.std  # per unit of the series' growth rate
+        items = [
+            NewsItem(
+                series=series,
+                month=np.datetime64(self.m0 + int(t), "M").astype("datetime64[D]").item(),
+                actual=float(col.mean + col.std * new[t]),
+                expected=float(col.mean + col.std * expected[i]),
+                weight=float(weights[i]),
+                impact=float(weights[i] * col.std * (new[t] - expected[i])),
+            )
+            for i, t in enumerate(fresh)
+        ]
+
+        # commit: the actual data becomes the cached state
+        self.Y[:, j] = new
+        self._cache = (versions[0][..., -1:], versions[1], versions[2][..., -1:], versions[3])
+        return NewsReport(quarter, y_old, y_rev, float(y[-1]), items)
+
+    def _merge(self, tail: Tuple[np.ndarray, ...], t0: int, k: int) -> Tuple[np.ndarray, ...]:
+        """Cached moments before t0 (broadcast to k versions) + the re-filtered tail."""
+        a_p, P_p, a_f, P_f = self._cache
+        return (
+            np.concatenate([np.repeat(a_p[:t0], k, axis=2), tail[0]]),
+            np.concatenate([P_p[:t0], tail[1]]),
+            np.concatenate([np.repeat(a_f[:t0], k, axis=2), tail[2]]),
+            np.concatenate([P_f[:t0], tail[3]]),
+        )
+
+
+# ---------- two-step estimation ----------
+def _ols(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    return beta, y - X @ beta
+
+
+def _mm_aggregate(F: np.ndarray) -> np.ndarray:
+    """Mariano-Murasawa sum of the factors; NaN wherever any of the five months is."""
+    G = np.full_like(F, np.nan)
+    G[LAGS - 1 :] = sum(w * F[LAGS - 1 - lag : len(F) - lag] for lag, w in enumerate(MM_WEIGHTS))
+    return G
+
+
+def _stationary(Af: np.ndarray) -> np.ndarray:
+    """Scale a VAR(1) matrix so its spectral radius is at most `MAX_ROOT`."""
+    rho = float(np.max(np.abs(np.linalg.eigvals(Af)))) if Af.size else 0.0
+    return Af * (MAX_ROOT / rho) if rho > MAX_ROOT else Af
+
+
+def _unconditional_cov(A: np.ndarray, Q: np.ndarray) -> np.ndarray:
+    """Solve P = A P A' + Q (A stable) directly: vec(P) = (I - A kron A)^-1 vec(Q)."""
+    m = len(A)
+    P = np.linalg.solve(np.eye(m * m) - np.kron(A, A), Q.reshape(-1)).reshape(m, m)
+    return (P + P.T) / 2
+
+
+def _estimate(Y: np.ndarray, r: int) -> StateSpace:
+    """Principal components on the monthly block, then OLS for every equation."""
+    X = Y[:, :-1]
+    n_m = X.shape[1]
+    if r > n_m:
+        raise ValueError(f"factors={r} exceeds the {n_m} monthly indicators")
+    obs = ~np.isnan(X)
+    rows = obs.mean(axis=1) >= 0.5  # months with most indicators published
+    if rows.sum() < max(LAGS + 2, 2 * r + 2):
+        raise ValueError("not enough months with indicator data to estimate factors")
+    Xf = np.where(obs, X, 0.0)[rows]
+    _, _, vt = np.linalg.svd(Xf, full_matrices=False)
+    F = np.full((len(X), r), np.nan)
+    F[rows] = Xf @ vt[:r].T
+
+    lam = np.zeros((n_m, r))
+    R = np.ones(n_m + 1)
+    for i in range(n_m):
+        ok = obs[:, i] & rows
+        lam[i], resid = _ols(F[ok], X[ok, i])
+        R[i] = max(float(resid.var()), _VAR_FLOOR) if ok.sum() > r else 1.0
+
+    ok = rows[1:] & rows[:-1]
+    Af, u = _ols(F[:-1][ok], F[1:][ok])
+    Af = _stationary(Af.T)
+    Qf = np.cov(u.T).reshape(r, r) if len(u) > 1 else np.eye(r)
+
+    # quarterly target on the Mariano-Murasawa aggregate of the factors
+    G = _mm_aggregate(F)
+    y = Y[:, -1]
+    ok = ~np.isnan(y) & ~np.isnan(G).any(axis=1)
+    if ok.sum() <= r:
+        raise ValueError("not enough target observations overlapping the indicators")
+    lam_q, resid = _ols(G[ok], y[ok])
+    R[-1] = max(float(resid.var()), _VAR_FLOOR)
+
+    m = r * LAGS
+    Z = np.zeros((n_m + 1, m))
+    Z[:n_m, :r] = lam
+    for lag, w in enumerate(MM_WEIGHTS):
+        Z[-1, lag * r : (lag + 1) * r] = w * lam_q
+    A = np.zeros((m, m))
+    A[:r, :r] = Af
+    A[r:, :-r] = np.eye(m - r)
+    Q = np.zeros((m, m))
+    Q[:r, :r] = Qf
+    P0 = _unconditional_cov(A, Q)
+    return StateSpace(Z=Z, R=R, A=A, Q=Q, a0=np.zeros(m), P0=P0)
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Dynamic factor nowcast of quarterly GDP growth")
+    ap.add_argument("--target", default="GDP", help="Quarterly series to nowcast")
+    ap.add_argument("--indicators", required=True, help="Comma-separated monthly series ids")
+    ap.add_argument("--factors", type=int, default=1, help="Number of factors")
+    ap.add_argument("--asof", default=None, help="Use the vintages in force on YYYY-MM-DD")
+    ap.add_argument("--quarter", default=None, help="Quarter to nowcast (any date in it)")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    args = ap.parse_args(argv)
+
+    model = DynamicFactorModel.from_store(
+        args.target,
+        [s.strip() for s in args.indicators.split(",") if s.strip()],
+        base=Path(args.base),
+        asof=date.fromisoformat(args.asof) if args.asof else None,
+        factors=args.factors,
+    )
+    q = date.fromisoformat(args.quarter) if args.quarter else model.current_quarter()
+    print(f"[dfm] {args.target} {q:%Y}Q{(q.month - 1) // 3 + 1}: {model.nowcast(q):.3f}")
+    return 0
+
+
+__all__ = [
+    "DynamicFactorModel",
+    "StateSpace",
+    "NewsItem",
+    "NewsReport",
+    "kalman_filter",
+    "smooth_states",
+    "MM_WEIGHTS",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+# src/nowcast_gdp/fakealfred.py
+"""
+Local ALFRED stand-in for offline tests and ingest benchmarks.
+
+Serves the two endpoints the client uses, with FRED's JSON shapes:
+
+  GET /fred/series/vintagedates?series_id=GDP[&realtime_start=YYYY-MM-DD]
+  GET /fred/series/observations?series_id=GDP&vintage_dates=a,b,c[&limit=&offset=]
+
+Observations come back as realtime-period rows (realtime_start..realtime_end), so
+batched multi-vintage requests exercise the same splitting logic as the real API.
+Data comes from a synthetic generator or from an ingested tree (data/raw/alfred).
+Latency, 429 rate limiting (with Retry-After) and random 5xx faults are configurable.
+
+  python -m nowcast_gdp.fakealfred --synthetic GDP:120:300 --latency 0.02 --port 8099
+  FRED_BASE_URL=http://127.0.0.1:8099/fred FRED_API_KEY=x python -m nowcast_gdp.ingest_alfred ...
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .delta import list_stored_vintages, read_vintage_rows
+from .ratelimit import TokenBucket
+
+# series id -> {vintage: [(obs date iso, value str)]}
+Fixture = Dict[str, Dict[date, List[Tuple[str, str]]]]
+
+_OPEN_END = "9999-12-31"
+
+
+# ---------- fixtures ----------
+def synthetic_series(
+    n_vintages: int,
+    n_obs: int,
+    start_vintage: date = date(2000, 1, 28),
+    seed: int = 0,
+) -> Dict[date, List[Tuple[str, str]]]:
+    """
+    Quarterly observations with a monthly vintage cadence: every vintage revises the
+    last few quarters, and every third vintage publishes a new quarter.
+    """
+    rng = random.Random(seed)
+    first_obs = n_obs - n_vintages // 3 - 1
+    level = [100.0 + i for i in range(n_obs)]
+    out: Dict[date, List[Tuple[str, str]]] = {}
+    for k in range(n_vintages):
+        y, m = divmod(start_vintage.month - 1 + k, 12)
+        v = date(start_vintage.year + y, m + 1, min(start_vintage.day, 28))
+        known = max(1, min(n_obs, first_obs + k // 3))
+        for i in range(max(0, known - 4), known):
+            level[i] += rng.uniform(-0.5, 0.5)
+        rows = []
+        for i in range(known):
+            qy, qm = divmod(3 * i, 12)
+            rows.append((date(1950 + qy, qm + 1, 1).isoformat(), f"{level[i]:.6f}"))
+        out[v] = rows
+    return out
+
+
+def load_tree(root: Path, series: Optional[List[str]] = None) -> Fixture:
+    """Recorded fixture: every vintage stored under an ingested tree (full or delta)."""
+    dirs = [root / s for s in series] if series else sorted(p for p in root.iterdir())
+    out: Fixture = {}
+    for sdir in dirs:
+        if not sdir.is_dir() or sdir.name.startswith("_"):
+            continue
+        out[sdir.name] = {
+            v: [(r["date"], r.get("value", "")) for r in read_vintage_rows(sdir, v)]
+            for v in list_stored_vintages(sdir)
+        }
+    return out
+
+
+def realtime_rows(
+    vintages: Dict[date, List[Tuple[str, str]]], requested: List[date]
+) -> List[Dict[str, str]]:
+    """
+    Observation rows for the requested vintages, with runs of unchanged values merged
+    into one realtime period the way ALFRED reports them.
+    """
+    req = sorted(v for v in set(requested) if v in vintages)
+    # obs date -> value per requested vintage (None where absent)
+    per_date: Dict[str, List[Optional[str]]] = {}
+    for j, v in enumerate(req):
+        for d, val in vintages[v]:
+            per_date.setdefault(d, [None] * len(req))[j] = val
+    rows: List[Dict[str, str]] = []
+    for d in sorted(per_date):
+        vals = per_date[d]
+        j = 0
+        while j < len(req):
+            if vals[j] is None:
+                j += 1
+                continue
+            k = j
+            while k + 1 < len(req) and vals[k + 1] == vals[j]:
+                k += 1
+            end = (req[k + 1] - timedelta(days=1)).isoformat() if k + 1 < len(req) else _OPEN_END
+            rows.append(
+                {
+                    "realtime_start": req[j].isoformat(),
+                    "realtime_end": end,
+                    "date": d,
+                    "value": vals[j] or ".",
+                }
+            )
+            j = k + 1
+    return rows
+
+
+# ---------- server ----------
+@dataclass
+class FaultConfig:
+    latency: float = 0.0  # seconds added to every response
+    rate_limit: float = 0.0  # requests/second before answering 429 (0 = unlimited)
+    burst: float = 10.0
+    retry_after: int = 1  # Retry-After header on 429s (whole seconds)
+    error_rate: float = 0.0  # probability of a 503 per request
+    seed: int = 0
+
+
+@dataclass
+class ServerStats:
+    by_endpoint: Counter = field(default_factory=Counter)
+    by_status: Counter = field(default_factory=Counter)
+
+
+class AlfredStandIn:
+    """Threaded local server; use as a context manager, point clients at `.url`."""
+
+    def __init__(
+        self,
+        fixture: Fixture,
+        faults: Optional[FaultConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fixture = fixture
+        self.faults = faults or FaultConfig()
+        self.stats = ServerStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._bucket = (
+            TokenBucket(self.faults.rate_limit, self.faults.burst)
+            if self.faults.rate_limit > 0
+            else None
+        )
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/fred"
+
+    def start(self) -> "AlfredStandIn":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "AlfredStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---- request handling ----
+    def _record(self, endpoint: str, status: int) -> None:
+        with self._lock:
+            self.stats.by_endpoint[endpoint] += 1
+            self.stats.by_status[status] += 1
+
+    def _fault(self) -> Optional[int]:
+        f = self.faults
+        if self._bucket is not None and not self._bucket.try_acquire():
+            return 429
+        if f.error_rate > 0:
+            with self._lock:
+                if self._rng.random() < f.error_rate:
+                    return 503
+        return None
+
+    def answer(self, path: str, q: Dict[str, str]) -> Tuple[int, Dict]:
+        endpoint = path.rsplit("/fred/", 1)[-1].strip("/")
+        sid = q.get("series_id", "")
+        if endpoint not in ("series/vintagedates", "series/observations"):
+            return 404, {"error_message": f"Unknown endpoint {endpoint}"}
+        series = self.fixture.get(sid)
+        if series is None:
+            return 400, {"error_message": "Bad Request.  The series does not exist."}
+
+        if endpoint == "series/vintagedates":
+            vs = sorted(series)
+            if q.get("realtime_start"):
+                lo = date.fromisoformat(q["realtime_start"])
+                vs = [v for v in vs if v >= lo]
+            return 200, {"count": len(vs), "vintage_dates": [v.isoformat() for v in vs]}
+
+        requested = [date.fromisoformat(s) for s in q.get("vintage_dates", "").split(",") if s]
+        if not requested:
+            requested = [max(series)]
+        rows = realtime_rows(series, requested)
+        offset = int(q.get("offset", 0) or 0)
+        limit = int(q.get("limit", 100000) or 100000)
+        return 200, {
+            "count": len(rows),
+            "offset": offset,
+            "limit": limit,
+            "observations": rows[offset : offset + limit],
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server API)
+                u = urlparse(self.path)
+                q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+                endpoint = u.path.rsplit("/fred/", 1)[-1].strip("/")
+                if server.faults.latency > 0:
+                    time.sleep(server.faults.latency)
+                status = server._fault()
+                headers = {}
+                if status == 429:
+                    body = {"error_code": 429, "error_message": "Too Many Requests."}
+                    headers["Retry-After"] = str(int(server.faults.retry_after))
+                elif status is not None:
+                    body = {"error_code": status, "error_message": "Service Unavailable"}
+                else:
+                    status, body = server.answer(u.path, q)
+                server._record(endpoint, status)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+# ---------- CLI ----------
+def _parse_synthetic(specs: List[str]) -> Fixture:
+    out: Fixture = {}
+    for i, spec in enumerate(specs):
+        sid, nv, no = (spec.split(":") + ["120", "300"])[:3]
+        out[sid] = synthetic_series(int(nv), int(no), seed=i)
+    return out
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Serve a local ALFRED stand-in")
+    ap.add_argument("--tree", default=None, help="Serve an ingested tree (e.g. data/raw/alfred)")
+    ap.add_argument(
+        "--synthetic",
+        action="append",
+        default=[],
+        metavar="SID:VINTAGES:OBS",
+        help="Synthetic series (repeatable), e.g. GDP:120:300",
+    )
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8099)
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="Requests/sec before 429s")
+    ap.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503")
+    args = ap.parse_args(argv)
+
+    fixture = load_tree(Path(args.tree)) if args.tree else {}
+    fixture.update(_parse_synthetic(args.synthetic))
+    if not fixture:
+        ap.error("nothing to serve: pass --tree and/or --synthetic")
+    faults = FaultConfig(
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+    )
+    srv = AlfredStandIn(fixture, faults, host=args.host, port=args.port)
+    print(f"[fakealfred] serving {len(fixture)} series at {srv.url}")
+    try:
+        srv._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv._httpd.server_close()
+    return 0
+
+
+__all__ = [
+    "AlfredStandIn",
+    "FaultConfig",
+    "ServerStats",
+    "synthetic_series",
+    "load_tree",
+    "realtime_rows",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
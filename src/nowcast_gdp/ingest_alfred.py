@@ -1,18 +1,47 @@
 # src/nowcast_gdp/ingest_alfred.py
 from __future__ import annotations
 
+import json
 import time
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional, TypeVar
 
 from .alfred import (
-    fetch_observations_for_vintage,  # returns list[Observation(date,value)]
+    DEFAULT_VINTAGE_CHUNK,
+    fetch_observations_for_vintage,  # returns ObservationBlock
+    fetch_observations_for_vintages,  # returns {vintage: ObservationBlock}
+    iter_vintage_blocks,  # yields bounded ObservationBlocks off the socket
     list_vintage_dates,
 )
-from .io import ensure_dir, write_csv, write_index_unique_sorted
+from .delta import (
+    DEFAULT_KEYFRAME_EVERY,
+    list_stored_vintages,
+    vintage_exists,
+    vintage_file,
+    vintage_from_filename,
+)
+from .delta import write_vintage as write_vintage_delta
+from .integrity import repair_series, verify_series
+from .io import IndexBuffer, atomic_write, ensure_dir, last_index_entry, update_index
+from .journal import IngestJournal, find_unfinished
+from .metrics import METRICS
+from .observations import ObservationBlock, as_block, write_csv_blocks
 from .registry import load_registry, select_series
+from .revisions import state_path, update_revision_state
+from .store import has_store, update_store
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# index entries are committed once per this many written vintages during a backfill
+INDEX_FLUSH_EVERY = 100
+
+LISTING_CACHE_DIRNAME = "_cache"
+# CLI default for how long a cached vintage listing is trusted (library default: no cache)
+DEFAULT_LISTING_TTL = 300.0
 
 
 def data_root(base: Path | None = None) -> Path:
@@ -33,60 +62,522 @@ def index_path(series_id: str, base: Path | None = None) -> Path:
 
 
 def _obs_to_rows(obs) -> list[dict[str, str]]:
-    """Map Observation(date,value|None) -> CSV rows with empty-string for missing."""
-    rows: list[dict[str, str]] = []
-    for o in obs:
-        rows.append(
-            {
-                "date": o.date.isoformat(),
-                "value": "" if o.value is None else f"{o.value:.6f}",
-            }
-        )
-    return rows
+    """Map observations (block or Observation(date,value|None)) -> CSV rows, '' for missing."""
+    return as_block(obs).to_rows()
+
 
+STORAGE_MODES = ("full", "delta")
 
-def persist_series_vintage(series_id: str, vintage: date, base: Path | None = None) -> Path:
+
+def _write_vintage_rows(
+    series_id: str,
+    vintage: date,
+    obs,
+    base: Path | None,
+    storage: str,
+    keyframe_every: int,
+) -> Path:
+    """Write one vintage; `obs` is an ObservationBlock (or any Observation iterable)."""
+    block = as_block(obs)
+    with METRICS.time_stage("write_vintage"):
+        if storage == "delta":
+            return write_vintage_delta(
+                series_dir(series_id, base), vintage, block.to_rows(), keyframe_every
+            )
+        path = vintage_path(series_id, vintage, base)
+        block.write_csv(path)
+        return path
+
+
+def persist_series_vintage(
+    series_id: str,
+    vintage: date,
+    base: Path | None = None,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    index_buffer: Optional[IndexBuffer] = None,
+) -> Path:
     """
     Fetch observations for a vintage and write to:
       data/raw/alfred/{series}/{YYYY-MM-DD}.csv
     Also update index.csv (idempotent; skip if file exists).
+    With storage="delta" the vintage may instead be written as
+    {YYYY-MM-DD}.delta.csv against the previous vintage (see `delta`).
+    With an `index_buffer` the index entry is queued and committed by the buffer.
+
+    Full storage streams the response to disk block by block; delta storage diffs
+    against the previous vintage and so still needs the whole vintage in memory.
     """
-    path = vintage_path(series_id, vintage, base)
-    if path.exists():
-        return path
-    obs = fetch_observations_for_vintage(series_id, vintage)
-    write_csv(path, _obs_to_rows(obs), header=["date", "value"])
-    write_index_unique_sorted(index_path(series_id, base), [vintage.isoformat()])
+    existing = vintage_file(series_dir(series_id, base), vintage)
+    if existing is not None:
+        return existing
+    if storage == "delta":
+        obs = fetch_observations_for_vintage(series_id, vintage)
+        path = _write_vintage_rows(series_id, vintage, obs, base, storage, keyframe_every)
+    else:
+        path = vintage_path(series_id, vintage, base)
+        with METRICS.time_stage("write_vintage"):  # includes the streamed fetch
+            write_csv_blocks(path, (as_block(b) for b in iter_vintage_blocks(series_id, vintage)))
+    _add_index(index_path(series_id, base), [vintage.isoformat()], index_buffer)
     return path
 
 
+def _add_index(idx: Path, entries: list[str], index_buffer: Optional[IndexBuffer]) -> None:
+    if index_buffer is None:
+        update_index(idx, entries)
+        return
+    for e in entries:
+        index_buffer.add(idx, e)
+
+
+def persist_series_vintages_batched(
+    series_id: str,
+    vintages: Iterable[date],
+    base: Path | None = None,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    index_buffer: Optional[IndexBuffer] = None,
+) -> list[Path]:
+    """
+    Fetch several vintages with one batched ALFRED call and write each to its own
+      data/raw/alfred/{series}/{YYYY-MM-DD}.csv
+    exactly as `persist_series_vintage` would. index.csv is updated once per batch.
+    Vintages whose file already exists are skipped.
+    """
+    sdir = series_dir(series_id, base)
+    todo = [v for v in sorted(set(vintages)) if not vintage_exists(sdir, v)]
+    if not todo:
+        return []
+    by_vintage = fetch_observations_for_vintages(series_id, todo)
+    written: list[Path] = []
+    for v in todo:
+        obs = by_vintage.get(v, ObservationBlock.empty())
+        written.append(_write_vintage_rows(series_id, v, obs, base, storage, keyframe_every))
+    _add_index(index_path(series_id, base), [v.isoformat() for v in todo], index_buffer)
+    return written
+
+
+def _run_pool(fn: Callable[[T], R], items: list[T], concurrency: int = 1) -> list[R]:
+    """
+    Apply `fn` to every item, in a thread pool when concurrency > 1.
+    Results keep the order of `items`; the first failure cancels pending work and is re-raised.
+    """
+    if concurrency <= 1 or len(items) <= 1:
+        return [fn(it) for it in items]
+    results: list[Optional[R]] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as pool:
+        futures = {pool.submit(fn, it): i for i, it in enumerate(items)}
+        try:
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+    return results  # type: ignore[return-value]
+
+
+def _persist_tasks(
+    tasks: list[tuple[str, date]],
+    base: Path | None = None,
+    throttle_sec: float = 0.0,
+    concurrency: int = 1,
+    batch_size: int = 1,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    journal: Optional[IngestJournal] = None,
+) -> list[Path]:
+    """
+    Persist (series_id, vintage) pairs, skipping existing files. Returns written paths.
+    With batch_size > 1 each series' vintages are fetched in chunks of that size
+    (one request per chunk) and the chunks become the pool's work items.
+    Delta storage needs each series written in vintage order, so there the pool
+    parallelizes across series only.
+    index.csv entries are buffered and committed every INDEX_FLUSH_EVERY vintages
+    (appending when they sort after the current tail) and always on exit.
+    Series with a compacted columnar store get the new vintages folded in.
+    With a `journal`, every vintage gets start/done records.
+    Skipped vintages missing from index.csv (a run killed before its index flush)
+    are indexed here, since no later run would fetch them again.
+    """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"storage must be one of {STORAGE_MODES}, got {storage!r}")
+    todo, stored = [], []
+    for sid, v in tasks:
+        (stored if vintage_exists(series_dir(sid, base), v) else todo).append((sid, v))
+    _index_unlisted(stored, base)
+    with IndexBuffer(flush_every=INDEX_FLUSH_EVERY) as buf:
+        if storage == "delta":
+            per_series: dict[str, list[date]] = {}
+            for sid, v in todo:
+                per_series.setdefault(sid, []).append(v)
+
+            def _series(item: tuple[str, list[date]]) -> list[Path]:
+                sid, vs = item
+                ordered = [(sid, v) for v in sorted(vs)]
+                return _fetch_tasks(
+                    ordered,
+                    base,
+                    throttle_sec,
+                    1,
+                    batch_size,
+                    storage,
+                    keyframe_every,
+                    buf,
+                    journal,
+                )
+
+            chunks = _run_pool(_series, list(per_series.items()), concurrency)
+            written = [p for ps in chunks for p in ps]
+        else:
+            written = _fetch_tasks(
+                todo, base, throttle_sec, concurrency, batch_size, index_buffer=buf, journal=journal
+            )
+    _refresh_stores(written)
+    return written
+
+
+def _index_unlisted(stored: list[tuple[str, date]], base: Path | None = None) -> None:
+    """Add stored (series_id, vintage) pairs that index.csv does not list yet."""
+    by_series: dict[str, list[str]] = {}
+    for sid, v in stored:
+        by_series.setdefault(sid, []).append(v.isoformat())
+    for sid, entries in by_series.items():
+        idx = index_path(sid, base)
+        listed = set(idx.read_text(encoding="utf-8").split()) if idx.exists() else set()
+        missing = [e for e in entries if e not in listed]
+        if missing:
+            update_index(idx, missing)
+
+
+def _run_tasks(
+    tasks: list[tuple[str, date]],
+    base: Path | None = None,
+    journal: bool = False,
+    **opts,
+) -> list[Path]:
+    """_persist_tasks, optionally under a new run journal (see `journal`)."""
+    if not tasks:
+        return []
+    if not journal:
+        return _persist_tasks(tasks, base=base, **opts)
+    todo = [(sid, v) for sid, v in tasks if not vintage_exists(series_dir(sid, base), v)]
+    with IngestJournal.create(data_root(base)) as j:
+        j.plan(
+            todo,
+            **{k: opts[k] for k in ("storage", "keyframe_every", "batch_size") if k in opts},
+        )
+        return _persist_tasks(tasks, base=base, journal=j, **opts)
+
+
+def resume_ingest(
+    base: Path | None = None,
+    run_id: Optional[str] = None,
+    throttle_sec: float = 0.0,
+    concurrency: int = 1,
+) -> list[Path]:
+    """
+    Finish an interrupted journaled run (the latest unfinished one unless `run_id`):
+    no vintage re-listing; only planned vintages without a file are fetched.
+    Index entries of vintages that completed before the crash are committed first.
+    """
+    st = find_unfinished(data_root(base), run_id)
+    if st is None:
+        print("[resume] no unfinished ingest journal")
+        return []
+
+    completed: dict[str, list[str]] = {}
+    pending: list[tuple[str, date]] = []
+    for sid, v in st.planned:
+        if vintage_exists(series_dir(sid, base), v):
+            completed.setdefault(sid, []).append(v.isoformat())
+        else:
+            pending.append((sid, v))
+    for sid, entries in completed.items():
+        update_index(index_path(sid, base), entries)
+
+    print(f"[resume] {st.run_id}: {len(pending)} of {len(st.planned)} planned vintages left")
+    opts = {
+        k: st.options[k] for k in ("storage", "keyframe_every", "batch_size") if k in st.options
+    }
+    with IngestJournal(st.path) as j:
+        return _persist_tasks(
+            pending,
+            base=base,
+            throttle_sec=throttle_sec,
+            concurrency=concurrency,
+            journal=j,
+            **opts,
+        )
+
+
+def _refresh_stores(written: list[Path]) -> None:
+    """
+    Fold freshly written vintages into the columnar store and the revision state of
+    series that have them.
+    """
+    by_dir: dict[Path, list[date]] = {}
+    for p in written:
+        v = vintage_from_filename(p.name)
+        if v is not None:
+            by_dir.setdefault(p.parent, []).append(v)
+    for sdir, vs in by_dir.items():
+        if has_store(sdir):
+            with METRICS.time_stage("store_update"):
+                update_store(sdir, vs)
+        if state_path(sdir).exists():
+            with METRICS.time_stage("revisions_update"):
+                update_revision_state(sdir)
+
+
+def _fetch_tasks(
+    todo: list[tuple[str, date]],
+    base: Path | None,
+    throttle_sec: float,
+    concurrency: int,
+    batch_size: int,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    index_buffer: Optional[IndexBuffer] = None,
+    journal: Optional[IngestJournal] = None,
+) -> list[Path]:
+    if batch_size <= 1:
+
+        def _one(task: tuple[str, date]) -> Path:
+            sid, v = task
+            if journal is not None:
+                journal.start(sid, v)
+            p = persist_series_vintage(sid, v, base, storage, keyframe_every, index_buffer)
+            if journal is not None:
+                journal.done(sid, v)
+            if throttle_sec > 0:
+                time.sleep(throttle_sec)
+            return p
+
+        return _run_pool(_one, todo, concurrency)
+
+    per_series: dict[str, list[date]] = {}
+    for sid, v in todo:
+        per_series.setdefault(sid, []).append(v)
+    chunks = [
+        (sid, vs[i : i + batch_size])
+        for sid, vs in per_series.items()
+        for i in range(0, len(vs), batch_size)
+    ]
+
+    def _chunk(task: tuple[str, list[date]]) -> list[Path]:
+        sid, vs = task
+        if journal is not None:
+            for v in vs:
+                journal.start(sid, v)
+        ps = persist_series_vintages_batched(sid, vs, base, storage, keyframe_every, index_buffer)
+        if journal is not None:
+            for v in vs:
+                journal.done(sid, v)
+        if throttle_sec > 0:
+            time.sleep(throttle_sec)
+        return ps
+
+    return [p for ps in _run_pool(_chunk, chunks, concurrency) for p in ps]
+
+
+# ---------- vintage discovery ----------
+def listing_cache_path(series_id: str, base: Path | None = None) -> Path:
+    return data_root(base) / LISTING_CACHE_DIRNAME / "vintagedates" / f"{series_id}.json"
+
+
+def list_vintages_cached(
+    series_id: str,
+    realtime_start: Optional[date] = None,
+    base: Path | None = None,
+    ttl: float = 0.0,
+) -> list[date]:
+    """
+    `list_vintage_dates` behind an on-disk cache: a listing fetched less than `ttl`
+    seconds ago (from the same or an earlier realtime_start) is reused without a
+    request. ttl <= 0 disables the cache.
+    """
+    path = listing_cache_path(series_id, base)
+    if ttl > 0 and path.exists():
+        try:
+            c = json.loads(path.read_text(encoding="utf-8"))
+            cached_rs = date.fromisoformat(c["realtime_start"]) if c["realtime_start"] else None
+            fresh = time.time() - float(c["fetched_at"]) < ttl
+            covers = cached_rs is None or (
+                realtime_start is not None and cached_rs <= realtime_start
+            )
+            if fresh and covers:
+                vs = [date.fromisoformat(v) for v in c["vintages"]]
+                return [v for v in vs if realtime_start is None or v >= realtime_start]
+        except (ValueError, KeyError, TypeError):
+            pass  # unreadable cache -> refetch
+
+    if realtime_start is None:
+        vs = list_vintage_dates(series_id)
+    else:
+        vs = list_vintage_dates(series_id, realtime_start=realtime_start)
+    if ttl > 0:
+        rec = {
+            "fetched_at": time.time(),
+            "realtime_start": realtime_start.isoformat() if realtime_start else None,
+            "vintages": [v.isoformat() for v in vs],
+        }
+        with atomic_write(path) as f:
+            json.dump(rec, f)
+    return vs
+
+
+def coverage_path(series_id: str, base: Path | None = None) -> Path:
+    return data_root(base) / LISTING_CACHE_DIRNAME / "coverage" / f"{series_id}.json"
+
+
+def record_coverage(
+    series_id: str,
+    start: Optional[date],
+    base: Path | None = None,
+    through: Optional[date] = None,
+) -> None:
+    """
+    Note that every vintage on or after `start` (None = all) up to `through` is now
+    stored. `through` is the incremental watermark and only moves forward.
+    """
+    prev = ingested_through(series_id, base)
+    if prev is not None and (through is None or through < prev):
+        through = prev
+    path = coverage_path(series_id, base)
+    with atomic_write(path) as f:
+        json.dump(
+            {
+                "start": start.isoformat() if start else None,
+                "through": through.isoformat() if through else None,
+            },
+            f,
+        )
+
+
+def _coverage(series_id: str, base: Path | None = None) -> Optional[dict]:
+    try:
+        return json.loads(coverage_path(series_id, base).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def ingested_through(series_id: str, base: Path | None = None) -> Optional[date]:
+    """Newest vintage of the last run that completed (None when never recorded)."""
+    c = _coverage(series_id, base)
+    try:
+        return date.fromisoformat(c["through"]) if c and c.get("through") else None
+    except (ValueError, TypeError):
+        return None
+
+
+def history_covers(series_id: str, start: Optional[date], base: Path | None = None) -> bool:
+    """
+    Whether a full (not latest-only) ingest from `start` or earlier has completed, so
+    an incremental listing cannot miss older vintages. False when never recorded.
+    """
+    c = _coverage(series_id, base)
+    if c is None:
+        return False
+    try:
+        covered = date.fromisoformat(c["start"]) if c["start"] else None
+    except (ValueError, KeyError, TypeError):
+        return False
+    return covered is None or (start is not None and start >= covered)
+
+
+def newest_local_vintage(series_id: str, base: Path | None = None) -> Optional[date]:
+    """Newest vintage already stored: the tail of index.csv, else a directory scan."""
+    tail = last_index_entry(data_root(base) / series_id / "index.csv")
+    if tail:
+        try:
+            return date.fromisoformat(tail)
+        except ValueError:
+            pass  # torn last line
+    stored = list_stored_vintages(data_root(base) / series_id)
+    return stored[-1] if stored else None
+
+
 def persist_all_vintages(
     series_id: str,
     latest_only: bool = False,
     start: Optional[date] = None,
     base: Path | None = None,
     throttle_sec: float = 0.0,
+    concurrency: int = 1,
+    batch_size: int = 1,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    journal: bool = False,
+    incremental: bool = False,
+    listing_ttl: float = 0.0,
 ) -> list[Path]:
     """
     Persist either the latest vintage or all vintages (optionally >= start).
     Skips vintages already present. Optional throttle between requests.
+    With concurrency > 1 vintages are fetched on a thread pool; the shared
+    token bucket in `alfred` keeps the pool under FRED's request limit.
+    With batch_size > 1 vintages are requested `batch_size` at a time.
+    storage="delta" writes revision deltas with a keyframe every `keyframe_every`.
+    journal=True records the run so `resume_ingest` can finish it after a crash.
+    incremental=True only lists vintages after the newest one already stored
+    (via realtime_start); listing_ttl > 0 reuses a recent on-disk vintage listing.
     """
-    vdates = list_vintage_dates(series_id)
+    vdates = _select_vintages(
+        series_id,
+        latest_only=latest_only,
+        start=start,
+        base=base,
+        incremental=incremental,
+        listing_ttl=listing_ttl,
+    )
+    written = _run_tasks(
+        [(series_id, v) for v in vdates],
+        base=base,
+        journal=journal,
+        throttle_sec=throttle_sec,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        storage=storage,
+        keyframe_every=keyframe_every,
+    )
+    if not latest_only:
+        record_coverage(series_id, start, base, max(vdates, default=None))
+    return written
+
+
+def _select_vintages(
+    series_id: str,
+    latest_only: bool = False,
+    start: Optional[date] = None,
+    base: Path | None = None,
+    incremental: bool = False,
+    listing_ttl: float = 0.0,
+) -> list[date]:
+    newest = newest_local_vintage(series_id, base) if incremental else None
+    if newest is not None and not latest_only:
+        if not history_covers(series_id, start, base):
+            # e.g. vintage_start widened or the series left latest_only: backfill
+            print(
+                f"[ingest] {series_id}: stored vintages do not cover "
+                f"{f'vintages from {start}' if start else 'the full history'}; listing all"
+            )
+            newest = None
+        else:
+            # not the index tail: in a failed run a newer vintage can land while an
+            # older one is missing, so only a completed run advances the watermark
+            newest = ingested_through(series_id, base)
+    if newest is None:
+        vdates = list_vintages_cached(series_id, None, base, listing_ttl)
+    else:
+        since = max(newest, start) if start else newest
+        vdates = list_vintages_cached(series_id, since, base, listing_ttl)
+        vdates = [v for v in vdates if v > newest]  # nothing new -> []
     if start:
         vdates = [v for v in vdates if v >= start]
     if latest_only and vdates:
         vdates = [vdates[-1]]
-
-    written: list[Path] = []
-    for v in vdates:
-        p = vintage_path(series_id, v, base)
-        if p.exists():
-            continue
-        persist_series_vintage(series_id, v, base)
-        written.append(p)
-        if throttle_sec > 0:
-            time.sleep(throttle_sec)
-    return written
+    return vdates
 
 
 def ingest_from_registry(
@@ -95,38 +586,79 @@ def ingest_from_registry(
     latest_only: Optional[bool] = None,  # override per-series default if not None
     active_only: bool = True,
     throttle_sec: float = 0.0,
+    concurrency: int = 1,
+    base: Path | None = None,
+    batch_size: int = 1,
+    storage: str = "full",
+    keyframe_every: int = DEFAULT_KEYFRAME_EVERY,
+    journal: bool = False,
+    incremental: bool = False,
+    listing_ttl: float = 0.0,
 ) -> None:
-    """Ingest one or many series as declared in the TOML registry."""
+    """
+    Ingest one or many series as declared in the TOML registry.
+    Vintage listings are fetched first, then every (series, vintage) pair goes
+    through one shared pool so concurrency spans series as well as vintages.
+    With `incremental`, a poll where no series has a new vintage makes no
+    observation requests at all.
+    """
     reg = load_registry(registry_path)
     chosen = select_series(reg, include=series, active_only=active_only)
     if not chosen:
         print("No series selected; check registry or filters.")
         return
 
-    for sid, cfg in chosen.items():
-        series_id = cfg.fred_id
-        print(f"[ingest] {sid} (fred_id={series_id})")
+    def _options(cfg) -> tuple[bool, Optional[date]]:
         # Resolve latest-only behavior (global override wins if provided)
         use_latest = (
             latest_only if latest_only is not None else bool(getattr(cfg, "latest_only", False))
         )
-        if use_latest:
-            vdates = list_vintage_dates(series_id)
-            if not vdates:
-                print("  -> no vintages found")
-                continue
-            latest = vdates[-1]
-            print(f"  -> latest vintage: {latest}")
-            persist_series_vintage(series_id, latest)
+        return use_latest, None if use_latest else getattr(cfg, "vintage_start", None)
+
+    def _plan(cfg) -> list[date]:
+        use_latest, vstart = _options(cfg)
+        return _select_vintages(
+            cfg.fred_id,
+            latest_only=use_latest,
+            start=vstart,
+            base=base,
+            incremental=incremental,
+            listing_ttl=listing_ttl,
+        )
+
+    cfgs = list(chosen.values())
+    plans = _run_pool(_plan, cfgs, concurrency)
+
+    tasks: list[tuple[str, date]] = []
+    for (sid, cfg), vdates in zip(chosen.items(), plans):
+        series_id = cfg.fred_id
+        print(f"[ingest] {sid} (fred_id={series_id})")
+        if not vdates:
+            print("  -> up to date" if incremental else "  -> no vintages found")
+            continue
+        if len(vdates) == 1:
+            print(f"  -> latest vintage: {vdates[0]}")
         else:
-            vstart = getattr(cfg, "vintage_start", None)
-            print(f"  -> full ingest (start={vstart})")
-            persist_all_vintages(
-                series_id,
-                latest_only=False,
-                start=vstart,
-                throttle_sec=throttle_sec,
-            )
+            print(f"  -> full ingest ({len(vdates)} vintages from {vdates[0]})")
+        tasks.extend((series_id, v) for v in vdates)
+
+    if not tasks:
+        print("[ingest] nothing new; no observation requests made")
+    else:
+        _run_tasks(
+            tasks,
+            base=base,
+            journal=journal,
+            throttle_sec=throttle_sec,
+            concurrency=concurrency,
+            batch_size=batch_size,
+            storage=storage,
+            keyframe_every=keyframe_every,
+        )
+    for cfg, vdates in zip(cfgs, plans):
+        use_latest, vstart = _options(cfg)
+        if not use_latest:
+            record_coverage(cfg.fred_id, vstart, base, max(vdates, default=None))
 
 
 def _parse_bool_override(s: Optional[str]) -> Optional[bool]:
@@ -140,6 +672,60 @@ def _parse_bool_override(s: Optional[str]) -> Optional[bool]:
     raise ValueError(f"Invalid boolean override: {s!r}")
 
 
+def _verify(base: Path | None, series: list[str], repair: bool) -> int:
+    root = data_root(base)
+    if series:
+        dirs = [root / s for s in series]
+    elif root.exists():
+        dirs = [p for p in sorted(root.iterdir()) if p.is_dir() and not p.name.startswith("_")]
+    else:
+        dirs = []
+    problems = 0
+    for d in dirs:
+        rep = verify_series(d)
+        print(f"[verify] {rep.summary()}")
+        if not rep.ok:
+            problems += 1
+            if repair:
+                repair_series(d, rep)
+                print(f"[repair] {d.name}: removed {len(rep.tmp_files) + len(rep.partial)} files")
+    return 1 if problems and not repair else 0
+
+
+def _run(args, common: dict) -> int:
+    if args.resume:
+        resume_ingest(
+            base=common["base"],
+            run_id=None if args.resume == "latest" else args.resume,
+            throttle_sec=common["throttle_sec"],
+            concurrency=common["concurrency"],
+        )
+        return 0
+
+    if args.from_registry:
+        include_list = None
+        if args.include:
+            include_list = [s.strip() for s in args.include.split(",") if s.strip()]
+        lo = _parse_bool_override(args.latest_only_override)
+        ingest_from_registry(
+            registry_path=args.registry,
+            series=include_list,
+            latest_only=lo,
+            active_only=bool(args.active_only),
+            **common,
+        )
+        return 0
+
+    start_date = date.fromisoformat(args.start) if args.start else None
+    persist_all_vintages(
+        args.series,
+        latest_only=bool(args.latest_only),
+        start=start_date,
+        **common,
+    )
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     ap = ArgumentParser(description="Persist ALFRED vintages to data/raw/alfred")
 
@@ -176,6 +762,90 @@ def main(argv: list[str] | None = None) -> int:
         default=0.0,
         help="Seconds to sleep between requests (helps avoid 429s).",
     )
+    ap.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of concurrent fetch workers (shared FRED rate limit applies).",
+    )
+    ap.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help=(
+            "Vintages per observations request (1 = one request per vintage; "
+            f"{DEFAULT_VINTAGE_CHUNK} is a good backfill value)."
+        ),
+    )
+
+    ap.add_argument(
+        "--storage",
+        choices=list(STORAGE_MODES),
+        default="full",
+        help="full = one CSV per vintage; delta = revision deltas plus periodic keyframes.",
+    )
+    ap.add_argument(
+        "--keyframe-every",
+        type=int,
+        default=DEFAULT_KEYFRAME_EVERY,
+        help="Delta storage: write a full keyframe at least every N vintages.",
+    )
+
+    ap.add_argument(
+        "--base",
+        default=None,
+        help="Base path to ALFRED raw data (default: data/raw/alfred).",
+    )
+    ap.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Do not record a resumable run journal under <base>/_journal.",
+    )
+    ap.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        default=None,
+        metavar="RUN_ID",
+        help="Finish an interrupted run (latest unfinished journal, or RUN_ID).",
+    )
+    ap.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check vintage files and index.csv for partial writes (exit 1 on problems).",
+    )
+    ap.add_argument(
+        "--repair",
+        action="store_true",
+        help="Like --verify, but delete partial/temp files and rebuild index.csv.",
+    )
+
+    ap.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="List every vintage instead of only those after the newest stored one.",
+    )
+    ap.add_argument(
+        "--listing-ttl",
+        type=float,
+        default=DEFAULT_LISTING_TTL,
+        help="Reuse vintage listings cached on disk for this many seconds (0 = off).",
+    )
+    ap.add_argument(
+        "--metrics-json",
+        default=None,
+        help="Write a JSON summary of request/ingest metrics here when the run ends.",
+    )
+    ap.add_argument(
+        "--metrics-prom",
+        default=None,
+        help="Write Prometheus text metrics here (e.g. <textfile_dir>/nowcast_ingest.prom).",
+    )
+    ap.add_argument(
+        "--request-log",
+        default=None,
+        help="Append one JSON line per HTTP attempt to this file.",
+    )
 
     # Single-series mode (back-compat)
     ap.add_argument("--series", help="FRED series ID, e.g., GDP (single-series mode).")
@@ -185,33 +855,36 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--start", type=str, help="Single-series: start date (YYYY-MM-DD).")
 
     args = ap.parse_args(argv)
+    base = Path(args.base) if args.base else None
+    common = dict(
+        throttle_sec=float(args.throttle or 0.0),
+        concurrency=max(1, int(args.concurrency)),
+        batch_size=max(1, int(args.batch_size)),
+        storage=args.storage,
+        keyframe_every=int(args.keyframe_every),
+        base=base,
+        journal=not args.no_journal,
+        incremental=not args.full_refresh,
+        listing_ttl=float(args.listing_ttl),
+    )
 
-    if args.from_registry:
-        include_list = None
-        if args.include:
-            include_list = [s.strip() for s in args.include.split(",") if s.strip()]
-        lo = _parse_bool_override(args.latest_only_override)
-        ingest_from_registry(
-            registry_path=args.registry,
-            series=include_list,
-            latest_only=lo,
-            active_only=bool(args.active_only),
-            throttle_sec=float(args.throttle or 0.0),
-        )
-        return 0
+    if args.verify or args.repair:
+        series = [s.strip() for s in (args.series or args.include or "").split(",") if s.strip()]
+        return _verify(base, series, repair=bool(args.repair))
 
-    # Single-series mode requires --series
-    if not args.series:
+    if not (args.resume or args.from_registry or args.series):
         ap.error("the following arguments are required: --series (or use --from-registry)")
 
-    start_date = date.fromisoformat(args.start) if args.start else None
-    persist_all_vintages(
-        args.series,
-        latest_only=bool(args.latest_only),
-        start=start_date,
-        throttle_sec=float(args.throttle or 0.0),
-    )
-    return 0
+    if args.request_log:
+        METRICS.open_request_log(Path(args.request_log))
+    try:
+        return _run(args, common)
+    finally:
+        METRICS.close_request_log()
+        if args.metrics_json:
+            METRICS.write_json(Path(args.metrics_json))
+        if args.metrics_prom:
+            METRICS.write_prometheus(Path(args.metrics_prom))
 
 
 if __name__ == "__main__":
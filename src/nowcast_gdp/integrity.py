@@ -0,0 +1,141 @@
+# src/nowcast_gdp/integrity.py
+"""Bulk verification and repair of a series' vintage files and index.csv."""
+
+from __future__ import annotations
+
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from .delta import DELTA_SUFFIX, delta_base, list_stored_vintages, vintage_from_filename
+from .io import TMP_SUFFIX, _read_nonempty_lines, _write_lines, index_lock
+
+
+@dataclass
+class VerifyReport:
+    series_dir: Path
+    tmp_files: List[Path] = field(default_factory=list)  # leftovers of interrupted writes
+    partial: List[Path] = field(default_factory=list)  # vintage files that fail to parse
+    missing: List[date] = field(default_factory=list)  # indexed, but no (valid) file
+    unindexed: List[date] = field(default_factory=list)  # valid file, not in index.csv
+    bad_index_lines: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.tmp_files or self.partial or self.missing or self.unindexed or self.bad_index_lines
+        )
+
+    def summary(self) -> str:
+        return (
+            f"{self.series_dir.name}: tmp={len(self.tmp_files)} partial={len(self.partial)} "
+            f"missing={len(self.missing)} unindexed={len(self.unindexed)} "
+            f"bad_index_lines={len(self.bad_index_lines)}"
+        )
+
+
+def _valid_number(s: str) -> bool:
+    if s == "":
+        return True
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
+
+
+def check_vintage_file(path: Path) -> bool:
+    """True when a vintage CSV (full or delta) parses completely."""
+    is_delta = path.name.endswith(DELTA_SUFFIX)
+    expected = ["date", "value", "op"] if is_delta else ["date", "value"]
+    try:
+        with path.open(newline="", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+    if not text.endswith("\n"):
+        return False  # every complete write ends with a row terminator
+    rows = list(csv.reader(text.splitlines()))
+    if not rows or rows[0] != expected:
+        return False
+    body = rows[1:]
+    if is_delta:
+        if not body or body[0][:1] != ["base"]:
+            return False
+        body = body[1:]
+    for r in body:
+        if len(r) != len(expected):
+            return False
+        try:
+            date.fromisoformat(r[0])
+        except ValueError:
+            return False
+        if not _valid_number(r[1]):
+            return False
+    return True
+
+
+def verify_series(series_dir: Path, workers: int = 8) -> VerifyReport:
+    """Scan every vintage file (in parallel) and cross-check index.csv."""
+    rep = VerifyReport(series_dir=series_dir)
+    if not series_dir.exists():
+        return rep
+    rep.tmp_files = sorted(series_dir.glob(f"*{TMP_SUFFIX}"))
+
+    files = [
+        fp for fp in sorted(series_dir.glob("*.csv")) if vintage_from_filename(fp.name) is not None
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        oks = list(pool.map(check_vintage_file, files))
+    rep.partial = [fp for fp, ok in zip(files, oks) if not ok]
+    bad = {fp.name for fp in rep.partial}
+    valid = {
+        v
+        for fp in files
+        if fp.name not in bad and (v := vintage_from_filename(fp.name)) is not None
+    }
+
+    # deltas whose base vintage is gone (transitively) cannot be rebuilt
+    deltas = {fp: delta_base(fp) for fp in files if fp.name.endswith(DELTA_SUFFIX)}
+    deltas = {fp: b for fp, b in deltas.items() if fp.name not in bad}
+    changed = True
+    while changed:
+        changed = False
+        for fp, b in list(deltas.items()):
+            if b not in valid:
+                rep.partial.append(fp)
+                valid.discard(vintage_from_filename(fp.name))
+                del deltas[fp]
+                changed = True
+
+    indexed: set[date] = set()
+    for ln in _read_nonempty_lines(series_dir / "index.csv"):
+        try:
+            indexed.add(date.fromisoformat(ln))
+        except ValueError:
+            rep.bad_index_lines.append(ln)
+    rep.missing = sorted(indexed - valid)
+    rep.unindexed = sorted(valid - indexed)
+    return rep
+
+
+def repair_series(series_dir: Path, report: Optional[VerifyReport] = None) -> VerifyReport:
+    """
+    Delete temp leftovers and partial vintage files, then rewrite index.csv from the
+    vintages that remain valid. The next ingest (or `--resume`) re-fetches exactly
+    the vintages that were removed.
+    """
+    rep = report or verify_series(series_dir)
+    for fp in [*rep.tmp_files, *rep.partial]:
+        fp.unlink(missing_ok=True)
+    if rep.partial or rep.missing or rep.unindexed or rep.bad_index_lines:
+        idx = series_dir / "index.csv"
+        with index_lock(idx):
+            _write_lines(idx, [v.isoformat() for v in list_stored_vintages(series_dir)])
+    return rep
+
+
+__all__ = ["VerifyReport", "verify_series", "repair_series", "check_vintage_file"]
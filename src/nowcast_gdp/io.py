@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import csv
+import os
+import threading
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+TMP_SUFFIX = ".tmp"
 
 
 def ensure_dir(path: Path) -> Path:
@@ -11,13 +17,32 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+@contextmanager
+def atomic_write(path: Path, newline: Optional[str] = None) -> Iterator[IO[str]]:
+    """
+    Open a temp file next to `path` for writing; on success fsync it and rename it
+    over `path`. A crash leaves either the old file or the new one, never a
+    truncated mix; stray `*.tmp` files are cleaned up by `integrity.repair_series`.
+    """
+    ensure_dir(path.parent)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}{TMP_SUFFIX}")
+    try:
+        with tmp.open("w", newline=newline, encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def write_csv(path: Path, rows: Iterable[Dict[str, str]], header: List[str]) -> None:
     """
     Write rows (list of dicts) to CSV with a given header.
-    All values are written as strings as-is.
+    All values are written as strings as-is. The write is atomic (temp file + rename).
     """
-    ensure_dir(path.parent)
-    with path.open("w", newline="", encoding="utf-8") as f:
+    with atomic_write(path, newline="") as f:
         writer = csv.DictWriter(f, fieldnames=header)
         writer.writeheader()
         writer.writerows(rows)
@@ -33,6 +58,33 @@ def read_csv_dicts(path: Path) -> List[Dict[str, str]]:
         return list(csv.DictReader(f))
 
 
+def read_date_value_arrays(path: Path):
+    """
+    Parse a `date,value` CSV with pandas' C engine -> (datetime64[D] dates, float64 values).
+    Blank / '.' values become NaN; unparsable values are coerced to NaN too and rows
+    with unparsable dates are dropped.
+    """
+    import numpy as np
+    import pandas as pd
+
+    kw = dict(engine="c", usecols=["date", "value"], na_values=["", "."], keep_default_na=True)
+    try:
+        df = pd.read_csv(path, dtype={"date": str, "value": np.float64}, **kw)
+        vals = df["value"].to_numpy(dtype=np.float64)
+    except ValueError:
+        df = pd.read_csv(path, dtype=str, **kw)
+        vals = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=np.float64)
+    try:
+        dts = df["date"].to_numpy(dtype="datetime64[D]")
+    except ValueError:
+        # robust to occasional bad date cells: drop those rows
+        parsed = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+        ok = parsed.notna().to_numpy()
+        dts = parsed[ok].to_numpy(dtype="datetime64[D]")
+        vals = vals[ok]
+    return dts, vals
+
+
 # ---- index.csv helpers (newline-delimited, NO header) -----------------------------
 
 
@@ -43,9 +95,9 @@ def _read_nonempty_lines(path: Path) -> List[str]:
 
 
 def _write_lines(path: Path, lines: List[str]) -> None:
-    ensure_dir(path.parent)
     # Write trailing newline when non-empty to keep diffs tidy
-    path.write_text(("\n".join(lines) + "\n") if lines else "", encoding="utf-8")
+    with atomic_write(path) as f:
+        f.write(("\n".join(lines) + "\n") if lines else "")
 
 
 def write_index_unique_sorted(path: Path, new_entries: Iterable[str]) -> None:
@@ -62,9 +114,121 @@ def write_index_unique_sorted(path: Path, new_entries: Iterable[str]) -> None:
     _write_lines(path, merged)
 
 
+# one lock per index file so concurrent ingest workers never interleave updates
+_INDEX_LOCKS: Dict[Path, threading.Lock] = {}
+_INDEX_LOCKS_GUARD = threading.Lock()
+
+
+def index_lock(path: Path) -> threading.Lock:
+    key = path.resolve()
+    with _INDEX_LOCKS_GUARD:
+        lock = _INDEX_LOCKS.get(key)
+        if lock is None:
+            lock = _INDEX_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _read_tail(path: Path, block: int = 4096) -> tuple[Optional[str], bool]:
+    """(last non-empty line, file ends with newline) without reading the whole file."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return None, True
+        buf = b""
+        pos = size
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            body = buf.rstrip()
+            if not body:
+                continue
+            # the last line is complete once a separator precedes it (or we hit the start)
+            nl = body.rfind(b"\n")
+            if nl >= 0 or pos == 0:
+                return body[nl + 1 :].strip().decode("utf-8"), buf.endswith(b"\n")
+        return None, buf.endswith(b"\n")
+
+
+def last_index_entry(path: Path) -> Optional[str]:
+    """Last non-empty line of an index file (None when missing or empty); reads only the tail."""
+    if not path.exists():
+        return None
+    return _read_tail(path)[0]
+
+
+def update_index(path: Path, new_entries: Iterable[str]) -> None:
+    """
+    Add entries to a sorted, de-duplicated index file with the least I/O possible.
+
+    When every new entry sorts after the current last line (the usual case when
+    ingesting newer vintages) the entries are appended; otherwise the file is
+    merged and rewritten via `write_index_unique_sorted`. Same on-disk format.
+    """
+    incoming = sorted({v.strip() for v in new_entries if v and v.strip()})
+    if not incoming:
+        return
+    with index_lock(path):
+        tail, ends_nl = _read_tail(path) if path.exists() else (None, True)
+        if tail is None:
+            _write_lines(path, incoming)
+            return
+        if incoming[0] < tail:
+            write_index_unique_sorted(path, incoming)  # out-of-order insert -> merge
+            return
+        fresh = [v for v in incoming if v > tail]
+        if fresh:
+            # one write of whole lines; a torn tail is detected by integrity.verify_series
+            with path.open("a", encoding="utf-8") as f:
+                f.write(("" if ends_nl else "\n") + "\n".join(fresh) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class IndexBuffer:
+    """
+    Collects index entries per file and commits them in batches through `update_index`.
+    Thread-safe; call `flush()` (or use as a context manager) to commit the remainder.
+    """
+
+    def __init__(self, flush_every: int = 100) -> None:
+        self.flush_every = max(1, int(flush_every))
+        self._pending: Dict[Path, List[str]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def add(self, path: Path, entry: str) -> None:
+        with self._lock:
+            self._pending.setdefault(path, []).append(entry)
+            self._count += 1
+            due = self._count >= self.flush_every
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending, self._count = self._pending, {}, 0
+        for path, entries in pending.items():
+            update_index(path, entries)
+
+    def __enter__(self) -> "IndexBuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+
 __all__ = [
     "ensure_dir",
+    "atomic_write",
     "write_csv",
     "read_csv_dicts",
+    "read_date_value_arrays",
     "write_index_unique_sorted",
+    "update_index",
+    "last_index_entry",
+    "index_lock",
+    "IndexBuffer",
 ]
@@ -0,0 +1,183 @@
+# src/nowcast_gdp/journal.py
+"""
+Per-run ingest journal (JSON lines) so an interrupted backfill resumes without re-listing.
+
+  data/raw/alfred/_journal/{run_id}.jsonl
+      {"event": "plan",  "tasks": [["GDP", "2025-07-30"], ...], "options": {...}}
+      {"event": "start", "series": "GDP", "vintage": "2025-07-30"}
+      {"event": "done",  "series": "GDP", "vintage": "2025-07-30"}
+      {"event": "end"}
+
+A journal without an `end` record belongs to an interrupted run. Its pending work
+is every planned task without a `done` record; tasks with `start` but no `done`
+were in flight when the run died.
+
+A journal that closes cleanly is moved to `_journal/finished/`, where only the
+newest KEEP_FINISHED_JOURNALS are kept, so `_journal/*.jsonl` holds just the runs
+that may need resuming and repeated cron runs do not pile up files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+JOURNAL_DIRNAME = "_journal"
+FINISHED_DIRNAME = "finished"
+KEEP_FINISHED_JOURNALS = 5
+
+Task = Tuple[str, date]
+
+
+def journal_dir(root: Path) -> Path:
+    return root / JOURNAL_DIRNAME
+
+
+class IngestJournal:
+    """Append-only, thread-safe journal writer for one ingest run."""
+
+    def __init__(self, path: Path, keep_finished: int = KEEP_FINISHED_JOURNALS) -> None:
+        self.path = path
+        self.keep_finished = keep_finished
+        self.run_id = path.stem
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = path.open("a", encoding="utf-8")
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        run_id: Optional[str] = None,
+        keep_finished: int = KEEP_FINISHED_JOURNALS,
+    ) -> "IngestJournal":
+        rid = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        return cls(journal_dir(root) / f"{rid}.jsonl", keep_finished)
+
+    def _write(self, rec: Dict[str, Any], sync: bool = False) -> None:
+        with self._lock:
+            self._append(rec, sync)
+
+    def _append(self, rec: Dict[str, Any], sync: bool) -> None:
+        """Write one record; the caller holds the lock."""
+        self._f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self._f.flush()
+        if sync:
+            os.fsync(self._f.fileno())
+
+    def plan(self, tasks: Iterable[Task], **options: Any) -> None:
+        recs = [[sid, v.isoformat()] for sid, v in tasks]
+        self._write({"event": "plan", "tasks": recs, "options": options}, sync=True)
+
+    def start(self, series_id: str, vintage: date) -> None:
+        self._write({"event": "start", "series": series_id, "vintage": vintage.isoformat()})
+
+    def done(self, series_id: str, vintage: date) -> None:
+        self._write({"event": "done", "series": series_id, "vintage": vintage.isoformat()})
+
+    def close(self, finished: bool = True) -> None:
+        """
+        Close the journal. `finished=True` records a clean end (nothing left to
+        resume) and retires the file to `finished/`, pruning older finished runs.
+        Closing again is a no-op.
+        """
+        with self._lock:
+            if self._f.closed:
+                return
+            if finished:
+                self._append({"event": "end"}, sync=True)
+            self._f.close()
+        if finished:
+            done_dir = self.path.parent / FINISHED_DIRNAME
+            done_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(self.path, done_dir / self.path.name)
+            prune_finished(self.path.parent, self.keep_finished)
+
+    def __enter__(self) -> "IngestJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(finished=exc_type is None)
+
+
+@dataclass
+class JournalState:
+    path: Path
+    planned: List[Task] = field(default_factory=list)
+    started: Set[Task] = field(default_factory=set)
+    done: Set[Task] = field(default_factory=set)
+    options: Dict[str, Any] = field(default_factory=dict)
+    finished: bool = False
+
+    @property
+    def run_id(self) -> str:
+        return self.path.stem
+
+    def pending(self) -> List[Task]:
+        """Planned tasks not completed, in plan order."""
+        return [t for t in self.planned if t not in self.done]
+
+    def in_flight(self) -> List[Task]:
+        return [t for t in self.planned if t in self.started and t not in self.done]
+
+
+def load_journal(path: Path) -> JournalState:
+    """Replay a journal file; a torn last line (crash mid-write) is ignored."""
+    st = JournalState(path=path)
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            ev = rec.get("event")
+            if ev == "plan":
+                st.planned.extend((sid, date.fromisoformat(v)) for sid, v in rec.get("tasks", []))
+                st.options.update(rec.get("options") or {})
+            elif ev in ("start", "done"):
+                t = (rec["series"], date.fromisoformat(rec["vintage"]))
+                (st.started if ev == "start" else st.done).add(t)
+            elif ev == "end":
+                st.finished = True
+    return st
+
+
+def prune_finished(jdir: Path, keep: int = KEEP_FINISHED_JOURNALS) -> int:
+    """Delete all but the newest `keep` finished journals; returns how many were removed."""
+    done = sorted((jdir / FINISHED_DIRNAME).glob("*.jsonl"))
+    stale = done[: max(0, len(done) - keep)]
+    for p in stale:
+        p.unlink(missing_ok=True)
+    return len(stale)
+
+
+def find_unfinished(root: Path, run_id: Optional[str] = None) -> Optional[JournalState]:
+    """The named run's journal, or the most recent unfinished one under `root`."""
+    jdir = journal_dir(root)
+    if run_id:
+        p = jdir / f"{run_id}.jsonl"
+        if not p.exists():
+            raise FileNotFoundError(f"No journal {p}")
+        return load_journal(p)
+    if not jdir.exists():
+        return None
+    for p in sorted(jdir.glob("*.jsonl"), reverse=True):
+        st = load_journal(p)
+        if not st.finished:
+            return st
+    return None
+
+
+__all__ = [
+    "IngestJournal",
+    "JournalState",
+    "load_journal",
+    "find_unfinished",
+    "journal_dir",
+    "prune_finished",
+]
@@ -0,0 +1,122 @@
+# src/nowcast_gdp/jsonstream.py
+"""
+Incremental parsing of one large array inside a JSON object.
+
+FRED responses are a flat object whose bulk is one array (`observations`).
+`iter_array_items` reads the object from an iterable of byte chunks (e.g.
+`requests.Response.iter_content`) and yields that array's items one by one, so only
+the unconsumed tail of the current chunk and one item are held in memory at a time.
+The other members (count, offset, ...) are stored in a dict as they are passed.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_AFTER_VALUE = frozenset(" \t\n\r,]}")  # what may follow a complete number
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._it = iter(chunks)
+        self._dec = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.i = 0
+        self.eof = False
+
+    def _more(self) -> bool:
+        """Append the next chunk (dropping what was consumed); False once exhausted."""
+        if self.eof:
+            return False
+        for chunk in self._it:
+            text = self._dec.decode(chunk)
+            if text:
+                self.buf = self.buf[self.i :] + text
+                self.i = 0
+                return True
+        self.eof = True
+        self.buf = self.buf[self.i :] + self._dec.decode(b"", final=True)
+        self.i = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end of input), not consumed."""
+        while True:
+            self.i = _WS.match(self.buf, self.i).end()
+            if self.i < len(self.buf):
+                return self.buf[self.i]
+            if not self._more():
+                return ""
+
+    def take(self, expected: str) -> str:
+        c = self.peek()
+        if c not in expected:
+            raise ValueError(f"malformed JSON: expected one of {expected!r}, got {c!r}")
+        self.i += 1
+        return c
+
+    def value(self) -> Any:
+        """Decode one complete JSON value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                v, end = _DECODER.raw_decode(self.buf, self.i)
+                # a number may continue in the next chunk: at the end of the buffer, or
+                # cut inside (`1.` / `2e` decode as their integer prefix)
+                number = isinstance(v, (int, float)) and not isinstance(v, bool)
+                if self.eof or (
+                    end < len(self.buf) and (not number or self.buf[end] in _AFTER_VALUE)
+                ):
+                    self.i = end
+                    return v
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._more()
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str, header: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Yield the items of the top-level array member `key`; every other member is
+    stored in `header` (members before the array are there by the first item).
+    """
+    r = _Reader(chunks)
+    r.take("{")
+    if r.peek() == "}":
+        return
+    while True:
+        k = r.value()
+        r.take(":")
+        if k == key and r.peek() == "[":
+            r.take("[")
+            if r.peek() == "]":
+                r.take("]")
+            else:
+                while True:
+                    yield r.value()
+                    if r.take(",]") == "]":
+                        break
+        else:
+            header[k] = r.value()
+        if r.take(",}") == "}":
+            return
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Lists of at most `size` consecutive items."""
+    chunk: List[Any] = []
+    for it in items:
+        chunk.append(it)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+__all__ = ["iter_array_items", "batched"]
@@ -0,0 +1,303 @@
+# src/nowcast_gdp/metrics.py
+"""
+Request-level metrics for the ALFRED client and ingest stages.
+
+Every HTTP attempt is recorded per endpoint (status, latency, response bytes), as
+is every second slept on the shared rate limiter, on 429 Retry-After and on 5xx /
+network backoff. Ingest stages (e.g. disk writes) get their own latency histograms.
+
+  METRICS.write_json(path)        # summary with p50/p90/p99 per endpoint
+  METRICS.write_prometheus(path)  # node_exporter textfile collector format
+  METRICS.open_request_log(path)  # optional JSON line per attempt
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence
+
+from .io import atomic_write
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+SLEEP_REASONS = ("ratelimit", "throttle", "backoff")
+
+PROM_PREFIX = "nowcast"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (cumulative buckets for Prometheus) plus a bounded random
+    reservoir of samples for percentile estimates. Not thread-safe on its own.
+    """
+
+    def __init__(self, buckets: Sequence[float], reservoir: int = 2048, seed: int = 0) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._reservoir: List[float] = []
+        self._cap = reservoir
+        self._rng = random.Random(seed)
+
+    def observe(self, x: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, x)] += 1
+        self.count += 1
+        self.sum += x
+        self.max = max(self.max, x)
+        if len(self._reservoir) < self._cap:
+            self._reservoir.append(x)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < self._cap:
+                self._reservoir[j] = x
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._reservoir:
+            return None
+        xs = sorted(self._reservoir)
+        return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+    def cumulative(self) -> List[int]:
+        out, run = [], 0
+        for c in self.counts:
+            run += c
+            out.append(run)
+        return out
+
+
+class _Endpoint:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.attempts = 0
+        self.status: Counter = Counter()  # "200", "429", "503", "error"
+        self.sleep = {r: 0.0 for r in SLEEP_REASONS}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.bytes = Histogram(BYTES_BUCKETS)
+
+
+class Metrics:
+    """Thread-safe metrics registry (one process-wide instance: `METRICS`)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._stages: Dict[str, Histogram] = {}
+        self._log: Optional[IO[str]] = None
+        self.started = time.time()
+
+    def _ep(self, endpoint: str) -> _Endpoint:
+        ep = self._endpoints.get(endpoint)
+        if ep is None:
+            ep = self._endpoints[endpoint] = _Endpoint()
+        return ep
+
+    # ---- recording ----
+    def record_attempt(
+        self,
+        endpoint: str,
+        status: str,
+        latency: float,
+        nbytes: int = 0,
+        **fields: Any,
+    ) -> None:
+        """One HTTP attempt; `status` is the HTTP code as a string or "error"."""
+        with self._lock:
+            ep = self._ep(endpoint)
+            ep.attempts += 1
+            ep.status[status] += 1
+            ep.latency.observe(latency)
+            if nbytes:
+                ep.bytes.observe(nbytes)
+            log = self._log
+            if log is not None:
+                rec = {
+                    "ts": round(time.time(), 6),
+                    "endpoint": endpoint,
+                    "status": status,
+                    "latency_ms": round(latency * 1000, 3),
+                    "bytes": nbytes,
+                    **fields,
+                }
+                log.write(json.dumps(rec, separators=(",", ":")) + "\n")
+
+    def record_sleep(self, endpoint: str, reason: str, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._ep(endpoint).sleep[reason] += seconds
+
+    def record_call(self, endpoint: str, ok: bool) -> None:
+        with self._lock:
+            ep = self._ep(endpoint)
+            ep.calls += 1
+            if not ok:
+                ep.failures += 1
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            h = self._stages.get(stage)
+            if h is None:
+                h = self._stages[stage] = Histogram(LATENCY_BUCKETS)
+            h.observe(seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - t0)
+
+    # ---- request log ----
+    def open_request_log(self, path: Path) -> None:
+        """Append one JSON line per HTTP attempt to `path` until `close_request_log()`."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = path.open("a", encoding="utf-8", buffering=1)
+        with self._lock:
+            old, self._log = self._log, f
+        if old is not None:
+            old.close()
+
+    def close_request_log(self) -> None:
+        with self._lock:
+            old, self._log = self._log, None
+        if old is not None:
+            old.close()
+
+    # ---- export ----
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self._stages.clear()
+            self.started = time.time()
+
+    def totals(self) -> Dict[str, float]:
+        """Counters summed over endpoints."""
+        with self._lock:
+            eps = list(self._endpoints.values())
+            return {
+                "calls": sum(e.calls for e in eps),
+                "attempts": sum(e.attempts for e in eps),
+                "failures": sum(e.failures for e in eps),
+                "throttled": sum(e.status["429"] for e in eps),
+                "server_errors": sum(
+                    n for e in eps for s, n in e.status.items() if s.startswith("5")
+                ),
+                "network_errors": sum(e.status["error"] for e in eps),
+                **{f"sleep_{r}_s": sum(e.sleep[r] for e in eps) for r in SLEEP_REASONS},
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                name: {
+                    "calls": e.calls,
+                    "failures": e.failures,
+                    "attempts": e.attempts,
+                    "attempts_per_call": e.attempts / e.calls if e.calls else None,
+                    "status": dict(e.status),
+                    "sleep_s": dict(e.sleep),
+                    "latency_s": e.latency.summary(),
+                    "response_bytes": e.bytes.summary(),
+                }
+                for name, e in sorted(self._endpoints.items())
+            }
+            stages = {name: h.summary() for name, h in sorted(self._stages.items())}
+            started = self.started
+        return {
+            "started": started,
+            "elapsed_s": time.time() - started,
+            "totals": self.totals(),
+            "endpoints": endpoints,
+            "stages_s": stages,
+        }
+
+    def write_json(self, path: Path) -> None:
+        with atomic_write(path) as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
+
+    def prometheus_text(self) -> str:
+        p = PROM_PREFIX
+        lines: List[str] = []
+
+        def head(name: str, kind: str, help_: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help_}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        def hist(name: str, labels: str, h: Histogram) -> None:
+            for le, c in zip([*map(_fmt, h.bounds), "+Inf"], h.cumulative()):
+                lines.append(f'{p}_{name}_bucket{{{labels},le="{le}"}} {c}')
+            lines.append(f"{p}_{name}_sum{{{labels}}} {_fmt(h.sum)}")
+            lines.append(f"{p}_{name}_count{{{labels}}} {h.count}")
+
+        with self._lock:
+            eps = sorted(self._endpoints.items())
+            head("alfred_calls_total", "counter", "Logical FRED calls by endpoint and outcome.")
+            for name, e in eps:
+                lines.append(
+                    f'{p}_alfred_calls_total{{endpoint="{name}",outcome="ok"}} '
+                    f"{e.calls - e.failures}"
+                )
+                lines.append(
+                    f'{p}_alfred_calls_total{{endpoint="{name}",outcome="failed"}} {e.failures}'
+                )
+            head("alfred_attempts_total", "counter", "HTTP attempts by endpoint and status.")
+            for name, e in eps:
+                for status, n in sorted(e.status.items()):
+                    lines.append(
+                        f'{p}_alfred_attempts_total{{endpoint="{name}",status="{status}"}} {n}'
+                    )
+            head("alfred_sleep_seconds_total", "counter", "Seconds slept before attempts.")
+            for name, e in eps:
+                for reason in SLEEP_REASONS:
+                    lines.append(
+                        f'{p}_alfred_sleep_seconds_total{{endpoint="{name}",reason="{reason}"}} '
+                        f"{_fmt(e.sleep[reason])}"
+                    )
+            head("alfred_request_duration_seconds", "histogram", "HTTP attempt latency.")
+            for name, e in eps:
+                hist("alfred_request_duration_seconds", f'endpoint="{name}"', e.latency)
+            head("alfred_response_bytes", "histogram", "Response body size.")
+            for name, e in eps:
+                hist("alfred_response_bytes", f'endpoint="{name}"', e.bytes)
+            head("ingest_stage_seconds", "histogram", "Ingest stage durations.")
+            for name, h in sorted(self._stages.items()):
+                hist("ingest_stage_seconds", f'stage="{name}"', h)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Atomic write, as the textfile collector requires (no partially written files)."""
+        with atomic_write(path) as f:
+            f.write(self.prometheus_text())
+
+
+def _fmt(x: float) -> str:
+    return repr(float(x))
+
+
+METRICS = Metrics()
+
+
+__all__ = ["METRICS", "Metrics", "Histogram", "LATENCY_BUCKETS", "BYTES_BUCKETS"]
@@ -0,0 +1,358 @@
+# src/nowcast_gdp/mixfreq.py
+"""
+Mixed-frequency alignment: aggregation to coarser periods and dense per-quarter blocks.
+
+`aggregate` maps observation dates to periods through the shared calendar table and
+reduces each period with one sort and `np.add.reduceat` (mean, sum or last value);
+no pandas resample/groupby. Weekly observations can be bucketed by the Saturday
+ending their week (`week_ending=True`), so a week straddling a month end counts in
+the month where it ends.
+
+`MixedFrequencyAligner` keeps every series as monthly bins (quarterly targets as
+quarterly bins) and lays them out as dense (quarters, 3 months, series) arrays with
+a mask of the months already observed: the ragged edge is explicit. New
+observations only recompute the months they touch, and the blocks are rebuilt from
+the bins (a slice per series) when next requested.
+
+  python -m nowcast_gdp.mixfreq --include GDP,CPI --last 4
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dates import CalendarTable, calendar_table
+from .panel import Panel, load_panel
+from .registry import SeriesCfg, load_registry
+
+HOW = ("mean", "sum", "last")
+FREQS = ("Q", "M", "W", "D")  # observation frequency of an input series
+REGISTRY_FREQS = {"quarterly": "Q", "monthly": "M", "weekly": "W", "daily": "D"}
+
+
+# ---------- vectorized aggregation ----------
+def period_keys(
+    dates, freq: str, week_ending: bool = False, table: Optional[CalendarTable] = None
+) -> np.ndarray:
+    """
+    Integer period of each date: `Q` quarters since 1970Q1, `M` months since 1970-01,
+    `W` the week-ending Saturday as days since 1970-01-01. With `week_ending`, dates
+    are moved to the end of their week before bucketing into months or quarters.
+    """
+    table = table or calendar_table()
+    days = np.asarray(dates, dtype="datetime64[D]")
+    if week_ending or freq == "W":
+        days = table.lookup(days, "week_ending")
+    if freq == "W":
+        return days.astype(np.int64)
+    if freq == "M":
+        return days.astype("datetime64[M]").astype(np.int64)
+    if freq == "Q":
+        return table.lookup(days, "quarter")
+    raise ValueError(f"Unknown period {freq!r}; choose from Q, M, W")
+
+
+def period_start(keys: np.ndarray, freq: str) -> np.ndarray:
+    """First day of each period key (`W` keys are already the week-ending day)."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if freq == "W":
+        return keys.astype("datetime64[D]")
+    months = keys * 3 if freq == "Q" else keys
+    return months.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def _reduce(
+    keys: np.ndarray, days: np.ndarray, values: np.ndarray, how: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(unique keys, aggregate, count of valid values); NaN values are ignored."""
+    if how not in HOW:
+        raise ValueError(f"Unknown aggregation {how!r}; choose from {', '.join(HOW)}")
+    ok = ~np.isnan(values)
+    keys, days, values = keys[ok], days[ok], values[ok]
+    if not len(keys):
+        return np.empty(0, np.int64), np.empty(0), np.empty(0, np.int64)
+    order = np.lexsort((days, keys))
+    keys, values = keys[order], values[order]
+    uniq, starts = np.unique(keys, return_index=True)
+    counts = np.diff(np.append(starts, len(keys)))
+    if how == "last":
+        agg = values[starts + counts - 1]
+    else:
+        agg = np.add.reduceat(values, starts)
+        if how == "mean":
+            agg = agg / counts
+    return uniq, agg, counts
+
+
+def aggregate(
+    dates,
+    values,
+    freq: str = "Q",
+    how: str = "mean",
+    week_ending: bool = False,
+    table: Optional[CalendarTable] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregate observations to periods -> (period start dates, values, counts).
+    Periods without any valid observation are omitted; `last` takes the latest-dated
+    observation in the period.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    keys = period_keys(days, freq, week_ending, table)
+    uniq, agg, counts = _reduce(
+        keys, days.astype(np.int64), np.asarray(values, dtype=np.float64), how
+    )
+    return period_start(uniq, freq), agg, counts
+
+
+# ---------- dense quarterly blocks ----------
+@dataclass(frozen=True)
+class QuarterBlocks:
+    """Monthly inputs as (quarter, month-in-quarter, series) with observed-month masks."""
+
+    quarters: np.ndarray  # datetime64[D] quarter starts, (Q,)
+    series: List[str]  # monthly columns
+    values: np.ndarray  # float64 (Q, 3, N), NaN where not observed
+    mask: np.ndarray  # bool (Q, 3, N)
+    targets: List[str]  # quarterly columns
+    target_values: np.ndarray  # float64 (Q, K)
+    target_mask: np.ndarray  # bool (Q, K)
+
+    def index(self, q: date) -> int:
+        """Row of the quarter containing `q`; LookupError outside the aligned range."""
+        if len(self.quarters):
+            i = int(period_keys([q], "Q")[0] - period_keys(self.quarters[:1], "Q")[0])
+            if 0 <= i < len(self.quarters):
+                return i
+        raise LookupError(f"{q} is outside the aligned quarters")
+
+    def quarter(self, q: date) -> Tuple[np.ndarray, np.ndarray]:
+        """(3, N) values and mask of the quarter containing `q`."""
+        i = self.index(q)
+        return self.values[i], self.mask[i]
+
+    def months_observed(self) -> np.ndarray:
+        """(Q, N) number of months observed per quarter and series (0-3)."""
+        return self.mask.sum(axis=1)
+
+    def to_quarterly(self, how: str = "mean") -> np.ndarray:
+        """(Q, N) quarterly aggregate over the observed months; NaN if none observed."""
+        n = self.months_observed()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if how == "mean":
+                return np.where(n > 0, np.nansum(self.values, axis=1) / n, np.nan)
+            if how == "sum":
+                return np.where(n > 0, np.nansum(self.values, axis=1), np.nan)
+        if how == "last":
+            last = 2 - self.mask[:, ::-1].argmax(axis=1)  # (Q, N) month of last observation
+            out = np.take_along_axis(self.values, last[:, None, :], axis=1)[:, 0]
+            return np.where(n > 0, out, np.nan)
+        raise ValueError(f"Unknown aggregation {how!r}; choose from {', '.join(HOW)}")
+
+
+class _Bins:
+    """One series: sorted raw observations plus dense per-period aggregates."""
+
+    def __init__(self, freq: str, how: str, table: CalendarTable) -> None:
+        self.freq = freq
+        self.how = how
+        self.table = table
+        self.days = np.empty(0, np.int64)
+        self.vals = np.empty(0)
+        self.keys = np.empty(0, np.int64)  # bin of each raw observation (month/quarter)
+        self.lo = 0  # first bin in `agg`
+        self.agg = np.empty(0)
+
+    @property
+    def period(self) -> str:
+        return "Q" if self.freq == "Q" else "M"
+
+    def _keys(self, days: np.ndarray) -> np.ndarray:
+        return period_keys(days.astype("datetime64[D]"), self.period, self.freq == "W", self.table)
+
+    def upsert(self, dates, values) -> Tuple[int, int]:
+        """Insert or replace observations; recompute only their bins -> bin range touched."""
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        vals = np.asarray(values, dtype=np.float64)
+        if not len(days):
+            return (0, -1)
+        if not len(self.days) or days.min() > self.days[-1]:
+            order = np.argsort(days, kind="stable")
+            self.days = np.concatenate([self.days, days[order]])
+            self.vals = np.concatenate([self.vals, vals[order]])
+            self.keys = np.concatenate([self.keys, self._keys(days[order])])
+        else:  # revisions or back-fill: later duplicates replace earlier ones
+            all_days = np.concatenate([self.days, days])
+            all_vals = np.concatenate([self.vals, vals])
+            order = np.lexsort((np.arange(len(all_days)), all_days))
+            all_days, all_vals = all_days[order], all_vals[order]
+            last = np.append(all_days[1:] != all_days[:-1], True)
+            self.days, self.vals = all_days[last], all_vals[last]
+            self.keys = self._keys(self.days)
+        touched = self._keys(days)
+        k0, k1 = int(touched.min()), int(touched.max())
+        self._grow(k0, k1)
+        i0, i1 = np.searchsorted(self.keys, [k0, k1 + 1])
+        uniq, agg, _ = _reduce(self.keys[i0:i1], self.days[i0:i1], self.vals[i0:i1], self.how)
+        self.agg[k0 - self.lo : k1 + 1 - self.lo] = np.nan
+        self.agg[uniq - self.lo] = agg
+        return k0, k1
+
+    def _grow(self, k0: int, k1: int) -> None:
+        if not len(self.agg):
+            self.lo, self.agg = k0, np.full(k1 - k0 + 1, np.nan)
+            return
+        lo, hi = min(self.lo, k0), max(self.lo + len(self.agg) - 1, k1)
+        if lo == self.lo and hi == self.lo + len(self.agg) - 1:
+            return
+        agg = np.full(hi - lo + 1, np.nan)
+        agg[self.lo - lo : self.lo - lo + len(self.agg)] = self.agg
+        self.lo, self.agg = lo, agg
+
+    def window(self, lo: int, n: int) -> np.ndarray:
+        """Bins lo .. lo+n-1 (NaN outside the stored range)."""
+        out = np.full(n, np.nan)
+        a, b = max(lo, self.lo), min(lo + n, self.lo + len(self.agg))
+        if b > a:
+            out[a - lo : b - lo] = self.agg[a - self.lo : b - self.lo]
+        return out
+
+
+class MixedFrequencyAligner:
+    """
+    Aggregates every series to months (quarterly ones to quarters) and serves dense
+    `QuarterBlocks`. `how` sets the within-month aggregation per series (default
+    `mean`); it only matters for weekly and daily inputs.
+    """
+
+    def __init__(self, table: Optional[CalendarTable] = None) -> None:
+        self.table = table or calendar_table()
+        self._bins: Dict[str, _Bins] = {}
+        self._blocks: Optional[QuarterBlocks] = None
+
+    def add_series(self, name: str, dates, values, freq: str = "M", how: str = "mean") -> None:
+        if freq not in FREQS:
+            raise ValueError(f"Unknown frequency {freq!r}; choose from {', '.join(FREQS)}")
+        if how not in HOW:
+            raise ValueError(f"Unknown aggregation {how!r}; choose from {', '.join(HOW)}")
+        self._bins[name] = _Bins(freq, how, self.table)
+        self.update(name, dates, values)
+
+    def update(self, name: str, dates, values) -> Tuple[Optional[date], Optional[date]]:
+        """
+        Insert new or revised observations of one series. Only the months (quarters)
+        they fall in are re-aggregated. Returns the first and last quarter touched.
+        """
+        b = self._bins[name]
+        k0, k1 = b.upsert(dates, values)
+        if k1 < k0:
+            return None, None
+        self._blocks = None
+        q0, q1 = (k0, k1) if b.period == "Q" else (k0 // 3, k1 // 3)
+        return period_start(q0, "Q").item(), period_start(q1, "Q").item()
+
+    @property
+    def series(self) -> List[str]:
+        return list(self._bins)
+
+    def blocks(self) -> QuarterBlocks:
+        """Dense blocks over every quarter any series covers (cached until an update)."""
+        if self._blocks is not None:
+            return self._blocks
+        monthly = [n for n, b in self._bins.items() if b.period == "M"]
+        quarterly = [n for n, b in self._bins.items() if b.period == "Q"]
+        spans = [
+            (b.lo // 3, (b.lo + len(b.agg) - 1) // 3)
+            if b.period == "M"
+            else (b.lo, b.lo + len(b.agg) - 1)
+            for b in self._bins.values()
+            if len(b.agg)
+        ]
+        if spans:
+            q0, q1 = min(s[0] for s in spans), max(s[1] for s in spans)
+        else:
+            q0, q1 = 0, -1
+        Q = q1 - q0 + 1
+        values = np.full((Q, 3, len(monthly)), np.nan)
+        for j, n in enumerate(monthly):
+            values[:, :, j] = self._bins[n].window(q0 * 3, Q * 3).reshape(Q, 3)
+        target = np.full((Q, len(quarterly)), np.nan)
+        for j, n in enumerate(quarterly):
+            target[:, j] = self._bins[n].window(q0, Q)
+        self._blocks = QuarterBlocks(
+            quarters=period_start(np.arange(q0, q1 + 1), "Q"),
+            series=monthly,
+            values=values,
+            mask=~np.isnan(values),
+            targets=quarterly,
+            target_values=target,
+            target_mask=~np.isnan(target),
+        )
+        return self._blocks
+
+    @classmethod
+    def from_panel(
+        cls,
+        panel: Panel,
+        registry: Dict[str, SeriesCfg],
+        how: Optional[Dict[str, str]] = None,
+    ) -> "MixedFrequencyAligner":
+        """Panel columns with their registry `frequency` (monthly when unset)."""
+        al = cls()
+        for j, sid in enumerate(panel.series):
+            cfg = registry.get(sid)
+            freq = REGISTRY_FREQS.get((cfg.frequency if cfg else None) or "", "M")
+            al.add_series(sid, panel.dates, panel.values[:, j], freq, (how or {}).get(sid, "mean"))
+        return al
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Align registry series into per-quarter monthly blocks")
+    ap.add_argument("--registry", default="config/series.toml", help="Path to series.toml")
+    ap.add_argument("--include", default=None, help="Comma-separated logical or FRED ids")
+    ap.add_argument("--asof", default=None, help="Use the vintages in force on YYYY-MM-DD")
+    ap.add_argument("--all", action="store_true", help="Include inactive series")
+    ap.add_argument("--last", type=int, default=4, help="Quarters to show")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    args = ap.parse_args(argv)
+
+    reg = load_registry(args.registry)
+    panel = load_panel(
+        reg,
+        include=[s for s in args.include.split(",") if s.strip()] if args.include else None,
+        asof=date.fromisoformat(args.asof) if args.asof else None,
+        active_only=not args.all,
+        base=Path(args.base),
+    )
+    blocks = MixedFrequencyAligner.from_panel(panel, reg).blocks()
+    seen = blocks.months_observed()
+    print(f"[mixfreq] {len(blocks.quarters)} quarters; monthly: {', '.join(blocks.series)}")
+    for i in range(max(0, len(blocks.quarters) - args.last), len(blocks.quarters)):
+        q = blocks.quarters[i].item()
+        cols = [f"{s}={n}/3" for s, n in zip(blocks.series, seen[i])]
+        cols += [
+            f"{s}={'yes' if m else 'no'}" for s, m in zip(blocks.targets, blocks.target_mask[i])
+        ]
+        print(f"  {q.year}Q{(q.month - 1) // 3 + 1}  " + "  ".join(cols))
+    return 0
+
+
+__all__ = [
+    "HOW",
+    "MixedFrequencyAligner",
+    "QuarterBlocks",
+    "aggregate",
+    "period_keys",
+    "period_start",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+# src/nowcast_gdp/observations.py
+"""
+Array-backed observations of one vintage.
+
+An `ObservationBlock` is two parallel arrays: int32 day numbers (days since
+1970-01-01, i.e. the integer behind datetime64[D]) and float64 values with NaN for
+blanks. Blocks are built straight from the FRED JSON rows, written to CSV with
+vectorized formatting and read back from the vintage files, with no per-row objects
+on the way. Indexing or iterating a block yields `Observation` views built on demand,
+so code written against lists of `Observation` keeps working.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .io import atomic_write
+
+_EPOCH = date(1970, 1, 1)
+_MISSING = {"", ".", "NaN", "nan"}
+_HEADER = "date,value\r\n"  # csv.DictWriter's dialect, so files stay byte-identical
+WRITE_CHUNK_ROWS = 50_000  # rows formatted to text at a time
+
+
+@dataclass(frozen=True)
+class Observation:
+    date: date
+    value: Optional[float]  # None when FRED provides blanks/NaN
+
+
+def _parse_values(raw: Sequence[Any]) -> np.ndarray:
+    """FRED value strings -> float64 (blanks, '.' and garbage -> NaN)."""
+    cleaned = ["nan" if s is None or s in _MISSING else s for s in raw]
+    try:
+        return np.array(cleaned, dtype=np.float64)
+    except ValueError:
+        out = np.empty(len(cleaned))
+        for i, s in enumerate(cleaned):
+            try:
+                out[i] = float(s)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def _days(iso_dates: Sequence[str]) -> np.ndarray:
+    return np.array(iso_dates, dtype="datetime64[D]").astype(np.int32)
+
+
+class ObservationBlock:
+    """Observations of one vintage as (int32 days since 1970-01-01, float64 values)."""
+
+    __slots__ = ("days", "values")
+
+    def __init__(self, days: np.ndarray, values: np.ndarray) -> None:
+        self.days = np.asarray(days, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.days.shape != self.values.shape or self.days.ndim != 1:
+            raise ValueError("days and values must be 1-D arrays of the same length")
+
+    # ---- construction ----
+    @classmethod
+    def empty(cls) -> "ObservationBlock":
+        return cls(np.empty(0, np.int32), np.empty(0))
+
+    @classmethod
+    def from_json_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ObservationBlock":
+        """FRED `observations` rows (`date`, `value` strings) -> block, in row order."""
+        if not rows:
+            return cls.empty()
+        return cls(_days([r["date"] for r in rows]), _parse_values([r.get("value") for r in rows]))
+
+    @classmethod
+    def from_arrays(cls, dates: np.ndarray, values: np.ndarray) -> "ObservationBlock":
+        """(datetime64[D], float64) as returned by the vintage readers."""
+        return cls(np.asarray(dates, dtype="datetime64[D]").astype(np.int32), values)
+
+    @classmethod
+    def from_observations(cls, obs: Iterable[Any]) -> "ObservationBlock":
+        """Anything with `.date` / `.value` (None = missing), e.g. a list of Observation."""
+        obs = list(obs)
+        days = np.array([(o.date - _EPOCH).days for o in obs], dtype=np.int32)
+        vals = np.array([np.nan if o.value is None else o.value for o in obs], dtype=np.float64)
+        return cls(days, vals)
+
+    @classmethod
+    def concat(cls, blocks: Iterable["ObservationBlock"]) -> "ObservationBlock":
+        blocks = list(blocks)
+        if not blocks:
+            return cls.empty()
+        if len(blocks) == 1:
+            return blocks[0]
+        return cls(
+            np.concatenate([b.days for b in blocks]), np.concatenate([b.values for b in blocks])
+        )
+
+    # ---- views ----
+    @property
+    def dates(self) -> np.ndarray:
+        """datetime64[D] view of `days`."""
+        return self.days.astype("datetime64[D]")
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, i: int) -> Observation:
+        v = self.values[i]
+        return Observation(_EPOCH + timedelta(days=int(self.days[i])), None if v != v else float(v))
+
+    def __iter__(self) -> Iterator[Observation]:
+        for i in range(len(self.days)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ObservationBlock):
+            return NotImplemented
+        return np.array_equal(self.days, other.days) and np.array_equal(
+            self.values, other.values, equal_nan=True
+        )
+
+    def __repr__(self) -> str:
+        return f"ObservationBlock(n={len(self)})"
+
+    def take(self, idx: np.ndarray) -> "ObservationBlock":
+        return ObservationBlock(self.days[idx], self.values[idx])
+
+    def sorted(self) -> "ObservationBlock":
+        if len(self.days) < 2 or bool((np.diff(self.days) >= 0).all()):
+            return self
+        return self.take(np.argsort(self.days, kind="stable"))
+
+    # ---- CSV ----
+    def csv_lines(self) -> List[str]:
+        """`date,value` body lines; values as %.6f, blanks as ''."""
+        dstr = np.datetime_as_string(self.dates, unit="D").tolist()
+        vstr = np.char.mod("%.6f", self.values).tolist()
+        missing = np.isnan(self.values).nonzero()[0]
+        for i in missing.tolist():
+            vstr[i] = ""
+        return [f"{d},{v}" for d, v in zip(dstr, vstr)]
+
+    def to_rows(self) -> List[Dict[str, str]]:
+        """String rows as the CSV writers and delta encoder use them."""
+        return [dict(zip(("date", "value"), ln.split(",", 1))) for ln in self.csv_lines()]
+
+    def chunks(self, size: int = WRITE_CHUNK_ROWS) -> Iterator["ObservationBlock"]:
+        for i in range(0, len(self.days), size):
+            yield ObservationBlock(self.days[i : i + size], self.values[i : i + size])
+
+    def write_csv(self, path: Path) -> None:
+        """Same bytes as `io.write_csv(path, self.to_rows(), ['date', 'value'])`, atomic."""
+        write_csv_blocks(path, self.chunks())
+
+
+def write_csv_blocks(path: Path, blocks: Iterable[ObservationBlock]) -> int:
+    """
+    Atomically write a `date,value` CSV from blocks as they arrive (e.g. straight from
+    `alfred.iter_observation_blocks`); only one block's text is formatted at a time.
+    Returns the number of rows written.
+    """
+    n = 0
+    with atomic_write(path, newline="") as f:
+        f.write(_HEADER)
+        for b in blocks:
+            for part in b.chunks():
+                lines = part.csv_lines()
+                if lines:
+                    f.write("\r\n".join(lines))
+                    f.write("\r\n")
+                    n += len(lines)
+    return n
+
+
+def as_block(obs: Any) -> ObservationBlock:
+    """Accept a block as is; convert any iterable of `.date`/`.value` objects."""
+    if isinstance(obs, ObservationBlock):
+        return obs
+    return ObservationBlock.from_observations(obs)
+
+
+__all__ = ["Observation", "ObservationBlock", "as_block", "write_csv_blocks"]
@@ -0,0 +1,159 @@
+# src/nowcast_gdp/panel.py
+"""
+Wide multi-series panel for model inputs, driven by the TOML registry.
+
+Every selected series is read concurrently (the vintage readers release the GIL
+in pandas' C parser and in file I/O) and aligned on the union of observation dates.
+"""
+
+from __future__ import annotations
+
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .dataio import latest_vintage, read_vintage_arrays, vintage_as_of
+from .registry import SeriesCfg, load_registry, select_series
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class Panel:
+    """Observation dates x series matrix (NaN where a series has no value)."""
+
+    dates: np.ndarray  # datetime64[D], (T,)
+    series: List[str]  # logical ids (registry keys), column order
+    values: np.ndarray  # float64, (T, N)
+    vintages: Dict[str, date]  # vintage each column was read from
+    timings: Dict[str, float]  # seconds spent loading each series
+    missing: List[str] = field(default_factory=list)  # selected but not stored (skipped)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def column(self, series_id: str) -> np.ndarray:
+        return self.values[:, self.series.index(series_id)]
+
+    def to_frame(self):
+        """pandas DataFrame with a DatetimeIndex named 'date' and one column per series."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.values,
+            index=pd.DatetimeIndex(self.dates, name="date"),
+            columns=list(self.series),
+            copy=False,
+        )
+
+
+def _load_one(
+    cfg: SeriesCfg, asof: Optional[date], base: Path | None
+) -> Tuple[date, np.ndarray, np.ndarray, float]:
+    t0 = time.perf_counter()
+    v = vintage_as_of(cfg.fred_id, asof, base) if asof else latest_vintage(cfg.fred_id, base)
+    dts, vals = read_vintage_arrays(cfg.fred_id, v, base)
+    return v, dts, vals, time.perf_counter() - t0
+
+
+def align(columns: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(dates, values) pairs -> (union date axis, (T, N) matrix with NaN fill)."""
+    if not columns:
+        return np.array([], dtype="datetime64[D]"), np.empty((0, 0))
+    axis = np.unique(np.concatenate([d for d, _ in columns]))
+    out = np.full((len(axis), len(columns)), np.nan)
+    for j, (dts, vals) in enumerate(columns):
+        out[np.searchsorted(axis, dts), j] = vals
+    return axis, out
+
+
+def load_panel(
+    registry: str | Path | Dict[str, SeriesCfg] = Path("config/series.toml"),
+    include: Optional[Iterable[str]] = None,
+    asof: Optional[date] = None,
+    active_only: bool = True,
+    base: Path | None = None,
+    workers: int = DEFAULT_WORKERS,
+    skip_missing: bool = False,
+) -> Panel:
+    """
+    Load the selected registry series (latest vintage, or the vintage in force on
+    `asof`) on a thread pool and align them into one Panel. Series without stored
+    data raise FileNotFoundError/LookupError unless `skip_missing`.
+    """
+    reg = registry if isinstance(registry, dict) else load_registry(registry)
+    selected = select_series(reg, include=include, active_only=active_only)
+    ids = list(selected)
+
+    def _task(sid: str):
+        try:
+            return _load_one(selected[sid], asof, base)
+        except (FileNotFoundError, LookupError):
+            if not skip_missing:
+                raise
+            return None
+
+    if workers <= 1 or len(ids) <= 1:
+        results = [_task(sid) for sid in ids]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(ids))) as pool:
+            results = list(pool.map(_task, ids))
+
+    series, cols, missing = [], [], []
+    vintages: Dict[str, date] = {}
+    timings: Dict[str, float] = {}
+    for sid, res in zip(ids, results):
+        if res is None:
+            missing.append(sid)
+            continue
+        v, dts, vals, secs = res
+        series.append(sid)
+        cols.append((dts, vals))
+        vintages[sid] = v
+        timings[sid] = secs
+    dates, values = align(cols)
+    return Panel(dates, series, values, vintages, timings, missing)
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Load the registry series into one aligned panel")
+    ap.add_argument("--registry", default="config/series.toml", help="Path to series.toml")
+    ap.add_argument("--include", default=None, help="Comma-separated logical or FRED ids")
+    ap.add_argument("--asof", default=None, help="Use the vintages in force on YYYY-MM-DD")
+    ap.add_argument("--all", action="store_true", help="Include inactive series")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Reader threads")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    panel = load_panel(
+        args.registry,
+        include=[s for s in args.include.split(",") if s.strip()] if args.include else None,
+        asof=date.fromisoformat(args.asof) if args.asof else None,
+        active_only=not args.all,
+        base=Path(args.base),
+        workers=args.workers,
+        skip_missing=True,
+    )
+    wall = time.perf_counter() - t0
+    for sid in panel.series:
+        print(f"{sid:<16} {panel.vintages[sid]}  {panel.timings[sid] * 1000:8.1f} ms")
+    for sid in panel.missing:
+        print(f"{sid:<16} (no stored vintages)")
+    print(f"[panel] {panel.shape[0]} dates x {panel.shape[1]} series in {wall * 1000:.1f} ms")
+    return 0
+
+
+__all__ = ["Panel", "load_panel", "align"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
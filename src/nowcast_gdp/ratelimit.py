@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to FRED.
+
+    - `rate` tokens are added per second, up to `capacity` (the burst size).
+    - `acquire()` blocks until a token is available; `try_acquire()` never blocks.
+    - `pause(seconds)` stops handing out tokens for everyone (e.g. on a 429
+      with Retry-After), not just for the caller that hit the limit.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        if self.capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens` from the bucket, blocking as needed. Returns seconds waited."""
+        if tokens > self.capacity:
+            raise ValueError("cannot acquire more tokens than the bucket capacity")
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    wait = (tokens - self._tokens) / self.rate
+            # sleep outside the lock so other workers can observe pauses/refills
+            self._sleep(wait)
+            waited += wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if available right now; never blocks."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return False
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def pause(self, seconds: float) -> None:
+        """Block all acquirers for `seconds`; the bucket restarts empty afterwards."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            until = now + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+            # tokens accrued during the pause would allow an immediate burst
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left on the current pause (0 when not paused)."""
+        with self._lock:
+            return max(0.0, self._paused_until - self._clock())
+
+
+__all__ = ["TokenBucket"]
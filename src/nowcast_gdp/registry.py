@@ -16,6 +16,7 @@ class SeriesCfg:
     vintage_start: Optional[date] = None
     latest_only: bool = False
     active: bool = True
+    release_id: Optional[int] = None  # FRED release (for the polling scheduler's calendar)
 
 
 def load_registry(path: str | Path = Path("config/series.toml")) -> Dict[str, SeriesCfg]:
@@ -33,6 +34,7 @@ def load_registry(path: str | Path = Path("config/series.toml")) -> Dict[str, Se
             vintage_start=date.fromisoformat(vintage_start) if vintage_start else None,
             latest_only=bool(entry.get("latest_only", False)),
             active=bool(entry.get("active", True)),
+            release_id=int(entry["release_id"]) if "release_id" in entry else None,
         )
     return res
 
@@ -0,0 +1,200 @@
+# src/nowcast_gdp/resultcache.py
+"""
+Persistent, content-addressed cache of forecast results.
+
+A result is keyed by (kind, model, params, series, digest of the input data): the
+digest is a hash of the vintage's (date, value) pairs, not of file names or mtimes,
+so a re-ingested but unchanged vintage still hits, and anything that changes the data
+or the model parameters misses. `kind` names the payload layout, so callers storing
+different arrays for the same inputs never share an entry, and `get` can check the
+shape it expects before handing an entry back. The backtest keeps one record array
+per (series, model, params) with a row per vintage digest, so a whole block is one
+read and at most one write. Entries are `.npy` arrays under
+`{data root}/_cache/results/`, written atomically (temp file + rename). Reads touch
+the file's mtime and writes evict the least recently used entries once the directory
+exceeds `max_bytes`.
+
+After a nightly ingest, only forecasts from vintages whose content is new are
+computed; everything else is read back.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dataio import _root
+
+RESULTS_DIRNAME = "results"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_SUFFIX = ".npy"
+
+
+def results_dir(base: Path | None = None) -> Path:
+    return _root(base) / "_cache" / RESULTS_DIRNAME
+
+
+def vintage_digest(dates: Any, values: Any) -> str:
+    """Content hash of one vintage: its observed (date, value) pairs; blanks are ignored."""
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    vals = np.asarray(values, dtype=np.float64)
+    keep = ~np.isnan(vals)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(days[keep]).tobytes())
+    h.update(np.ascontiguousarray(vals[keep]).tobytes())
+    return h.hexdigest()
+
+
+def column_digests(dates: Any, values: Any) -> List[str]:
+    """`vintage_digest` of every column of an (n_obs, k) block, sharing the date conversion."""
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    cols = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T)  # one row per vintage
+    keep = ~np.isnan(cols)
+    out = []
+    for col, k in zip(cols, keep):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(days[k].tobytes())
+        h.update(col[k].tobytes())
+        out.append(h.hexdigest())
+    return out
+
+
+def result_key(
+    model: str,
+    params: Dict[str, Any],
+    series_id: str,
+    digest: str,
+    kind: str = "forecast",
+) -> str:
+    """
+    Stable key: hash of the canonical JSON of (kind, model, params, series, input
+    digest). `kind` is the payload layout, e.g. "forecast" (the h-step path) or
+    "backtest" (last observed day, then the path).
+    """
+    blob = json.dumps(
+        {"kind": kind, "model": model, "params": params, "series": series_id, "input": digest},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """On-disk LRU of float64 (or record) arrays keyed by `result_key`; safe across processes."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes: Optional[int] = None  # lazily scanned
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_base(cls, base: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        return cls(results_dir(base), max_bytes)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    def get(
+        self,
+        key: str,
+        shape: Optional[Tuple[int, ...]] = None,
+        dtype: Optional[np.dtype] = None,
+    ) -> Optional[np.ndarray]:
+        """The cached array, or None (a miss) if absent, unreadable or not of `shape`/`dtype`."""
+        p = self._path(key)
+        try:
+            arr = np.load(p, allow_pickle=False)
+            if shape is not None and arr.shape != tuple(shape):
+                raise ValueError(f"cached result {key} has shape {arr.shape}, not {shape}")
+            if dtype is not None and arr.dtype != dtype:
+                raise ValueError(f"cached result {key} has dtype {arr.dtype}, not {dtype}")
+            os.utime(p)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return arr
+
+    def put(self, key: str, value: np.ndarray) -> None:
+        """Store `value` as float64, or as is when it is a structured (record) array."""
+        arr = np.asarray(value)
+        if arr.dtype.names is None:
+            arr = arr.astype(np.float64, copy=False)
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with tmp.open("wb") as f:
+                np.save(f, arr, allow_pickle=False)
+            size = tmp.stat().st_size
+            old = p.stat().st_size if p.exists() else 0
+            os.replace(tmp, p)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(s for _, s, _ in self._entries())
+            else:
+                self._bytes += size - old
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        out = []
+        for p in self.root.glob(f"*/*{_SUFFIX}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((p, st.st_size, st.st_mtime))
+        return out
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits; returns how many."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(s for _, s, _ in entries)
+            n = 0
+            for p, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                p.unlink(missing_ok=True)
+                total -= size
+                n += 1
+            self._bytes = total
+            self.evictions += n
+            return n
+
+    def size_bytes(self) -> int:
+        return sum(s for _, s, _ in self._entries())
+
+    def clear(self) -> None:
+        with self._lock:
+            for p, _, _ in self._entries():
+                p.unlink(missing_ok=True)
+            self._bytes = 0
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "ResultCache",
+    "column_digests",
+    "result_key",
+    "results_dir",
+    "vintage_digest",
+]
@@ -0,0 +1,348 @@
+# src/nowcast_gdp/revisions.py
+"""
+Revision analysis over a series' stored vintages.
+
+Per observation date: the first release, the k-th release (the value in the k-th
+vintage that publishes the observation; k = 1 is the first release), the latest
+value, and how many vintages have published it. From those come revision matrices
+and summary statistics (mean revision, noise-to-signal, and the correlations of the
+revision with the release and with the latest value that distinguish noise from news).
+
+`RevisionState` holds the per-observation results. It is built from the whole
+triangle in one vectorized pass and then extended in place as newer vintages are
+ingested: each new vintage only touches the rows it publishes. The state is kept
+next to the vintages:
+
+  data/raw/alfred/{series}/_revisions/state.npz
+
+  python -m nowcast_gdp.revisions --series GDP --k 3 --out revisions.csv
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .dataio import _series_dir, list_vintages, read_vintage_arrays
+from .store import Triangle, build_triangle, has_store, load_triangle
+
+DEFAULT_MAX_K = 3
+REVISIONS_DIRNAME = "_revisions"
+_STATE_FILE = "state.npz"
+_NAT = np.datetime64("NaT", "D")
+
+
+@dataclass
+class RevisionState:
+    """Per-observation release values, updated in place by `extend`."""
+
+    obs_dates: np.ndarray  # datetime64[D], (n_obs,), ascending
+    vintages: np.ndarray  # datetime64[D], vintages folded in so far, ascending
+    releases: np.ndarray  # float64, (n_obs, max_k): k-th release in column k-1 (NaN if not yet)
+    release_vintages: np.ndarray  # datetime64[D], (n_obs, max_k): vintage of each release
+    latest: np.ndarray  # float64, (n_obs,)
+    latest_vintage: np.ndarray  # datetime64[D], (n_obs,)
+    n_releases: np.ndarray  # int64, (n_obs,): vintages that published a value
+
+    @property
+    def max_k(self) -> int:
+        return self.releases.shape[1]
+
+    @property
+    def first(self) -> np.ndarray:
+        return self.releases[:, 0]
+
+    def kth(self, k: int) -> np.ndarray:
+        """k-th release per observation (1-based; NaN where fewer than k releases)."""
+        if not 1 <= k <= self.max_k:
+            raise ValueError(f"k must be in 1..{self.max_k}")
+        return self.releases[:, k - 1]
+
+    def revision(self, k: int = 1) -> np.ndarray:
+        """Total revision from the k-th release to the latest value."""
+        return self.latest - self.kth(k)
+
+    @classmethod
+    def empty(cls, max_k: int = DEFAULT_MAX_K) -> "RevisionState":
+        return cls(
+            obs_dates=np.array([], dtype="datetime64[D]"),
+            vintages=np.array([], dtype="datetime64[D]"),
+            releases=np.empty((0, max_k)),
+            release_vintages=np.empty((0, max_k), dtype="datetime64[D]"),
+            latest=np.empty(0),
+            latest_vintage=np.array([], dtype="datetime64[D]"),
+            n_releases=np.zeros(0, dtype=np.int64),
+        )
+
+    def _grow(self, dts: np.ndarray) -> None:
+        """Add observation dates not yet on the axis (rows start unpublished)."""
+        axis = np.union1d(self.obs_dates, dts)
+        if len(axis) == len(self.obs_dates):
+            return
+        n, k = len(axis), self.max_k
+        rows = np.searchsorted(axis, self.obs_dates)
+        releases = np.full((n, k), np.nan)
+        release_vintages = np.full((n, k), _NAT)
+        latest = np.full(n, np.nan)
+        latest_vintage = np.full(n, _NAT)
+        n_releases = np.zeros(n, dtype=np.int64)
+        releases[rows] = self.releases
+        release_vintages[rows] = self.release_vintages
+        latest[rows] = self.latest
+        latest_vintage[rows] = self.latest_vintage
+        n_releases[rows] = self.n_releases
+        self.obs_dates = axis
+        self.releases, self.release_vintages = releases, release_vintages
+        self.latest, self.latest_vintage = latest, latest_vintage
+        self.n_releases = n_releases
+
+    def extend(self, vintage: date, dts: np.ndarray, vals: np.ndarray) -> None:
+        """
+        Fold in one vintage newer than every vintage seen so far; (dts, vals) as from
+        `read_vintage_arrays` (NaN = not published). Touches only the published rows.
+        """
+        v = np.datetime64(vintage, "D")
+        if len(self.vintages) and v <= self.vintages[-1]:
+            raise ValueError(f"vintage {vintage} is not newer than {self.vintages[-1]}")
+        keep = ~np.isnan(vals)
+        dts, vals = np.asarray(dts)[keep], np.asarray(vals)[keep]
+        self._grow(dts)
+        i = np.searchsorted(self.obs_dates, dts)
+        c = self.n_releases[i]
+        slot = c < self.max_k
+        self.releases[i[slot], c[slot]] = vals[slot]
+        self.release_vintages[i[slot], c[slot]] = v
+        self.latest[i] = vals
+        self.latest_vintage[i] = v
+        self.n_releases[i] = c + 1
+        self.vintages = np.append(self.vintages, v)
+
+
+# ---------- triangle -> state ----------
+def _publication_rank(values: np.ndarray) -> np.ndarray:
+    """Per cell: how many vintages up to and including this one publish the row."""
+    return np.cumsum(~np.isnan(values), axis=1)
+
+
+def from_triangle(tri: Triangle, max_k: int = DEFAULT_MAX_K) -> RevisionState:
+    """Full build in one pass over the triangle (no per-row or per-vintage loop)."""
+    values = np.asarray(tri.values)
+    n_obs, n_vint = values.shape
+    if n_vint == 0:
+        st = RevisionState.empty(max_k)
+        st._grow(tri.obs_dates)
+        return st
+    mask = ~np.isnan(values)
+    rank = _publication_rank(values)
+    rows = np.arange(n_obs)
+    n_releases = rank[:, -1].astype(np.int64)
+
+    releases = np.full((n_obs, max_k), np.nan)
+    release_vintages = np.full((n_obs, max_k), _NAT)
+    for k in range(1, max_k + 1):
+        has = n_releases >= k
+        j = (mask & (rank == k)).argmax(axis=1)
+        releases[has, k - 1] = values[rows[has], j[has]]
+        release_vintages[has, k - 1] = tri.vintages[j[has]]
+
+    has = n_releases > 0
+    last_j = n_vint - 1 - mask[:, ::-1].argmax(axis=1)
+    latest = np.where(has, values[rows, last_j], np.nan)
+    latest_vintage = np.where(has, tri.vintages[last_j], _NAT)
+    return RevisionState(
+        obs_dates=np.asarray(tri.obs_dates),
+        vintages=np.asarray(tri.vintages),
+        releases=releases,
+        release_vintages=release_vintages,
+        latest=latest,
+        latest_vintage=latest_vintage,
+        n_releases=n_releases,
+    )
+
+
+def revision_matrix(tri: Triangle, relative_to: str = "first") -> np.ndarray:
+    """
+    (n_obs, n_vint) revisions, NaN where a vintage does not publish the row:
+    "first" -> value minus the first release; "previous" -> value minus the value in
+    the previous vintage that published the row (NaN at the first release).
+    """
+    values = np.asarray(tri.values)
+    if relative_to == "first":
+        return values - from_triangle(tri, max_k=1).first[:, None]
+    if relative_to != "previous":
+        raise ValueError("relative_to must be 'first' or 'previous'")
+    mask = ~np.isnan(values)
+    n_obs, n_vint = values.shape
+    # column of the most recent publication at or before each vintage (forward fill)
+    idx = np.maximum.accumulate(np.where(mask, np.arange(n_vint), 0), axis=1)
+    filled = np.where(_publication_rank(values) > 0, values[np.arange(n_obs)[:, None], idx], np.nan)
+    prev = np.full_like(filled, np.nan)
+    prev[:, 1:] = filled[:, :-1]
+    return np.where(mask, values - prev, np.nan)
+
+
+# ---------- statistics ----------
+def revision_stats(state: RevisionState, min_releases: int = 0):
+    """
+    Summary per release k (k-th release -> latest value) as a pandas DataFrame:
+    n, mean_revision, mean_abs_revision, std_revision, noise_to_signal (std of the
+    revision over std of the latest value), corr_release and corr_latest. Revisions
+    that are pure news are uncorrelated with the release; pure noise, with the latest
+    value. Rows need at least max(k, `min_releases`) releases to count.
+    """
+    import pandas as pd
+
+    out = []
+    for k in range(1, state.max_k + 1):
+        rel, lat = state.kth(k), state.latest
+        keep = (state.n_releases >= max(k, min_releases)) & ~np.isnan(rel) & ~np.isnan(lat)
+        r, rel, lat = lat[keep] - rel[keep], rel[keep], lat[keep]
+        n = int(keep.sum())
+        out.append(
+            {
+                "release": k,
+                "n": n,
+                "mean_revision": r.mean() if n else np.nan,
+                "mean_abs_revision": np.abs(r).mean() if n else np.nan,
+                "std_revision": r.std(ddof=1) if n > 1 else np.nan,
+                "noise_to_signal": _ratio(r.std(ddof=1), lat.std(ddof=1)) if n > 1 else np.nan,
+                "corr_release": _corr(r, rel),
+                "corr_latest": _corr(r, lat),
+            }
+        )
+    return pd.DataFrame(out)
+
+
+def _ratio(a: float, b: float) -> float:
+    return a / b if b > 0 else np.nan
+
+
+def _corr(a: np.ndarray, b: np.ndarray) -> float:
+    if len(a) < 2 or a.std() == 0 or b.std() == 0:
+        return np.nan
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+# ---------- persistence ----------
+def state_path(series_dir: Path) -> Path:
+    return series_dir / REVISIONS_DIRNAME / _STATE_FILE
+
+
+def save_state(state: RevisionState, path: Path) -> None:
+    """Atomic write (temp file + rename) of the state arrays."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            np.savez(f, **state.__dict__)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def load_state(path: Path) -> RevisionState:
+    with np.load(path) as z:
+        return RevisionState(**{k: z[k] for k in z.files})
+
+
+# ---------- per-series entry points ----------
+def _triangle(sdir: Path, vintages: List[date]) -> Triangle:
+    return load_triangle(sdir, mmap=False) if has_store(sdir) else build_triangle(sdir, vintages)
+
+
+def _sync(
+    series_id: str, base: Path | None, max_k: int, state: Optional[RevisionState]
+) -> RevisionState:
+    stored = list_vintages(series_id, base)
+    sdir = _series_dir(series_id, base)
+    known = set(state.vintages.tolist()) if state is not None else set()
+    new = [v for v in stored if v not in known]
+    if state is None or state.max_k != max_k or (new and len(state.vintages) == 0):
+        state = from_triangle(_triangle(sdir, stored), max_k) if stored else None
+    elif new and new[0] <= state.vintages[-1]:
+        # a vintage was back-filled inside the history: rebuild rather than extend
+        state = from_triangle(_triangle(sdir, stored), max_k)
+    else:
+        for v in new:
+            state.extend(v, *read_vintage_arrays(series_id, v, base))
+    if state is None:
+        raise FileNotFoundError(f"No stored vintages for {series_id}")
+    if new or not state_path(sdir).exists():
+        save_state(state, state_path(sdir))
+    return state
+
+
+def revision_state(
+    series_id: str, base: Path | None = None, max_k: int = DEFAULT_MAX_K
+) -> RevisionState:
+    """
+    Revision state for a series, current with its stored vintages: the saved state
+    extended by any newer vintages (cost proportional to their published rows), or a
+    full build when there is none yet.
+    """
+    path = state_path(_series_dir(series_id, base))
+    state = load_state(path) if path.exists() else None
+    return _sync(series_id, base, max_k, state)
+
+
+def update_revision_state(series_dir: Path) -> Optional[RevisionState]:
+    """Bring a series' saved state up to date after ingest; no-op if it has none."""
+    path = state_path(series_dir)
+    if not path.exists():
+        return None
+    state = load_state(path)
+    return _sync(series_dir.name, series_dir.parent, state.max_k, state)
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Revision statistics (k-th release vs latest) per series")
+    ap.add_argument("--series", required=True, help="Comma-separated series IDs, e.g., GDP,PCE")
+    ap.add_argument("--k", type=int, default=DEFAULT_MAX_K, help="Releases to track per date")
+    ap.add_argument("--min-releases", type=int, default=0, help="Skip less-revised dates")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    ap.add_argument("--out", default=None, help="Write the statistics table to this CSV")
+    args = ap.parse_args(argv)
+
+    import pandas as pd
+
+    tables = []
+    for sid in [s.strip() for s in args.series.split(",") if s.strip()]:
+        st = revision_state(sid, Path(args.base), max_k=max(1, args.k))
+        stats = revision_stats(st, min_releases=args.min_releases)
+        stats.insert(0, "series", sid)
+        tables.append(stats)
+        print(f"[revisions] {sid}: {len(st.obs_dates)} dates x {len(st.vintages)} vintages")
+    df = pd.concat(tables, ignore_index=True)
+    print(df.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    if args.out:
+        df.to_csv(args.out, index=False)
+    return 0
+
+
+__all__ = [
+    "RevisionState",
+    "from_triangle",
+    "revision_matrix",
+    "revision_stats",
+    "revision_state",
+    "update_revision_state",
+    "state_path",
+    "save_state",
+    "load_state",
+    "DEFAULT_MAX_K",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
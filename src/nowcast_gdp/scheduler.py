@@ -0,0 +1,440 @@
+# src/nowcast_gdp/scheduler.py
+"""
+Release-calendar-aware polling scheduler for continuous ingest.
+
+Instead of polling every series every hour from cron, one long-running process keeps
+a priority queue keyed on each series' next poll time. The next poll follows from
+the series' next expected release:
+
+  * far from a release   -> sleep until `pre_window` before it (with an `idle`
+                            poll in between to catch unscheduled revisions)
+  * around a release     -> poll every `hot_interval` until the vintage shows up
+  * release is late      -> back off exponentially, up to `idle_interval`
+
+Expected releases come from a release calendar (FRED `release/dates` for series
+with a `release_id` in the registry, and/or a local CSV `series,date[,time]`), else
+from the registry `frequency` and the newest stored vintage. The calendar is
+reloaded every `calendar_refresh` seconds, and sooner when a series runs past its
+last scheduled date. A poll is the incremental ingest (one tiny vintagedates request
+unless a new vintage exists).
+
+  python -m nowcast_gdp.scheduler --registry config/series.toml --state-file sched.json
+  python -m nowcast_gdp.scheduler --once --dry-run      # print the queue and exit
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .alfred import list_release_dates
+from .io import atomic_write
+from .registry import SeriesCfg, load_registry, select_series
+
+# US statistical agencies publish at 08:30 Eastern
+RELEASE_TZ = ZoneInfo("America/New_York")
+DEFAULT_RELEASE_TIME = dtime(8, 30)
+
+# typical spacing between vintages by registry frequency (quarterly GDP is revised monthly)
+FREQUENCY_CADENCE_DAYS: Dict[str, int] = {
+    "daily": 1,
+    "weekly": 7,
+    "biweekly": 14,
+    "monthly": 30,
+    "quarterly": 30,
+    "annual": 365,
+}
+DEFAULT_CADENCE_DAYS = 30
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    pre_window: float = 15 * 60  # start polling this long before an expected release
+    post_window: float = 2 * 3600  # keep polling at hot_interval this long after it
+    hot_interval: float = 60.0
+    idle_interval: float = 6 * 3600  # upper bound between polls (also the backoff cap)
+    late_limit: float = 3 * 86400  # a release this overdue is given up on
+    calendar_refresh: float = 86400  # reload the release calendar this often
+
+
+# ---------- release calendar ----------
+def release_timestamp(d: date, at: dtime = DEFAULT_RELEASE_TIME) -> float:
+    return datetime.combine(d, at, tzinfo=RELEASE_TZ).timestamp()
+
+
+class ReleaseCalendar:
+    """Expected release times (epoch seconds) per logical series id."""
+
+    def __init__(self, times: Optional[Dict[str, List[float]]] = None) -> None:
+        self._times: Dict[str, List[float]] = {k: sorted(v) for k, v in (times or {}).items()}
+
+    def add(self, series: str, when: float) -> None:
+        ts = self._times.setdefault(series, [])
+        ts.append(when)
+        ts.sort()
+
+    def next_after(self, series: str, t: float) -> Optional[float]:
+        for when in self._times.get(series, []):
+            if when > t:
+                return when
+        return None
+
+    def __contains__(self, series: str) -> bool:
+        return bool(self._times.get(series))
+
+
+def load_calendar_file(path: Path, registry: Dict[str, SeriesCfg]) -> ReleaseCalendar:
+    """
+    CSV with header `series,date[,time]`; `series` is a logical or FRED id, `time`
+    is HH:MM Eastern (default 08:30).
+    """
+    by_fred = {cfg.fred_id: sid for sid, cfg in registry.items()}
+    cal = ReleaseCalendar()
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sid = (row.get("series") or "").strip()
+            sid = sid if sid in registry else by_fred.get(sid, sid)
+            if not sid or not (row.get("date") or "").strip():
+                continue
+            at = dtime.fromisoformat(row["time"].strip()) if row.get("time") else None
+            cal.add(
+                sid,
+                release_timestamp(
+                    date.fromisoformat(row["date"].strip()), at or DEFAULT_RELEASE_TIME
+                ),
+            )
+    return cal
+
+
+def fetch_release_calendar(
+    registry: Dict[str, SeriesCfg],
+    since: date,
+    calendar: Optional[ReleaseCalendar] = None,
+) -> ReleaseCalendar:
+    """Add FRED `release/dates` (one request per distinct release_id) to `calendar`."""
+    cal = calendar or ReleaseCalendar()
+    dates: Dict[int, List[date]] = {}
+    for sid, cfg in registry.items():
+        if cfg.release_id is None:
+            continue
+        if cfg.release_id not in dates:
+            dates[cfg.release_id] = list_release_dates(cfg.release_id, realtime_start=since)
+        for d in dates[cfg.release_id]:
+            cal.add(sid, release_timestamp(d))
+    return cal
+
+
+# ---------- queue ----------
+@dataclass
+class SeriesSchedule:
+    series: str
+    expected: Optional[float] = None  # next expected release (epoch seconds)
+    next_poll: float = 0.0
+    interval: float = 0.0  # current backoff step once a release is late
+    last_poll: Optional[float] = None
+    last_new: Optional[float] = None  # when a new vintage was last found
+    polls: int = 0
+    hits: int = 0
+
+
+PollFn = Callable[[SeriesCfg], int]
+NewestFn = Callable[[SeriesCfg], Optional[date]]
+
+
+class Scheduler:
+    """
+    Priority queue of series keyed on their next poll time. `poll(cfg)` fetches any
+    new vintages and returns how many it wrote; `newest(cfg)` is the newest stored
+    vintage (used for frequency-based expectations). `load_calendar()`, if given,
+    rebuilds the release calendar; it is called on a `calendar_refresh` cadence.
+    """
+
+    def __init__(
+        self,
+        registry: Dict[str, SeriesCfg],
+        poll: PollFn,
+        newest: NewestFn,
+        calendar: Optional[ReleaseCalendar] = None,
+        policy: PollPolicy = PollPolicy(),
+        clock: Callable[[], float] = time.time,
+        load_calendar: Optional[Callable[[], ReleaseCalendar]] = None,
+    ) -> None:
+        self.registry = registry
+        self.policy = policy
+        self._poll = poll
+        self._newest = newest
+        self._clock = clock
+        self._load_calendar = load_calendar
+        self._heap: List[Tuple[float, str]] = []
+        self.state: Dict[str, SeriesSchedule] = {}
+        now = clock()
+        if calendar is None and load_calendar is not None:
+            calendar = load_calendar()
+        self.calendar = calendar or ReleaseCalendar()
+        self.calendar_loaded = now
+        self._calendar_exhausted = False
+        for sid in registry:
+            st = self.state[sid] = SeriesSchedule(series=sid)
+            st.expected = self.expected_release(sid, now)
+            self._push(st, now)  # poll everything once at start-up
+
+    # ---- expectations ----
+    def expected_release(self, sid: str, now: float) -> Optional[float]:
+        """Next release not yet stored and not given up on (None when unknown)."""
+        cfg = self.registry[sid]
+        newest = self._newest(cfg)
+        floor = now - self.policy.late_limit
+        if newest is not None:
+            floor = max(floor, release_timestamp(newest + timedelta(days=1), dtime(0, 0)))
+        cal = self.calendar.next_after(sid, floor)
+        if cal is None and sid in self.calendar:
+            self._calendar_exhausted = True  # published schedule ran out
+        if cal is not None or newest is None:
+            return cal
+        step = timedelta(days=FREQUENCY_CADENCE_DAYS.get(cfg.frequency or "", DEFAULT_CADENCE_DAYS))
+        d = newest + step
+        while release_timestamp(d) + self.policy.late_limit < now:
+            d += step
+        return release_timestamp(d)
+
+    def _plan(self, st: SeriesSchedule, now: float) -> float:
+        p = self.policy
+        t = st.expected
+        if t is None:
+            return now + p.idle_interval
+        if now < t - p.pre_window:
+            st.interval = 0.0
+            return min(t - p.pre_window, now + p.idle_interval)
+        if now <= t + p.post_window:
+            return now + p.hot_interval
+        st.interval = min(p.idle_interval, max(p.hot_interval, st.interval * 2))
+        return now + st.interval
+
+    def _push(self, st: SeriesSchedule, when: float) -> None:
+        st.next_poll = when
+        heapq.heappush(self._heap, (when, st.series))
+
+    # ---- calendar ----
+    def refresh_calendar(self, now: Optional[float] = None) -> bool:
+        """
+        Reload the calendar and re-plan series whose expected release changed.
+        A failed reload keeps the old calendar (retried on the next refresh).
+        """
+        if self._load_calendar is None:
+            return False
+        now = self._clock() if now is None else now
+        self.calendar_loaded = now
+        self._calendar_exhausted = False
+        try:
+            self.calendar = self._load_calendar()
+        except Exception as exc:  # noqa: BLE001 (keep polling on the old calendar)
+            print(f"[scheduler] calendar refresh failed: {exc}")
+            return False
+        for sid, st in self.state.items():
+            expected = self.expected_release(sid, now)
+            if expected != st.expected:
+                st.expected = expected
+                st.interval = 0.0
+                self._push(st, min(st.next_poll, self._plan(st, now)))
+        return True
+
+    def _calendar_due(self, now: float) -> bool:
+        if self._load_calendar is None:
+            return False
+        age = now - self.calendar_loaded
+        if age >= self.policy.calendar_refresh:
+            return True
+        # ran past the published dates: reload early, but not on every poll
+        return self._calendar_exhausted and age >= self.policy.idle_interval
+
+    # ---- running ----
+    def next_due(self) -> Optional[float]:
+        while self._heap:
+            when, sid = self._heap[0]
+            if self.state[sid].next_poll == when:
+                return when
+            heapq.heappop(self._heap)  # superseded entry
+        return None
+
+    def run_due(self, now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """Poll every series whose time has come; returns (series, new vintages) pairs."""
+        now = self._clock() if now is None else now
+        if self._calendar_due(now):
+            self.refresh_calendar(now)
+        out = []
+        while True:
+            when = self.next_due()
+            if when is None or when > now:
+                return out
+            _, sid = heapq.heappop(self._heap)
+            st = self.state[sid]
+            try:
+                n = self._poll(self.registry[sid])
+            except Exception as exc:  # noqa: BLE001 (keep the loop alive; retry later)
+                print(f"[scheduler] {sid}: poll failed: {exc}")
+                n = 0
+            st.polls += 1
+            st.last_poll = now
+            if n:
+                st.hits += 1
+                st.last_new = now
+                st.interval = 0.0
+            st.expected = self.expected_release(sid, now)
+            self._push(st, self._plan(st, now))
+            out.append((sid, n))
+
+    def run_forever(
+        self,
+        sleep: Optional[Callable[[float], None]] = None,
+        on_cycle: Optional[Callable[["Scheduler"], None]] = None,
+        max_cycles: Optional[int] = None,
+    ) -> None:
+        sleep = sleep or time.sleep
+        cycles = 0
+        while True:
+            for sid, n in self.run_due():
+                if n:
+                    print(f"[scheduler] {sid}: {n} new vintage(s)")
+            if on_cycle is not None:
+                on_cycle(self)
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                return  # no sleep after the last cycle (--once exits right away)
+            nxt = self.next_due()
+            if nxt is None:
+                return
+            sleep(max(0.0, nxt - self._clock()))
+
+    # ---- state ----
+    def snapshot(self) -> Dict:
+        """Queue state, soonest poll first (times as ISO-8601 UTC strings)."""
+        rows = []
+        for st in sorted(self.state.values(), key=lambda s: (s.next_poll, s.series)):
+            rec = asdict(st)
+            for k in ("expected", "next_poll", "last_poll", "last_new"):
+                rec[k] = _iso(rec[k])
+            rows.append(rec)
+        return {"generated": _iso(self._clock()), "policy": asdict(self.policy), "queue": rows}
+
+    def write_state(self, path: Path) -> None:
+        with atomic_write(path) as f:
+            json.dump(self.snapshot(), f, indent=2)
+            f.write("\n")
+
+
+def _iso(t: Optional[float]) -> Optional[str]:
+    if t is None:
+        return None
+    return datetime.fromtimestamp(t, timezone.utc).isoformat(timespec="seconds")
+
+
+# ---------- ingest wiring ----------
+def ingest_poller(base: Path | None = None, listing_ttl: float = 0.0, **opts) -> PollFn:
+    """Poll = incremental ingest of one series (new vintages only)."""
+    from .ingest_alfred import persist_all_vintages
+
+    def _poll(cfg: SeriesCfg) -> int:
+        written = persist_all_vintages(
+            cfg.fred_id,
+            latest_only=cfg.latest_only,
+            start=cfg.vintage_start,
+            base=base,
+            incremental=True,
+            listing_ttl=listing_ttl,
+            **opts,
+        )
+        return len(written)
+
+    return _poll
+
+
+def stored_newest(base: Path | None = None) -> NewestFn:
+    from .ingest_alfred import newest_local_vintage
+
+    return lambda cfg: newest_local_vintage(cfg.fred_id, base)
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Poll registry series around their expected releases")
+    ap.add_argument("--registry", default="config/series.toml", help="Path to series.toml")
+    ap.add_argument("--include", default=None, help="Comma-separated logical or FRED ids")
+    ap.add_argument("--all", action="store_true", help="Include inactive series")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    ap.add_argument("--calendar", default=None, help="Local release calendar CSV (series,date)")
+    ap.add_argument(
+        "--no-fred-calendar",
+        action="store_true",
+        help="Do not fetch release/dates for series with a release_id",
+    )
+    ap.add_argument("--state-file", default=None, help="Write the queue state here each cycle")
+    ap.add_argument("--hot-interval", type=float, default=PollPolicy.hot_interval)
+    ap.add_argument("--idle-interval", type=float, default=PollPolicy.idle_interval)
+    ap.add_argument("--pre-window", type=float, default=PollPolicy.pre_window)
+    ap.add_argument("--post-window", type=float, default=PollPolicy.post_window)
+    ap.add_argument("--storage", choices=["full", "delta"], default="full")
+    ap.add_argument("--once", action="store_true", help="Run the polls due now, then exit")
+    ap.add_argument("--dry-run", action="store_true", help="Print the queue without polling")
+    args = ap.parse_args(argv)
+
+    reg = select_series(
+        load_registry(args.registry),
+        include=[s for s in args.include.split(",") if s.strip()] if args.include else None,
+        active_only=not args.all,
+    )
+    base = Path(args.base)
+
+    def _calendar(fred: bool) -> ReleaseCalendar:
+        cal = load_calendar_file(Path(args.calendar), reg) if args.calendar else ReleaseCalendar()
+        if fred:
+            cal = fetch_release_calendar(reg, since=date.today() - timedelta(days=7), calendar=cal)
+        return cal
+
+    policy = PollPolicy(
+        pre_window=args.pre_window,
+        post_window=args.post_window,
+        hot_interval=args.hot_interval,
+        idle_interval=args.idle_interval,
+    )
+    sched = Scheduler(
+        reg,
+        poll=ingest_poller(base, storage=args.storage),
+        newest=stored_newest(base),
+        calendar=_calendar(not args.no_fred_calendar and not args.dry_run),
+        policy=policy,
+        load_calendar=lambda: _calendar(not args.no_fred_calendar),
+    )
+    write = (lambda s: s.write_state(Path(args.state_file))) if args.state_file else None
+
+    if args.dry_run:
+        for row in sched.snapshot()["queue"]:
+            print(f"{row['series']:<16} expected {row['expected'] or '-':<26}")
+        return 0
+    sched.run_forever(on_cycle=write, max_cycles=1 if args.once else None)
+    return 0
+
+
+__all__ = [
+    "Scheduler",
+    "SeriesSchedule",
+    "PollPolicy",
+    "ReleaseCalendar",
+    "load_calendar_file",
+    "fetch_release_calendar",
+    "release_timestamp",
+    "ingest_poller",
+    "stored_newest",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
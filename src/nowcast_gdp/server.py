@@ -0,0 +1,400 @@
+# src/nowcast_gdp/server.py
+"""
+Resident forecast server: every vintage of the registry series stays in memory (one
+observation x vintage triangle per series), so baseline forecasts and as-of queries
+are answered without touching the disk.
+
+  python -m nowcast_gdp.server --registry config/series.toml --port 8765
+  python -m nowcast_gdp.server --unix /tmp/nowcast.sock
+
+  GET /forecast?series=GDP&model=bl1&h=4&window=4[&asof=YYYY-MM-DD]
+  GET /asof?series=GDP&date=YYYY-MM-DD[&tail=8]
+  GET /series        # loaded series, latest vintage, observation count
+  GET /health
+  GET /metrics       # per-route latency histograms (Prometheus text)
+
+A watcher thread polls each series' index.csv and directory (mtime + size, the
+same identity the dataio caches use) and reloads a series when a new vintage lands.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+import time
+from argparse import ArgumentParser
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .baselines.batch import drift_forecast_batch, forecast_last_batch
+from .cache import LRUCache
+from .dataio import _identity, _index_path, _series_dir, list_vintages
+from .metrics import Metrics
+from .registry import load_registry, select_series
+from .store import Triangle, build_triangle, has_store, load_triangle
+
+MODELS = ("bl0", "bl1")
+DEFAULT_PORT = 8765
+DEFAULT_WATCH_INTERVAL = 1.0
+MAX_HORIZON = 40
+
+
+class QueryError(ValueError):
+    """Bad request parameters (HTTP 400)."""
+
+
+@dataclass(frozen=True)
+class HotSeries:
+    """One series as served: all its vintages, plus the latest one unpacked."""
+
+    series_id: str
+    identity: Tuple  # (index identity, directory mtime) the data was loaded under
+    vintages: List[date]
+    latest: date
+    dates: np.ndarray  # datetime64[D], blanks dropped
+    values: np.ndarray  # float64, blanks dropped
+    triangle: Triangle  # every vintage, resident (not memory-mapped)
+
+    def vintage(self, j: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(dates, values) of the j-th vintage, blanks dropped."""
+        return _drop_blanks(self.triangle.obs_dates, self.triangle.values[:, j])
+
+
+class ForecastService:
+    """In-memory query engine behind the HTTP server (usable on its own)."""
+
+    def __init__(self, series: List[str], base: Path | None = None) -> None:
+        self.base = base
+        self.series_ids = list(series)
+        self._hot: Dict[str, HotSeries] = {}
+        self._results = LRUCache(max_entries=4096, sizeof=lambda v: 0)
+        self.reloads = 0
+        self.refresh()
+
+    # ---- loading ----
+    def _identity(self, sid: str) -> Tuple:
+        sdir = _series_dir(sid, self.base)
+        return (_identity(_index_path(sid, self.base), "index"), _identity(sdir, "dir"))
+
+    def _load(self, sid: str, ident: Tuple) -> Optional[HotSeries]:
+        vintages = list_vintages(sid, self.base)
+        if not vintages:
+            return None
+        tri = _resident_triangle(_series_dir(sid, self.base), vintages)
+        dts, vals = _drop_blanks(tri.obs_dates, tri.values[:, -1])
+        return HotSeries(sid, ident, vintages, vintages[-1], dts, vals, tri)
+
+    def refresh(self) -> List[str]:
+        """Reload series whose files changed since they were loaded; returns their ids."""
+        changed = []
+        for sid in self.series_ids:
+            ident = self._identity(sid)
+            cur = self._hot.get(sid)
+            if cur is not None and cur.identity == ident:
+                continue
+            hot = self._load(sid, ident)
+            if hot is None:
+                self._hot.pop(sid, None)
+            else:
+                self._hot[sid] = hot  # single dict store: readers see old or new
+            changed.append(sid)
+        if changed:
+            self.reloads += 1
+        return changed
+
+    def _get(self, sid: str) -> HotSeries:
+        hot = self._hot.get(sid)
+        if hot is None:
+            raise LookupError(f"series {sid!r} is not loaded")
+        return hot
+
+    def _vintage(self, hot: HotSeries, asof: Optional[date]) -> Tuple[date, np.ndarray, np.ndarray]:
+        if asof is None or asof >= hot.latest:
+            return hot.latest, hot.dates, hot.values
+        i = bisect_right(hot.vintages, asof)
+        if i == 0:
+            raise LookupError(f"no vintage of {hot.series_id!r} on or before {asof}")
+        return (hot.vintages[i - 1], *hot.vintage(i - 1))
+
+    # ---- queries ----
+    def forecast(
+        self,
+        series: str,
+        model: str = "bl0",
+        h: int = 4,
+        window: int = 4,
+        asof: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        if model not in MODELS:
+            raise QueryError(f"model must be one of {', '.join(MODELS)}")
+        if not 1 <= h <= MAX_HORIZON:
+            raise QueryError(f"h must be in 1..{MAX_HORIZON}")
+        hot = self._get(series)
+        v, dts, vals = self._vintage(hot, asof)
+        key = (series, v, len(vals), model, h, window)
+        hit = self._results.get(key)
+        if hit is not None:
+            return hit
+        if model == "bl0":
+            fc = forecast_last_batch(vals, h)[0]
+        else:
+            fc = drift_forecast_batch(vals, h, window=window)[0]
+        out = {
+            "series": series,
+            "model": model,
+            "vintage": v.isoformat(),
+            "origin": str(dts[-1]) if len(dts) else None,
+            "h": h,
+            "forecast": [_num(x) for x in fc],
+        }
+        self._results.put(key, out)
+        return out
+
+    def asof(self, series: str, when: date, tail: Optional[int] = None) -> Dict[str, Any]:
+        """The series as known on `when` (the last `tail` observations when given)."""
+        if tail is not None and tail < 1:
+            raise QueryError("tail must be >= 1")
+        v, dts, vals = self._vintage(self._get(series), when)
+        if tail is not None:
+            dts, vals = dts[-tail:], vals[-tail:]
+        return {
+            "series": series,
+            "vintage": v.isoformat(),
+            "dates": [str(d) for d in dts],
+            "values": [_num(x) for x in vals],
+        }
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "series": sid,
+                "latest_vintage": h.latest.isoformat(),
+                "vintages": len(h.vintages),
+                "observations": int(len(h.values)),
+            }
+            for sid, h in sorted(self._hot.items())
+        ]
+
+
+def _resident_triangle(sdir: Path, vintages: List[date]) -> Triangle:
+    """The compacted store read into memory when it is current, else parsed from CSVs."""
+    if has_store(sdir):
+        tri = load_triangle(sdir, mmap=False)
+        if len(tri.vintages) == len(vintages) and tri.vintages[-1] == np.datetime64(
+            vintages[-1], "D"
+        ):
+            return tri
+    return build_triangle(sdir, vintages)
+
+
+def _drop_blanks(dts: np.ndarray, vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    keep = ~np.isnan(vals)
+    return dts[keep], vals[keep]
+
+
+def _num(x: float) -> Optional[float]:
+    return None if np.isnan(x) else float(x)
+
+
+# ---------- HTTP ----------
+def _date(q: Dict[str, str], key: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(q[key]) if q.get(key) else None
+    except ValueError as e:
+        raise QueryError(f"{key} must be YYYY-MM-DD") from e
+
+
+def _int(q: Dict[str, str], key: str, default: Optional[int]) -> Optional[int]:
+    try:
+        return int(q[key]) if q.get(key) else default
+    except ValueError as e:
+        raise QueryError(f"{key} must be an integer") from e
+
+
+def handle(
+    service: ForecastService, metrics: Metrics, path: str, q: Dict[str, str]
+) -> Tuple[int, Any]:
+    """Route one request -> (status, JSON body or Prometheus text)."""
+    try:
+        if path == "/forecast":
+            if not q.get("series"):
+                raise QueryError("series is required")
+            return 200, service.forecast(
+                q["series"],
+                model=q.get("model", "bl0"),
+                h=_int(q, "h", 4),
+                window=_int(q, "window", 4),
+                asof=_date(q, "asof"),
+            )
+        if path == "/asof":
+            when = _date(q, "date")
+            if not q.get("series") or when is None:
+                raise QueryError("series and date are required")
+            return 200, service.asof(q["series"], when, tail=_int(q, "tail", None))
+        if path == "/series":
+            return 200, {"series": service.describe(), "reloads": service.reloads}
+        if path == "/health":
+            return 200, {"ok": True}
+        if path == "/metrics":
+            return 200, metrics.prometheus_text()
+        return 404, {"error": f"unknown path {path}"}
+    except QueryError as e:
+        return 400, {"error": str(e)}
+    except (LookupError, FileNotFoundError) as e:
+        return 404, {"error": str(e).strip("'\"")}
+
+
+def _handler(service: ForecastService, metrics: Metrics):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive: dashboards reuse one connection
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            t0 = time.perf_counter()
+            u = urlparse(self.path)
+            q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+            status, body = handle(service, metrics, u.path, q)
+            if isinstance(body, str):
+                payload, ctype = body.encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                payload, ctype = json.dumps(body).encode("utf-8"), "application/json"
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            metrics.observe_stage(f"server{u.path.replace('/', '_')}", time.perf_counter() - t0)
+
+        def address_string(self) -> str:  # Unix sockets have no (host, port)
+            return str(self.client_address or "unix")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return Handler
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ForecastServer:
+    """HTTP front end plus watcher thread; a context manager like `AlfredStandIn`."""
+
+    def __init__(
+        self,
+        service: ForecastService,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_socket: Optional[Path] = None,
+        watch_interval: float = DEFAULT_WATCH_INTERVAL,
+    ) -> None:
+        self.service = service
+        self.metrics = Metrics()
+        self.watch_interval = watch_interval
+        self.unix_socket = unix_socket
+        handler = _handler(service, self.metrics)
+        if unix_socket is not None:
+            if unix_socket.exists():
+                unix_socket.unlink()
+            self._httpd = _UnixHTTPServer(str(unix_socket), handler)
+        else:
+            self._httpd = ThreadingHTTPServer((host, port), handler)
+            self._httpd.daemon_threads = True
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        if self.unix_socket is not None:
+            return f"unix://{self.unix_socket}"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.watch_interval):
+            try:
+                for sid in self.service.refresh():
+                    print(f"[server] reloaded {sid}")
+            except Exception as exc:  # noqa: BLE001 (a half-written tree must not kill the server)
+                print(f"[server] reload failed: {exc}")
+
+    def start(self) -> "ForecastServer":
+        for target in (self._httpd.serve_forever, self._watch):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self.unix_socket is not None and self.unix_socket.exists():
+            os.unlink(self.unix_socket)
+
+    def __enter__(self) -> "ForecastServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Serve baseline forecasts and as-of queries from memory")
+    ap.add_argument("--registry", default="config/series.toml", help="Path to series.toml")
+    ap.add_argument("--include", default=None, help="Comma-separated logical or FRED ids")
+    ap.add_argument("--all", action="store_true", help="Include inactive series")
+    ap.add_argument("--base", default="data/raw/alfred", help="Base path to ALFRED raw data")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--unix", default=None, help="Listen on this Unix socket instead of TCP")
+    ap.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help="Seconds between checks for new vintages",
+    )
+    args = ap.parse_args(argv)
+
+    reg = select_series(
+        load_registry(args.registry),
+        include=[s for s in args.include.split(",") if s.strip()] if args.include else None,
+        active_only=not args.all,
+    )
+    service = ForecastService([cfg.fred_id for cfg in reg.values()], base=Path(args.base))
+    srv = ForecastServer(
+        service,
+        host=args.host,
+        port=args.port,
+        unix_socket=Path(args.unix) if args.unix else None,
+        watch_interval=args.watch_interval,
+    )
+    for row in service.describe():
+        print(f"[server] {row['series']}: vintage {row['latest_vintage']}")
+    print(f"[server] listening on {srv.url}")
+    srv.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.stop()
+    return 0
+
+
+__all__ = ["ForecastService", "ForecastServer", "HotSeries", "QueryError", "handle"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
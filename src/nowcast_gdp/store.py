@@ -0,0 +1,264 @@
+# src/nowcast_gdp/store.py
+"""
+Columnar real-time triangle store, one per series.
+
+Layout (next to the per-vintage CSVs):
+
+  data/raw/alfred/{series}/_store/
+      CURRENT                  # name of the live generation directory
+      gen-000001/
+          obs_dates.npy        # datetime64[D], shape (n_obs,), ascending
+          vintages.npy         # datetime64[D], shape (n_vint,), ascending
+          values.npy           # float64, shape (n_obs, n_vint), Fortran order
+
+`values[i, j]` is the value of observation `obs_dates[i]` as published in vintage
+`vintages[j]` (NaN when missing or not yet published). Fortran order keeps each
+vintage column contiguous, so loading one vintage from the memory map is a single
+sequential read. Every update writes a fresh generation and swaps CURRENT
+atomically; readers holding an older memory map are unaffected.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .delta import full_path, list_stored_vintages, read_vintage_rows
+from .io import read_date_value_arrays
+
+STORE_DIRNAME = "_store"
+_CURRENT = "CURRENT"
+
+
+@dataclass(frozen=True)
+class Triangle:
+    """Observation-date x vintage matrix for one series."""
+
+    obs_dates: np.ndarray  # datetime64[D], (n_obs,)
+    vintages: np.ndarray  # datetime64[D], (n_vint,)
+    values: np.ndarray  # float64, (n_obs, n_vint)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def column(self, vintage: date) -> np.ndarray:
+        """Values of one vintage (NaN where missing / unpublished)."""
+        j = int(np.searchsorted(self.vintages, np.datetime64(vintage, "D")))
+        if j >= len(self.vintages) or self.vintages[j] != np.datetime64(vintage, "D"):
+            raise KeyError(f"vintage {vintage} not in store")
+        return self.values[:, j]
+
+    def slice(
+        self,
+        obs_start: Optional[date] = None,
+        obs_end: Optional[date] = None,
+        vintage_start: Optional[date] = None,
+        vintage_end: Optional[date] = None,
+    ) -> "Triangle":
+        """Sub-triangle with inclusive date bounds (views, no copies)."""
+        i0, i1 = _bounds(self.obs_dates, obs_start, obs_end)
+        j0, j1 = _bounds(self.vintages, vintage_start, vintage_end)
+        return Triangle(
+            obs_dates=self.obs_dates[i0:i1],
+            vintages=self.vintages[j0:j1],
+            values=self.values[i0:i1, j0:j1],
+        )
+
+
+def _bounds(axis: np.ndarray, lo: Optional[date], hi: Optional[date]) -> Tuple[int, int]:
+    i0 = 0 if lo is None else int(np.searchsorted(axis, np.datetime64(lo, "D"), side="left"))
+    i1 = len(axis) if hi is None else int(np.searchsorted(axis, np.datetime64(hi, "D"), "right"))
+    return i0, i1
+
+
+# ---------- paths ----------
+def store_dir(series_dir: Path) -> Path:
+    return series_dir / STORE_DIRNAME
+
+
+def has_store(series_dir: Path) -> bool:
+    return (store_dir(series_dir) / _CURRENT).exists()
+
+
+def _current_gen(sdir: Path) -> Optional[Path]:
+    cur = sdir / _CURRENT
+    if not cur.exists():
+        return None
+    name = cur.read_text(encoding="utf-8").strip()
+    return sdir / name if name else None
+
+
+# ---------- CSV -> arrays ----------
+def read_vintage_csv_arrays(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a `date,value` vintage CSV into (datetime64[D], float64 with NaN for blanks)."""
+    return read_date_value_arrays(path)
+
+
+def rows_to_arrays(rows: List[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """`date,value` string rows (e.g. a rebuilt delta vintage) -> arrays."""
+    dts = [r["date"] for r in rows if r.get("date")]
+    vals = []
+    for r in rows:
+        if not r.get("date"):
+            continue
+        try:
+            vals.append(float(r["value"]) if r.get("value") else np.nan)
+        except ValueError:
+            vals.append(np.nan)
+    return np.array(dts, dtype="datetime64[D]"), np.array(vals, dtype=np.float64)
+
+
+def _read_columns(
+    series_dir: Path, vintages: Iterable[date]
+) -> List[Tuple[np.datetime64, np.ndarray, np.ndarray]]:
+    """Parse vintages (keyframe CSVs directly, deltas via reconstruction) into columns."""
+    cols = []
+    for v in sorted(set(vintages)):
+        fp = full_path(series_dir, v)
+        if fp.exists():
+            dts, vals = read_vintage_csv_arrays(fp)
+        else:
+            dts, vals = rows_to_arrays(read_vintage_rows(series_dir, v))
+        cols.append((np.datetime64(v, "D"), dts, vals))
+    return cols
+
+
+# ---------- build / update ----------
+def _merge(
+    base: Optional[Triangle], cols: List[Tuple[np.datetime64, np.ndarray, np.ndarray]]
+) -> Triangle:
+    """Merge parsed vintage columns into an (optional) existing triangle."""
+    obs_parts = [c[1] for c in cols]
+    vint_parts = [np.array([c[0] for c in cols], dtype="datetime64[D]")]
+    if base is not None:
+        obs_parts.append(base.obs_dates)
+        vint_parts.append(base.vintages)
+    obs_axis = np.unique(np.concatenate(obs_parts)) if obs_parts else np.array([], "datetime64[D]")
+    vint_axis = np.unique(np.concatenate(vint_parts))
+
+    values = np.full((len(obs_axis), len(vint_axis)), np.nan, dtype=np.float64, order="F")
+    if base is not None and base.values.size:
+        ri = np.searchsorted(obs_axis, base.obs_dates)
+        ci = np.searchsorted(vint_axis, base.vintages)
+        values[np.ix_(ri, ci)] = base.values
+    for v, dts, vals in cols:
+        j = int(np.searchsorted(vint_axis, v))
+        values[:, j] = np.nan  # a re-written vintage replaces its column
+        values[np.searchsorted(obs_axis, dts), j] = vals
+    return Triangle(obs_dates=obs_axis, vintages=vint_axis, values=values)
+
+
+def _write_generation(series_dir: Path, tri: Triangle) -> Path:
+    sdir = store_dir(series_dir)
+    sdir.mkdir(parents=True, exist_ok=True)
+    prev = _current_gen(sdir)
+    n = int(prev.name.split("-")[1]) + 1 if prev is not None else 1
+    gen = sdir / f"gen-{n:06d}"
+    if gen.exists():
+        shutil.rmtree(gen)
+    gen.mkdir()
+    np.save(gen / "obs_dates.npy", tri.obs_dates)
+    np.save(gen / "vintages.npy", tri.vintages)
+    np.save(gen / "values.npy", np.asfortranarray(tri.values))
+
+    tmp = sdir / f"{_CURRENT}.tmp"
+    tmp.write_text(gen.name + "\n", encoding="utf-8")
+    os.replace(tmp, sdir / _CURRENT)
+    for old in sdir.glob("gen-*"):
+        if old != gen:
+            shutil.rmtree(old, ignore_errors=True)
+    return gen
+
+
+def build_triangle(series_dir: Path, vintages: Optional[Iterable[date]] = None) -> Triangle:
+    """In-memory triangle from the vintage CSVs (all stored vintages by default); no store write."""
+    vs = list_stored_vintages(series_dir) if vintages is None else vintages
+    cols = _read_columns(series_dir, vs)
+    if not cols:
+        raise FileNotFoundError(f"No vintage CSVs under {series_dir}")
+    return _merge(None, cols)
+
+
+def compact_series(series_dir: Path) -> Triangle:
+    """Build (or rebuild) the store from every vintage CSV in `series_dir`."""
+    tri = build_triangle(series_dir)
+    _write_generation(series_dir, tri)
+    return tri
+
+
+def update_store(series_dir: Path, vintages: Iterable[date]) -> Triangle:
+    """Fold newly written vintage CSVs into an existing store (or build one)."""
+    existing = load_triangle(series_dir, mmap=False) if has_store(series_dir) else None
+    stored = set(list_stored_vintages(series_dir))
+    cols = _read_columns(series_dir, [v for v in vintages if v in stored])
+    if not cols:
+        if existing is None:
+            raise FileNotFoundError(f"No vintage CSVs under {series_dir}")
+        return existing
+    tri = _merge(existing, cols)
+    _write_generation(series_dir, tri)
+    return tri
+
+
+def load_triangle(series_dir: Path, mmap: bool = True) -> Triangle:
+    """Open the live generation; `values` is a read-only memory map when mmap=True."""
+    gen = _current_gen(store_dir(series_dir))
+    if gen is None:
+        raise FileNotFoundError(f"No columnar store under {series_dir}; run compaction first")
+    return Triangle(
+        obs_dates=np.load(gen / "obs_dates.npy"),
+        vintages=np.load(gen / "vintages.npy"),
+        values=np.load(gen / "values.npy", mmap_mode="r" if mmap else None),
+    )
+
+
+__all__ = [
+    "Triangle",
+    "build_triangle",
+    "compact_series",
+    "update_store",
+    "load_triangle",
+    "has_store",
+    "read_vintage_csv_arrays",
+    "rows_to_arrays",
+]
+
+
+# ---------- CLI ----------
+def main(argv: List[str] | None = None) -> int:
+    ap = ArgumentParser(description="Compact per-vintage CSVs into a columnar triangle store")
+    ap.add_argument("--series", help="Comma-separated series ids (default: every series dir)")
+    ap.add_argument(
+        "--base",
+        type=str,
+        default="data/raw/alfred",
+        help="Base path to ALFRED raw data",
+    )
+    args = ap.parse_args(argv)
+
+    root = Path(args.base).resolve()
+    if args.series:
+        dirs = [root / s.strip() for s in args.series.split(",") if s.strip()]
+    else:
+        dirs = (
+            sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("_"))
+            if root.exists()
+            else []
+        )
+    for d in dirs:
+        tri = compact_series(d)
+        n_obs, n_vint = tri.shape
+        print(f"[store] {d.name}: {n_obs} observations x {n_vint} vintages")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# tests/test_alfred_batched.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from nowcast_gdp import alfred
+from nowcast_gdp.ingest_alfred import index_path, persist_all_vintages, vintage_path
+
+V1, V2, V3 = date(2025, 5, 29), date(2025, 6, 26), date(2025, 7, 30)
+
+# realtime-period rows as ALFRED returns them for vintage_dates=V1,V2,V3
+ROWS = [
+    {
+        "realtime_start": "2025-05-29",
+        "realtime_end": "2025-06-25",
+        "date": "2025-01-01",
+        "value": "100.0",
+    },
+    {
+        "realtime_start": "2025-06-26",
+        "realtime_end": "9999-12-31",
+        "date": "2025-01-01",
+        "value": "101.0",
+    },
+    {
+        "realtime_start": "2025-05-29",
+        "realtime_end": "9999-12-31",
+        "date": "2024-10-01",
+        "value": "99.0",
+    },
+    {
+        "realtime_start": "2025-07-30",
+        "realtime_end": "9999-12-31",
+        "date": "2025-04-01",
+        "value": ".",
+    },
+]
+
+
+def _fake_get(calls):
+    def _get(path, **params):
+        calls.append(params)
+        off = params.get("offset", 0)
+        page = ROWS[off : off + 2]  # force pagination
+        return {"count": len(ROWS), "offset": off, "observations": page}
+
+    return _get
+
+
+def test_batched_fetch_splits_by_realtime_period(monkeypatch):
+    calls: list[dict] = []
+    monkeypatch.setattr(alfred, "_get", _fake_get(calls))
+
+    out = alfred.fetch_observations_for_vintages("GDP", [V3, V1, V2])
+    assert list(out) == [V1, V2, V3]
+    assert calls[0]["vintage_dates"] == "2025-05-29,2025-06-26,2025-07-30"
+    assert len(calls) == 2  # two pages
+
+    assert [(o.date.isoformat(), o.value) for o in out[V1]] == [
+        ("2024-10-01", 99.0),
+        ("2025-01-01", 100.0),
+    ]
+    assert [o.value for o in out[V2]] == [99.0, 101.0]
+    assert [o.value for o in out[V3]] == [99.0, 101.0, None]
+
+
+def test_batched_ingest_writes_per_vintage_files(monkeypatch, tmp_path: Path):
+    calls: list[dict] = []
+    monkeypatch.setattr(alfred, "_get", _fake_get(calls))
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: [V1, V2, V3])
+
+    written = persist_all_vintages("GDP", base=tmp_path, batch_size=2)
+    assert written == [vintage_path("GDP", v, base=tmp_path) for v in (V1, V2, V3)]
+    assert len({c["vintage_dates"] for c in calls}) == 2  # chunks [V1,V2] and [V3]
+
+    lines = vintage_path("GDP", V3, base=tmp_path).read_text().splitlines()
+    assert lines == ["date,value", "2024-10-01,99.000000", "2025-01-01,101.000000", "2025-04-01,"]
+    idx = index_path("GDP", base=tmp_path).read_text().split()
+    assert idx == [v.isoformat() for v in (V1, V2, V3)]
@@ -0,0 +1,70 @@
+# tests/test_asof.py
+from __future__ import annotations
+
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+import nowcast_gdp.dataio as dataio
+from nowcast_gdp.dataio import read_series_as_of, revision_path, vintage_as_of
+from nowcast_gdp.store import compact_series
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    sdir = tmp_path / "GDP"
+    _write(sdir / "index.csv", "2025-05-29\n2025-06-26\n2025-07-30\n")
+    _write(sdir / "2025-05-29.csv", "date,value\n2025-01-01,100\n")
+    _write(sdir / "2025-06-26.csv", "date,value\n2025-01-01,101\n2025-04-01,\n")
+    _write(sdir / "2025-07-30.csv", "date,value\n2025-01-01,101.5\n2025-04-01,105\n")
+    dataio.clear_vintage_cache()
+    return tmp_path
+
+
+def test_as_of_picks_last_vintage_on_or_before(root: Path):
+    assert vintage_as_of("GDP", date(2025, 6, 26), base=root) == date(2025, 6, 26)
+    assert vintage_as_of("GDP", date(2025, 7, 29), base=root) == date(2025, 6, 26)
+    assert vintage_as_of("GDP", date(2030, 1, 1), base=root) == date(2025, 7, 30)
+    with pytest.raises(LookupError):
+        vintage_as_of("GDP", date(2025, 5, 28), base=root)
+
+    dts, vals = read_series_as_of("GDP", date(2025, 7, 1), base=root)
+    assert dts == [date(2025, 1, 1)] and vals == [101.0]
+
+
+def test_index_parsed_once_until_it_changes(root: Path, monkeypatch):
+    calls = []
+    real = dataio._read_nonempty_lines
+    monkeypatch.setattr(dataio, "_read_nonempty_lines", lambda p: calls.append(p) or real(p))
+
+    for d in range(1, 29):
+        vintage_as_of("GDP", date(2025, 7, d), base=root)
+    assert len(calls) == 1
+
+    idx = root / "GDP" / "index.csv"
+    _write(idx, idx.read_text() + "2025-08-28\n")
+    st = idx.stat()
+    os.utime(idx, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert vintage_as_of("GDP", date(2025, 9, 1), base=root) == date(2025, 8, 28)
+    assert len(calls) == 2
+
+
+def test_revision_path_with_and_without_store(root: Path):
+    expected = ([date(2025, 5, 29), date(2025, 6, 26), date(2025, 7, 30)], [100.0, 101.0, 101.5])
+    assert revision_path("GDP", date(2025, 1, 1), base=root) == expected
+    # blank in 2025-06-26 reported as None from CSVs
+    assert revision_path("GDP", date(2025, 4, 1), base=root) == (
+        [date(2025, 6, 26), date(2025, 7, 30)],
+        [None, 105.0],
+    )
+
+    compact_series(root / "GDP")
+    assert revision_path("GDP", date(2025, 1, 1), base=root) == expected
+    assert revision_path("GDP", date(1990, 1, 1), base=root) == ([], [])
@@ -0,0 +1,78 @@
+# tests/test_backtest.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.backtest import main, run_backtest, score_backtest
+from nowcast_gdp.store import compact_series
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _tree(root: Path) -> Path:
+    sdir = root / "GDP"
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n2025-07-30\n")
+    _write(sdir / "2025-01-30.csv", "date,value\n2024-07-01,100\n2024-10-01,102\n")
+    _write(sdir / "2025-04-30.csv", "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,104\n")
+    _write(
+        sdir / "2025-07-30.csv",
+        "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,105\n2025-04-01,107\n",
+    )
+    return sdir
+
+
+def test_real_time_forecasts_and_actuals(tmp_path: Path):
+    _tree(tmp_path)
+    df = run_backtest(["GDP"], models=["bl0"], h=2, base=tmp_path)
+    first = df[df["vintage"] == np.datetime64("2025-01-30")].reset_index(drop=True)
+    assert first["origin"].tolist() == [np.datetime64("2024-10-01")] * 2
+    assert first["target_date"].tolist() == [
+        np.datetime64("2025-01-01"),
+        np.datetime64("2025-04-01"),
+    ]
+    assert first["forecast"].tolist() == [102.0, 102.0]  # only the data known then
+    assert first["first_release"].tolist() == [104.0, 107.0]
+    assert first["latest_release"].tolist() == [105.0, 107.0]
+
+    # last vintage: targets beyond the grid are extrapolated quarterly, actuals unknown
+    last = df[df["vintage"] == np.datetime64("2025-07-30")]
+    assert last["target_date"].tolist() == [
+        np.datetime64("2025-07-01"),
+        np.datetime64("2025-10-01"),
+    ]
+    assert last["first_release"].isna().all()
+
+
+def test_scores_and_process_pool_match_serial(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    serial = run_backtest(["GDP"], h=2, base=tmp_path)
+    compact_series(sdir)
+    pooled = run_backtest(["GDP"], h=2, base=tmp_path, workers=2)
+    assert serial.equals(pooled)
+
+    scores = score_backtest(serial)
+    row = scores[
+        (scores["model"] == "bl0") & (scores["horizon"] == 1) & (scores["benchmark"] == "first")
+    ].iloc[0]
+    # errors vs first release at h=1: 102-104, 104-107 -> rmse sqrt(6.5), mae 2.5
+    assert row["n"] == 2
+    assert row["rmse"] == pytest.approx(np.sqrt(6.5))
+    assert row["mae"] == pytest.approx(2.5)
+
+
+def test_cli_writes_tables(tmp_path: Path, capsys):
+    _tree(tmp_path)
+    out, sc = tmp_path / "bt.csv", tmp_path / "scores.csv"
+    rc = main(
+        ["--series", "GDP", "--h", "1", "--base", str(tmp_path), "--out", str(out)]
+        + ["--scores-out", str(sc), "--start", str(date(2025, 4, 1))]
+    )
+    assert rc == 0 and out.exists() and sc.exists()
+    assert "[backtest] 4 forecasts" in capsys.readouterr().out
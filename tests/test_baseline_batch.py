@@ -0,0 +1,64 @@
+# tests/test_baseline_batch.py
+import math
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.baselines.batch import (
+    drift_forecast_batch,
+    forecast_last_batch,
+    last_valid_index,
+)
+from nowcast_gdp.baselines.bl0 import forecast_last
+from nowcast_gdp.baselines.bl1 import drift_forecast
+
+
+def _random_panel(n=200, t=12, seed=0):
+    rng = np.random.default_rng(seed)
+    y = 100 + rng.normal(size=(n, t)).cumsum(axis=1)
+    y[rng.random((n, t)) < 0.3] = np.nan
+    y[0] = np.nan  # no observations
+    y[1, :-1] = np.nan  # one observation
+    y[1, -1] = 100.0
+    y[2, 1:] = np.nan
+    y[2, 0] = 99.0
+    return y
+
+
+def _row_list(row):
+    return [None if math.isnan(v) else float(v) for v in row]
+
+
+@pytest.mark.parametrize("window", [-1, 0, 1, 2, 4, 50])
+def test_drift_batch_matches_scalar(window):
+    y = _random_panel()
+    out = drift_forecast_batch(y, h=3, window=window)
+    assert out.shape == (len(y), 3)
+    for row, got in zip(y, out):
+        want = drift_forecast(_row_list(row), h=3, window=window)
+        np.testing.assert_allclose(got, want, rtol=1e-12, equal_nan=True)
+
+
+def test_drift_batch_per_row_windows_and_1d_input():
+    y = _random_panel(n=5)
+    windows = np.array([1, 2, 3, 0, 4])
+    out = drift_forecast_batch(y, h=2, window=windows)
+    for row, w, got in zip(y, windows, out):
+        np.testing.assert_allclose(got, drift_forecast(_row_list(row), 2, int(w)), equal_nan=True)
+    assert drift_forecast_batch([100.0, 102.0, 103.0, 108.0], h=3, window=2).tolist() == [
+        [111.0, 114.0, 117.0]
+    ]
+
+
+def test_carry_forward_batch_matches_scalar():
+    y = _random_panel()
+    out = forecast_last_batch(y, h=2)
+    assert np.isnan(out[0]).all()  # scalar raises on empty input; batch yields NaN
+    for row, got in zip(y[1:], out[1:]):
+        if np.isnan(row).all():
+            assert np.isnan(got).all()
+            continue
+        assert got.tolist() == forecast_last(row[~np.isnan(row)].tolist(), 2)
+    assert last_valid_index(y)[:3].tolist() == [-1, 11, 0]
+    with pytest.raises(ValueError):
+        forecast_last_batch(y, h=0)
@@ -0,0 +1,30 @@
+# tests/test_bench_suite.py
+import importlib.util
+import sys
+from pathlib import Path
+
+SUITE = Path(__file__).resolve().parents[1] / "benchmarks" / "suite.py"
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("bench_suite", SUITE)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod  # dataclasses look their module up while building
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_suite_runs_tiny_scale(tmp_path: Path):
+    suite = _load()
+    res = suite.run_suite(["tiny"], repeat=1, workdir=tmp_path)
+    assert "tiny/read_latest_cold" in res["results"]
+    assert "tiny/backtest_cache_warm" in res["results"]
+    assert all(r["min_s"] >= 0 for r in res["results"].values())
+
+
+def test_compare_flags_only_real_regressions():
+    suite = _load()
+    base = {"results": {"a": {"min_s": 0.010}, "b": {"min_s": 0.0001}, "c": {"min_s": 0.010}}}
+    cur = {"results": {"a": {"min_s": 0.030}, "b": {"min_s": 0.0005}, "c": {"min_s": 0.011}}}
+    bad = suite.compare(cur, base, threshold=0.25, min_delta=0.002)
+    assert len(bad) == 1 and bad[0].startswith("a:")  # b is below the noise floor
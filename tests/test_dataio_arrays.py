@@ -0,0 +1,51 @@
+# tests/test_dataio_arrays.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.dataio import (
+    clear_cache,
+    read_latest_series,
+    read_latest_series_arrays,
+    read_latest_series_df,
+)
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    clear_cache()
+    _write(tmp_path / "DGS10" / "index.csv", "2025-08-01\n")
+    _write(
+        tmp_path / "DGS10" / "2025-08-01.csv",
+        "date,value\n2025-07-28,4.41\n2025-07-29,\n2025-07-30,bad\n2025-07-31,4.37\n",
+    )
+    return tmp_path
+
+
+def test_arrays_keep_nan_and_are_cached_read_only(root: Path):
+    dts, vals = read_latest_series_arrays("DGS10", base=root)
+    assert dts.dtype == np.dtype("datetime64[D]") and vals.dtype == np.float64
+    assert dts[0] == np.datetime64("2025-07-28")
+    np.testing.assert_array_equal(vals, [4.41, np.nan, np.nan, 4.37])
+    assert not vals.flags.writeable
+    dts2, vals2 = read_latest_series_arrays("DGS10", base=root)
+    assert vals2 is vals  # served from the cache, no copy
+
+
+def test_list_and_df_readers_agree_with_arrays(root: Path):
+    dts, vals = read_latest_series("DGS10", base=root)
+    assert [d.isoformat() for d in dts] == ["2025-07-28", "2025-07-31"]
+    assert vals == [4.41, 4.37]
+
+    df = read_latest_series_df("DGS10", base=root)
+    assert df.index.name == "date"
+    assert df["value"].tolist() == vals
+    assert [d.date() for d in df.index] == dts
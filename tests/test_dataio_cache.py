@@ -0,0 +1,62 @@
+# tests/test_dataio_cache.py
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import nowcast_gdp.dataio as dataio
+from nowcast_gdp.cache import LRUCache
+from nowcast_gdp.dataio import cache_stats, clear_cache, configure_cache, read_latest_series
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def test_lru_limits_and_stats():
+    c = LRUCache(max_entries=2, max_bytes=100, sizeof=len)
+    c.put("a", "x" * 10)
+    c.put("b", "x" * 10)
+    assert c.get("a") == "x" * 10  # a is now most recent
+    c.put("c", "x" * 10)  # evicts b (entry limit)
+    assert c.get("b") is None
+    c.put("d", "x" * 95)  # evicts down to the byte limit
+    st = c.stats()
+    assert st.bytes <= 100 and st.entries == 1
+    assert st.evictions == 3
+    c.put("huge", "x" * 101)
+    assert c.get("huge") is None
+    assert st.hits == 1 and st.misses == 1
+
+
+def test_read_cache_hits_and_invalidates_on_ingest(tmp_path: Path, monkeypatch):
+    clear_cache()
+    sdir = tmp_path / "GDP"
+    _write(sdir / "index.csv", "2025-07-30\n")
+    csv_path = sdir / "2025-07-30.csv"
+    _write(csv_path, "date,value\n2025-01-01,100\n")
+
+    parses = []
+    real = dataio.read_date_value_arrays
+    monkeypatch.setattr(dataio, "read_date_value_arrays", lambda p: parses.append(p) or real(p))
+
+    for _ in range(50):
+        dts, vals = read_latest_series("GDP", base=tmp_path)
+        vals.append(-1.0)  # caller mutation must not leak into the cache
+    assert vals[:-1] == [100.0]
+    assert len(parses) == 1
+    st = cache_stats()
+    assert (st.hits, st.misses, st.entries) == (49, 1, 1)
+
+    # a rewritten vintage changes mtime/size -> new key
+    _write(csv_path, "date,value\n2025-01-01,100\n2025-04-01,101\n")
+    os.utime(csv_path, ns=(0, csv_path.stat().st_mtime_ns + 1_000_000))
+    assert read_latest_series("GDP", base=tmp_path)[1] == [100.0, 101.0]
+    assert len(parses) == 2
+
+    configure_cache(max_entries=0)
+    assert cache_stats().entries == 0
+    configure_cache(max_entries=256)
+    clear_cache()
+    assert cache_stats().hits == 0
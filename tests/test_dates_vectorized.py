@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.dates import (
+    calendar_table,
+    quarter_end,
+    quarter_end_array,
+    quarter_index_array,
+    quarter_start,
+    quarter_start_array,
+    week_ending,
+    week_ending_array,
+)
+
+
+def _days(start: date, n: int):
+    return [start + timedelta(days=i) for i in range(n)]
+
+
+def test_array_helpers_match_scalar():
+    ds = _days(date(1959, 12, 20), 800) + _days(date(2099, 12, 1), 40)
+    arr = np.array(ds, dtype="datetime64[D]")
+    assert week_ending_array(arr).tolist() == [week_ending(d) for d in ds]
+    assert quarter_start_array(arr).tolist() == [quarter_start(d) for d in ds]
+    assert quarter_end_array(arr).tolist() == [quarter_end(d) for d in ds]
+
+
+def test_nat_passthrough_and_quarter_index():
+    arr = np.array(["2025-08-11", "NaT", "1969-12-31"], dtype="datetime64[D]")
+    assert np.isnat(week_ending_array(arr)[1]) and np.isnat(quarter_end_array(arr)[1])
+    assert quarter_start_array(arr)[2] == np.datetime64("1969-10-01")
+    assert quarter_index_array(arr[[0, 2]]).tolist() == [222, -1]
+
+
+def test_calendar_table_gather():
+    tab = calendar_table()
+    assert calendar_table() is tab  # cached
+    arr = np.array(_days(date(2024, 12, 25), 20), dtype="datetime64[D]")
+    assert tab.lookup(arr, "week_ending").tolist() == week_ending_array(arr).tolist()
+    assert tab.lookup(arr, "quarter_end").tolist() == quarter_end_array(arr).tolist()
+    assert tab.lookup(arr, "quarter").tolist() == quarter_index_array(arr).tolist()
+    with pytest.raises(ValueError):
+        tab.offsets(np.array(["1800-01-01"], dtype="datetime64[D]"))
@@ -0,0 +1,73 @@
+# tests/test_delta.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+from nowcast_gdp.dataio import latest_vintage, read_latest_series
+from nowcast_gdp.delta import (
+    apply_delta,
+    chain_length,
+    clear_state_cache,
+    encode_delta,
+    read_vintage_rows,
+)
+from nowcast_gdp.ingest_alfred import persist_all_vintages, series_dir
+from nowcast_gdp.store import compact_series
+
+
+class FakeObs:
+    def __init__(self, d, v):
+        self.date = d
+        self.value = v
+
+
+def _history(n_vintage: int) -> list[FakeObs]:
+    # 40 quarters of history; each vintage appends one quarter and revises the last two
+    obs = []
+    for q in range(40 + n_vintage):
+        d = date(1990 + q // 4, 1 + 3 * (q % 4), 1)
+        rev = 0.5 if q >= 40 + n_vintage - 2 else 0.0
+        obs.append(FakeObs(d, 100.0 + q + rev * n_vintage))
+    obs[5].value = None  # a blank that must survive round trips
+    return obs
+
+
+def test_encode_apply_roundtrip_with_deletion():
+    prev = [{"date": "2024-01-01", "value": "1"}, {"date": "2024-04-01", "value": "2"}]
+    new = [{"date": "2024-04-01", "value": "2.5"}, {"date": "2024-07-01", "value": ""}]
+    d = encode_delta(prev, new)
+    assert {r["date"] for r in d} == {"2024-01-01", "2024-04-01", "2024-07-01"}
+    assert apply_delta(prev, d) == new
+
+
+def test_delta_ingest_reconstructs_every_vintage(monkeypatch, tmp_path: Path):
+    vdates = [date(2024, 1, 1) + timedelta(days=30 * i) for i in range(10)]
+    by_v = {v: _history(i) for i, v in enumerate(vdates)}
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: vdates)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.fetch_observations_for_vintage", lambda sid, v: by_v[v]
+    )
+
+    persist_all_vintages("GDP", base=tmp_path, storage="delta", keyframe_every=4)
+    sdir = series_dir("GDP", base=tmp_path)
+    keyframes = sorted(p.name for p in sdir.glob("????-??-??.csv"))
+    deltas = sorted(sdir.glob("*.delta.csv"))
+    assert keyframes == [f"{vdates[i].isoformat()}.csv" for i in (0, 4, 8)]
+    assert len(deltas) == 7
+    assert max(chain_length(sdir, v) for v in vdates) == 3
+
+    clear_state_cache()  # force reconstruction from disk
+    for v, obs in by_v.items():
+        rows = read_vintage_rows(sdir, v)
+        assert [r["value"] for r in rows] == [
+            "" if o.value is None else f"{o.value:.6f}" for o in obs
+        ]
+
+    assert latest_vintage("GDP", base=tmp_path) == vdates[-1]
+    dts, vals = read_latest_series("GDP", base=tmp_path)
+    assert len(vals) == len(by_v[vdates[-1]]) - 1  # blank skipped
+    assert vals[-1] == by_v[vdates[-1]][-1].value
+
+    tri = compact_series(sdir)
+    assert tri.shape == (49, 10)
@@ -0,0 +1,161 @@
+# tests/test_dfm.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.dataio import clear_cache
+from nowcast_gdp.dfm import (
+    MAX_ROOT,
+    DynamicFactorModel,
+    _estimate,
+    _mm_aggregate,
+    kalman_filter,
+    smooth_states,
+)
+
+T = 180  # months from 2000-01
+
+
+def _panel(seed: int = 0, n: int = 6):
+    rng = np.random.default_rng(seed)
+    f = np.zeros(T)
+    for t in range(1, T):
+        f[t] = 0.7 * f[t - 1] + rng.normal()
+    months = np.arange(np.datetime64("2000-01"), np.datetime64("2000-01") + T)
+    ind = {}
+    for i in range(n):
+        g = 0.5 * f * (1 + i / n) + rng.normal(scale=0.5, size=T)
+        ind[f"X{i}"] = (months.astype("datetime64[D]"), 100 * np.exp(np.cumsum(g) / 100))
+    q = np.arange(0, T, 3)
+    mm = np.convolve(f, [1, 2, 3, 2, 1])[:T]
+    gq = 0.3 * mm[q + 2] + rng.normal(scale=0.3, size=len(q))
+    gdp = ("GDP", months[q].astype("datetime64[D]"), 1000 * np.exp(np.cumsum(gq) / 100))
+    return ind, gdp
+
+
+def _fit(ind, gdp, cut: int = 2):
+    """Indicators without their last `cut` months, GDP without its last quarter."""
+    name, qd, qv = gdp
+    return DynamicFactorModel.fit(
+        {k: (d[:-cut], v[:-cut]) for k, (d, v) in ind.items()}, (name, qd[:-1], qv[:-1])
+    )
+
+
+def _refiltered(m: DynamicFactorModel) -> DynamicFactorModel:
+    return DynamicFactorModel(m.columns, m.m0, m.Y.copy(), m.ss, m.factors)
+
+
+def test_fit_and_nowcast():
+    ind, gdp = _panel()
+    m = _fit(ind, gdp)
+    assert m.names[-1] == "GDP"
+    assert m.current_quarter() == date(2014, 10, 1)
+    x = m.nowcast()
+    assert np.isfinite(x)
+    # in-sample: the nowcast of a published quarter tracks its actual growth
+    actual = 100 * np.diff(np.log(gdp[2][:-1]))
+    fitted = np.array([m.nowcast(d.item()) for d in gdp[1][1:-1]])
+    assert np.corrcoef(actual, fitted)[0, 1] > 0.9
+
+
+def test_update_matches_full_refilter_and_news_adds_up():
+    ind, gdp = _panel()
+    m = _fit(ind, gdp)
+    before = m.nowcast()
+    rep = m.update("X0", *ind["X0"])
+    assert rep.quarter == date(2014, 10, 1)
+    assert rep.old == pytest.approx(before)
+    assert rep.revised == pytest.approx(rep.old)  # nothing published was revised
+    assert [i.month for i in rep.items] == [date(2014, 11, 1), date(2014, 12, 1)]
+    assert rep.new == pytest.approx(rep.revised + rep.news_effect, abs=1e-9)
+    assert rep.new == pytest.approx(m.nowcast(), abs=1e-9)
+    assert m.nowcast() == pytest.approx(_refiltered(m).nowcast(), abs=1e-9)
+    for it in rep.items:
+        assert it.impact == pytest.approx(it.weight * it.news)
+
+
+def test_update_revision_only_and_no_change():
+    ind, gdp = _panel()
+    m = _fit(ind, gdp)
+    d, v = ind["X1"]
+    d, v = d[:-2], v[:-2].copy()
+    assert m.update("X1", d, v).new == pytest.approx(m.nowcast())  # same data
+
+    v[-3:] *= 1.01  # revise three published months
+    rep = m.update("X1", d, v)
+    assert rep.items == []
+    assert rep.revision_effect != 0
+    assert rep.new == pytest.approx(rep.revised)
+    assert m.nowcast() == pytest.approx(_refiltered(m).nowcast(), abs=1e-9)
+
+
+def test_target_release_and_later_quarter():
+    ind, gdp = _panel()
+    m = _fit(ind, gdp, cut=1)
+    name, qd, qv = gdp
+    rep = m.update(name, qd, qv, quarter=date(2014, 10, 1))
+    assert [i.month for i in rep.items] == [date(2014, 12, 1)]
+    # the released quarter is now (almost) pinned to its actual value
+    assert rep.new == pytest.approx(100 * np.log(qv[-1] / qv[-2]), abs=0.5)
+    assert np.isfinite(m.nowcast(date(2015, 4, 1)))  # grid grows on demand
+
+
+def test_filter_versions_share_covariances():
+    ind, gdp = _panel()
+    m = _fit(ind, gdp)
+    Y = np.nan_to_num(m.Y)[None]
+    mask = ~np.isnan(m.Y)
+    a0 = m.ss.a0[:, None]
+    one = kalman_filter(m.ss, Y, mask, a0, m.ss.P0)
+    two = kalman_filter(m.ss, np.concatenate([Y, 2 * Y]), mask, np.hstack([a0, a0]), m.ss.P0)
+    np.testing.assert_allclose(two[2][..., 0], one[2][..., 0])
+    np.testing.assert_allclose(two[2][..., 1], 2 * one[2][..., 0], atol=1e-9)  # linear
+    s = smooth_states(m.ss.A, *one)
+    assert s.shape == one[2].shape
+
+
+def _write_series(root: Path, sid: str, vintage: str, dates, values) -> None:
+    sdir = root / sid
+    sdir.mkdir(parents=True, exist_ok=True)
+    (sdir / "index.csv").write_text(vintage + "\n", encoding="utf-8")
+    lines = [f"{np.datetime_as_string(d)},{v:.6f}" for d, v in zip(dates, values)]
+    (sdir / f"{vintage}.csv").write_text("date,value\n" + "\n".join(lines) + "\n", "utf-8")
+
+
+def test_from_store(tmp_path: Path):
+    clear_cache()
+    ind, gdp = _panel()
+    for k, (d, v) in ind.items():
+        _write_series(tmp_path, k, "2015-01-15", d, v)
+    _write_series(tmp_path, "GDP", "2015-01-15", gdp[1][:-1], gdp[2][:-1])
+    m = DynamicFactorModel.from_store("GDP", list(ind), base=tmp_path)
+    assert m.current_quarter() == date(2014, 10, 1)
+    assert np.isfinite(m.nowcast())
+    with pytest.raises(ValueError):
+        DynamicFactorModel.from_store("GDP", ["X0"], base=tmp_path, factors=2)
+
+
+def test_mm_aggregate_propagates_missing_months():
+    F = np.arange(1.0, 9.0)[:, None]
+    F[5] = np.nan
+    G = _mm_aggregate(F)[:, 0]
+    assert np.isnan(G[:4]).all()
+    assert G[4] == pytest.approx(1 + 2 * 2 + 3 * 3 + 2 * 4 + 5)
+    assert np.isnan(G[5:]).all()  # month 5 is in every later window
+
+
+def test_explosive_factor_is_made_stationary():
+    rng = np.random.default_rng(2)
+    f = np.zeros(T)
+    for t in range(1, T):
+        f[t] = 1.03 * f[t - 1] + rng.normal()
+    Y = np.column_stack([f * (1 + i) + rng.normal(scale=0.1, size=T) for i in range(4)] + [f])
+    Y[np.arange(T) % 3 != 2, -1] = np.nan
+    ss = _estimate(Y, 1)
+    assert np.max(np.abs(np.linalg.eigvals(ss.A))) <= MAX_ROOT + 1e-12
+    assert np.isfinite(ss.P0).all()
+    np.testing.assert_allclose(ss.A @ ss.P0 @ ss.A.T + ss.Q, ss.P0, atol=1e-8)
@@ -0,0 +1,64 @@
+# tests/test_fakealfred.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nowcast_gdp import alfred
+from nowcast_gdp.dataio import list_vintages, read_vintage_series
+from nowcast_gdp.fakealfred import AlfredStandIn, FaultConfig, load_tree, synthetic_series
+from nowcast_gdp.ingest_alfred import persist_all_vintages
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("FRED_API_KEY", "test")
+    monkeypatch.setattr(alfred, "RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(alfred, "_BUCKET", alfred.TokenBucket(rate=1e6, capacity=1e3))
+    alfred.reset_request_stats()
+
+    def _point(srv: AlfredStandIn) -> AlfredStandIn:
+        monkeypatch.setattr(alfred, "BASE_URL", srv.url)
+        return srv
+
+    return _point
+
+
+def _expected(fixture, sid, v):
+    rows = [(d, val) for d, val in fixture[sid][v] if val]
+    return [d for d, _ in rows], [float(val) for _, val in rows]
+
+
+def test_ingest_against_stand_in_matches_fixture(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=12, n_obs=30)}
+    with client(AlfredStandIn(fixture)) as srv:
+        full = persist_all_vintages("GDP", base=tmp_path / "a", concurrency=4)
+        batched = persist_all_vintages("GDP", base=tmp_path / "b", batch_size=5)
+    assert len(full) == len(batched) == 12
+    assert srv.stats.by_endpoint["series/observations"] == 12 + 3
+
+    for v in sorted(fixture["GDP"]):
+        for root in ("a", "b"):
+            dts, vals = read_vintage_series("GDP", v, base=tmp_path / root)
+            want_d, want_v = _expected(fixture, "GDP", v)
+            assert [d.isoformat() for d in dts] == want_d
+            assert vals == pytest.approx(want_v)
+
+    # a recorded tree serves back exactly what was ingested
+    assert load_tree(tmp_path / "a") == {"GDP": fixture["GDP"]}
+
+
+def test_faults_are_retried(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=6, n_obs=20)}
+    faults = FaultConfig(rate_limit=25.0, burst=2, retry_after=1, error_rate=0.3, seed=1)
+    # client bursts past the server's limit once, then paces itself under it
+    alfred.set_rate_limit(requests_per_minute=20 * 60, burst=4)
+    with client(AlfredStandIn(fixture, faults)) as srv:
+        written = persist_all_vintages("GDP", base=tmp_path, concurrency=4)
+    assert len(written) == 6 and len(list_vintages("GDP", base=tmp_path)) == 6
+    st = alfred.request_stats()
+    assert st.retries > 0 and st.failures == 0
+    assert st.throttled == srv.stats.by_status[429] > 0
+    assert st.requests == sum(srv.stats.by_status.values())
+    assert srv.stats.by_status[503] == st.server_errors
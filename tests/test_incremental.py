@@ -0,0 +1,152 @@
+# tests/test_incremental.py
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from nowcast_gdp import alfred
+from nowcast_gdp import ingest_alfred as ia
+from nowcast_gdp.dataio import latest_vintage, list_vintages
+from nowcast_gdp.fakealfred import AlfredStandIn, synthetic_series
+from nowcast_gdp.io import IndexBuffer
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("FRED_API_KEY", "test")
+    monkeypatch.setattr(alfred, "RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(alfred, "_BUCKET", alfred.TokenBucket(rate=1e6, capacity=1e3))
+
+    def _point(srv: AlfredStandIn) -> AlfredStandIn:
+        monkeypatch.setattr(alfred, "BASE_URL", srv.url)
+        return srv
+
+    return _point
+
+
+def test_second_run_only_lists_new_vintages(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=8, n_obs=20)}
+    vs = sorted(fixture["GDP"])
+    with client(AlfredStandIn(fixture)) as srv:
+        assert len(ia.persist_all_vintages("GDP", base=tmp_path, incremental=True)) == 8
+
+        srv.stats.by_endpoint.clear()
+        assert ia.persist_all_vintages("GDP", base=tmp_path, incremental=True) == []
+        assert srv.stats.by_endpoint == {"series/vintagedates": 1}
+
+        # a new vintage shows up upstream -> only that one is fetched
+        nxt = vs[-1].replace(year=vs[-1].year + 1)
+        fixture["GDP"][nxt] = fixture["GDP"][vs[-1]][:-1]
+        srv.stats.by_endpoint.clear()
+        written = ia.persist_all_vintages("GDP", base=tmp_path, incremental=True)
+    assert [p.name.split(".")[0] for p in written] == [nxt.isoformat()]
+    assert srv.stats.by_endpoint == {"series/vintagedates": 1, "series/observations": 1}
+    assert list_vintages("GDP", base=tmp_path)[-1] == nxt
+
+
+def test_listing_cache_skips_the_request(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=4, n_obs=12)}
+    with client(AlfredStandIn(fixture)) as srv:
+        ia.persist_all_vintages("GDP", base=tmp_path, incremental=True, listing_ttl=60)
+        srv.stats.by_endpoint.clear()
+        assert ia.persist_all_vintages("GDP", base=tmp_path, incremental=True, listing_ttl=60) == []
+        assert sum(srv.stats.by_endpoint.values()) == 0
+        # an expired listing is fetched again
+        assert (
+            ia.persist_all_vintages("GDP", base=tmp_path, incremental=True, listing_ttl=1e-9) == []
+        )
+        assert srv.stats.by_endpoint == {"series/vintagedates": 1}
+    assert ia.listing_cache_path("GDP", tmp_path).exists()
+
+
+def test_full_listing_when_nothing_stored(monkeypatch, tmp_path: Path):
+    calls = []
+    monkeypatch.setattr(ia, "list_vintage_dates", lambda sid: calls.append(sid) or [])
+    assert ia.persist_all_vintages("GDP", base=tmp_path, incremental=True) == []
+    assert calls == ["GDP"]
+    assert not (tmp_path / "_journal").exists()
+
+
+def test_widened_start_backfills_older_vintages(client, tmp_path: Path, capsys):
+    fixture = {"GDP": synthetic_series(n_vintages=6, n_obs=12)}
+    vs = sorted(fixture["GDP"])
+    with client(AlfredStandIn(fixture)):
+        assert (
+            len(ia.persist_all_vintages("GDP", start=vs[3], base=tmp_path, incremental=True)) == 3
+        )
+        # same window again: nothing to do
+        assert ia.persist_all_vintages("GDP", start=vs[3], base=tmp_path, incremental=True) == []
+        # vintage_start widened: the older vintages are listed and fetched
+        written = ia.persist_all_vintages("GDP", start=vs[1], base=tmp_path, incremental=True)
+    assert [p.name.split(".")[0] for p in written] == [v.isoformat() for v in vs[1:3]]
+    assert "listing all" in capsys.readouterr().out
+    assert ia.history_covers("GDP", vs[1], tmp_path)
+    assert not ia.history_covers("GDP", vs[0], tmp_path)
+
+
+def test_leaving_latest_only_backfills(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=5, n_obs=12)}
+    with client(AlfredStandIn(fixture)):
+        assert len(ia.persist_all_vintages("GDP", latest_only=True, base=tmp_path)) == 1
+        assert not ia.history_covers("GDP", None, tmp_path)
+        written = ia.persist_all_vintages("GDP", base=tmp_path, incremental=True)
+    assert len(written) == 4
+    assert len(list_vintages("GDP", base=tmp_path)) == 5
+    assert ia.history_covers("GDP", None, tmp_path)
+
+
+def test_kill_before_index_flush_is_indexed_on_rerun(client, monkeypatch, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=4, n_obs=12)}
+    vs = sorted(fixture["GDP"])
+    with client(AlfredStandIn(fixture)):
+        ia.persist_all_vintages("GDP", start=vs[0], base=tmp_path)
+        nxt = [v.replace(year=v.year + 10) for v in vs[-2:]]
+        for v in nxt:
+            fixture["GDP"][v] = fixture["GDP"][vs[-1]]
+
+        def killed(self):  # the process dies before the buffered index commit
+            raise KeyboardInterrupt
+
+        with monkeypatch.context() as m:
+            m.setattr(IndexBuffer, "flush", killed)
+            with pytest.raises(KeyboardInterrupt):
+                ia.persist_all_vintages("GDP", start=vs[0], base=tmp_path, incremental=True)
+        assert all(ia.vintage_path("GDP", v, tmp_path).exists() for v in nxt)
+        assert latest_vintage("GDP", base=tmp_path) == vs[-1]
+
+        assert ia.persist_all_vintages("GDP", start=vs[0], base=tmp_path, incremental=True) == []
+    assert list_vintages("GDP", base=tmp_path)[-2:] == nxt
+    assert latest_vintage("GDP", base=tmp_path) == nxt[-1]
+
+
+def test_failed_older_vintage_is_retried_incrementally(client, monkeypatch, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=3, n_obs=12)}
+    vs = sorted(fixture["GDP"])
+    with client(AlfredStandIn(fixture)):
+        ia.persist_all_vintages("GDP", base=tmp_path, incremental=True)
+        new = [v.replace(year=v.year + 10) for v in vs]
+        for v in new:
+            fixture["GDP"][v] = fixture["GDP"][vs[-1]]
+
+        real = ia.iter_vintage_blocks
+        started = threading.Barrier(len(new), timeout=10)
+
+        def flaky(sid, v):
+            started.wait()  # all three in flight before the oldest one fails
+            if v == new[0]:
+                raise RuntimeError("FRED request failed")
+            return real(sid, v)
+
+        with monkeypatch.context() as m:
+            m.setattr(ia, "iter_vintage_blocks", flaky)
+            with pytest.raises(RuntimeError):
+                ia.persist_all_vintages("GDP", base=tmp_path, incremental=True, concurrency=3)
+        assert list_vintages("GDP", base=tmp_path)[-1] == new[-1]  # the index tail moved on
+        assert ia.ingested_through("GDP", tmp_path) == vs[-1]  # the watermark did not
+
+        written = ia.persist_all_vintages("GDP", base=tmp_path, incremental=True)
+    assert [p.name.split(".")[0] for p in written] == [new[0].isoformat()]
+    assert ia.ingested_through("GDP", tmp_path) == new[-1]
+    assert list_vintages("GDP", base=tmp_path) == vs + new
@@ -0,0 +1,57 @@
+# tests/test_index_append.py
+from pathlib import Path
+
+import nowcast_gdp.io as nio
+from nowcast_gdp.io import IndexBuffer, update_index
+
+
+def _read_nonempty_lines(p: Path):
+    return [ln.strip() for ln in p.read_text(encoding="utf-8").splitlines() if ln.strip()]
+
+
+def test_newer_entries_are_appended_without_rewrite(tmp_path: Path, monkeypatch):
+    idx = tmp_path / "index.csv"
+    existing = [f"2020-01-{d:02d}" for d in range(1, 29)]
+    idx.write_text("\n".join(existing) + "\n", encoding="utf-8")
+
+    def _no_rewrite(*a, **k):
+        raise AssertionError("append path must not rewrite the index")
+
+    monkeypatch.setattr(nio, "write_index_unique_sorted", _no_rewrite)
+    update_index(idx, ["2025-02-01", "2020-01-28", "2025-01-01", "2025-01-01"])
+    assert _read_nonempty_lines(idx) == existing + ["2025-01-01", "2025-02-01"]
+
+
+def test_out_of_order_falls_back_to_merge(tmp_path: Path):
+    idx = tmp_path / "index.csv"
+    idx.write_text("2024-01-01\n2025-01-01", encoding="utf-8")  # no trailing newline
+    update_index(idx, ["2025-06-01"])
+    assert idx.read_text() == "2024-01-01\n2025-01-01\n2025-06-01\n"
+    update_index(idx, ["2024-06-01", "2026-01-01"])
+    assert _read_nonempty_lines(idx) == [
+        "2024-01-01",
+        "2024-06-01",
+        "2025-01-01",
+        "2025-06-01",
+        "2026-01-01",
+    ]
+
+
+def test_tail_read_spans_blocks(tmp_path: Path):
+    idx = tmp_path / "index.csv"
+    lines = [f"{1900 + i // 12:04d}-{1 + i % 12:02d}-01" for i in range(1200)]
+    idx.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    assert nio._read_tail(idx, block=7) == (lines[-1], True)
+
+
+def test_index_buffer_commits_in_batches(tmp_path: Path, monkeypatch):
+    idx = tmp_path / "index.csv"
+    calls = []
+    real = nio.update_index
+    monkeypatch.setattr(nio, "update_index", lambda p, e: calls.append(list(e)) or real(p, e))
+
+    with IndexBuffer(flush_every=3) as buf:
+        for d in range(1, 8):
+            buf.add(idx, f"2025-01-{d:02d}")
+    assert [len(c) for c in calls] == [3, 3, 1]
+    assert _read_nonempty_lines(idx) == [f"2025-01-{d:02d}" for d in range(1, 8)]
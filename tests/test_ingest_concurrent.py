@@ -0,0 +1,63 @@
+# tests/test_ingest_concurrent.py
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from nowcast_gdp.ingest_alfred import index_path, ingest_from_registry, persist_all_vintages
+
+
+class FakeObs:
+    def __init__(self, d, v):
+        self.date = d
+        self.value = v
+
+
+def _index_lines(p: Path) -> list[str]:
+    return [ln for ln in p.read_text(encoding="utf-8").splitlines() if ln]
+
+
+def test_concurrent_persist_writes_all_and_index_consistent(monkeypatch, tmp_path: Path):
+    vdates = [date(2024, 1, 1) + timedelta(days=7 * i) for i in range(24)]
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_fetch(sid, v):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return [FakeObs(date(2023, 10, 1), 1.0)]
+
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: vdates)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks", lambda sid, v: [fake_fetch(sid, v)]
+    )
+
+    written = persist_all_vintages("GDP", base=tmp_path, concurrency=6)
+    assert len(written) == len(vdates)
+    assert active["peak"] > 1
+    assert _index_lines(index_path("GDP", base=tmp_path)) == [v.isoformat() for v in vdates]
+
+
+def test_registry_pool_spans_series(monkeypatch, tmp_path: Path):
+    reg = tmp_path / "series.toml"
+    reg.write_text(
+        '[series.GDP]\nfred_id = "GDP"\n\n[series.CPI]\nfred_id = "CPIAUCSL"\nlatest_only = true\n',
+        encoding="utf-8",
+    )
+    vdates = [date(2025, 1, 31), date(2025, 2, 28)]
+    seen: list[tuple[str, date]] = []
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: vdates)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, v: seen.append((sid, v)) or [[FakeObs(date(2024, 10, 1), 2.0)]],
+    )
+
+    ingest_from_registry(reg, active_only=False, concurrency=4, base=tmp_path)
+    assert sorted(seen) == sorted([("GDP", vdates[0]), ("GDP", vdates[1]), ("CPIAUCSL", vdates[1])])
+    assert _index_lines(index_path("CPIAUCSL", base=tmp_path)) == ["2025-02-28"]
@@ -29,8 +29,8 @@ def test_persist_single_vintage_idempotent(monkeypatch, tmp_root: Path):
 
     # fake network
     monkeypatch.setattr(
-        "nowcast_gdp.ingest_alfred.fetch_observations_for_vintage",
-        lambda sid, vv: [FakeObs(date(2025, 4, 1), 30331.117)],
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, vv: [[FakeObs(date(2025, 4, 1), 30331.117)]],
     )
     monkeypatch.setattr(
         "nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: [date(2025, 1, 31), v]
@@ -55,8 +55,8 @@ def test_persist_all_skips_existing(monkeypatch, tmp_root: Path):
 
     monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: [v1, v2])
     monkeypatch.setattr(
-        "nowcast_gdp.ingest_alfred.fetch_observations_for_vintage",
-        lambda sid, vv: [FakeObs(date(2025, 4, 1), 30331.117)],
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, vv: [[FakeObs(date(2025, 4, 1), 30331.117)]],
     )
 
     # pre-create first vintage
@@ -79,8 +79,8 @@ def test_missing_values_are_written_as_empty_strings(monkeypatch, tmp_root: Path
 
     # One missing value and one present value
     monkeypatch.setattr(
-        "nowcast_gdp.ingest_alfred.fetch_observations_for_vintage",
-        lambda sid, vv: [FakeObs(date(2025, 4, 1), None), FakeObs(date(2025, 7, 1), 123.456789)],
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, vv: [[FakeObs(date(2025, 4, 1), None), FakeObs(date(2025, 7, 1), 123.456789)]],
     )
     monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: [v])
 
@@ -0,0 +1,140 @@
+# tests/test_journal_repair.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from nowcast_gdp.ingest_alfred import index_path, persist_all_vintages, resume_ingest
+from nowcast_gdp.integrity import repair_series, verify_series
+from nowcast_gdp.io import atomic_write, write_csv
+from nowcast_gdp.journal import (
+    FINISHED_DIRNAME,
+    IngestJournal,
+    find_unfinished,
+    journal_dir,
+    load_journal,
+)
+
+
+class FakeObs:
+    def __init__(self, d, v):
+        self.date = d
+        self.value = v
+
+
+def _index_lines(p: Path) -> list[str]:
+    return [ln for ln in p.read_text(encoding="utf-8").splitlines() if ln]
+
+
+def test_atomic_write_leaves_old_file_on_failure(tmp_path: Path):
+    p = tmp_path / "x.csv"
+    write_csv(p, [{"date": "2024-01-01", "value": "1"}], header=["date", "value"])
+    with pytest.raises(RuntimeError):
+        with atomic_write(p) as f:
+            f.write("date,value\n2024-01-01,")
+            raise RuntimeError("crash")
+    assert p.read_text(encoding="utf-8") == "date,value\n2024-01-01,1\n"
+    assert [fp.name for fp in tmp_path.iterdir()] == ["x.csv"]
+
+
+def test_resume_fetches_only_pending_vintages(monkeypatch, tmp_path: Path):
+    vdates = [date(2024, 1, 1) + timedelta(days=7 * i) for i in range(6)]
+    fetched: list[date] = []
+
+    def crashing_fetch(sid, v):
+        if v == vdates[3]:
+            raise KeyboardInterrupt  # simulated crash mid-backfill
+        fetched.append(v)
+        return [FakeObs(date(2023, 10, 1), 1.0)]
+
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: vdates)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks", lambda sid, v: [crashing_fetch(sid, v)]
+    )
+    with pytest.raises(KeyboardInterrupt):
+        persist_all_vintages("GDP", base=tmp_path, journal=True)
+    assert fetched == vdates[:3]
+
+    st = find_unfinished(tmp_path)
+    assert st is not None and st.pending() == [("GDP", v) for v in vdates[3:]]
+
+    def listing(sid):
+        raise AssertionError("resume must not re-list vintages")
+
+    fetched.clear()
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", listing)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, v: fetched.append(v) or [[FakeObs(date(2023, 10, 1), 1.0)]],
+    )
+    written = resume_ingest(base=tmp_path)
+    assert fetched == vdates[3:] and len(written) == 3
+    assert _index_lines(index_path("GDP", base=tmp_path)) == [v.isoformat() for v in vdates]
+    assert find_unfinished(tmp_path) is None
+
+
+def test_finished_journals_are_retired_and_pruned(tmp_path: Path):
+    for i in range(4):
+        with IngestJournal.create(tmp_path, run_id=f"run{i}", keep_finished=2) as j:
+            j.plan([("GDP", date(2024, 1, 1))])
+            j.done("GDP", date(2024, 1, 1))
+    jdir = journal_dir(tmp_path)
+    assert list(jdir.glob("*.jsonl")) == []
+    done = sorted(p.name for p in (jdir / FINISHED_DIRNAME).iterdir())
+    assert done == ["run2.jsonl", "run3.jsonl"]
+
+    with pytest.raises(RuntimeError):
+        with IngestJournal.create(tmp_path, run_id="crashed") as j:
+            j.plan([("GDP", date(2024, 1, 1))])
+            raise RuntimeError
+    assert [p.name for p in jdir.glob("*.jsonl")] == ["crashed.jsonl"]
+    assert find_unfinished(tmp_path).run_id == "crashed"
+
+
+def test_close_twice_is_a_no_op(tmp_path: Path):
+    with IngestJournal.create(tmp_path, run_id="twice") as j:
+        j.plan([("GDP", date(2024, 1, 1))])
+        j.close()
+    j.close()  # __exit__ and this call both follow the explicit close
+    path = journal_dir(tmp_path) / FINISHED_DIRNAME / "twice.jsonl"
+    assert load_journal(path).finished
+    assert path.read_text(encoding="utf-8").count('"end"') == 1
+
+
+def test_batched_run_journals_every_vintage(monkeypatch, tmp_path: Path):
+    vdates = [date(2024, 1, 1) + timedelta(days=7 * i) for i in range(4)]
+
+    def batched_fetch(sid, vs):
+        if vdates[2] in vs:
+            raise KeyboardInterrupt
+        return {v: [FakeObs(date(2023, 10, 1), 1.0)] for v in vs}
+
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.list_vintage_dates", lambda sid: vdates)
+    monkeypatch.setattr("nowcast_gdp.ingest_alfred.fetch_observations_for_vintages", batched_fetch)
+    with pytest.raises(KeyboardInterrupt):
+        persist_all_vintages("GDP", base=tmp_path, journal=True, batch_size=2)
+    st = find_unfinished(tmp_path)
+    assert st.done == {("GDP", v) for v in vdates[:2]}
+    assert st.in_flight() == [("GDP", v) for v in vdates[2:]]
+    assert st.pending() == [("GDP", v) for v in vdates[2:]]
+
+
+def test_verify_and_repair_partial_and_tmp_files(tmp_path: Path):
+    sdir = tmp_path / "GDP"
+    for d in ("2024-01-01", "2024-02-01"):
+        write_csv(sdir / f"{d}.csv", [{"date": "2023-10-01", "value": "1.0"}], ["date", "value"])
+    (sdir / "2024-03-01.csv").write_text("date,value\n2023-10-01,1.", encoding="utf-8")
+    (sdir / "2024-04-01.csv.123-abcd.tmp").write_text("date,val", encoding="utf-8")
+    (sdir / "index.csv").write_text("2024-01-01\n2024-02-01\n2024-03-01\n2024-0", encoding="utf-8")
+
+    rep = verify_series(sdir)
+    assert not rep.ok
+    assert [p.name for p in rep.partial] == ["2024-03-01.csv"]
+    assert len(rep.tmp_files) == 1
+    assert rep.missing == [date(2024, 3, 1)] and rep.bad_index_lines == ["2024-0"]
+
+    repair_series(sdir, rep)
+    assert verify_series(sdir).ok
+    assert _index_lines(sdir / "index.csv") == ["2024-01-01", "2024-02-01"]
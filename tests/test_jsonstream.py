@@ -0,0 +1,193 @@
+# tests/test_jsonstream.py
+from __future__ import annotations
+
+import json
+import random
+import tracemalloc
+from pathlib import Path
+
+import pytest
+import requests
+
+from nowcast_gdp import alfred, ingest_alfred
+from nowcast_gdp.fakealfred import AlfredStandIn, synthetic_series
+from nowcast_gdp.jsonstream import batched, iter_array_items
+from nowcast_gdp.metrics import METRICS
+from nowcast_gdp.observations import ObservationBlock, write_csv_blocks
+
+
+def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+DOC = {
+    "count": 3,
+    "offset": 0,
+    "observations": [
+        {"date": "2024-01-01", "value": "1.5"},
+        {"date": "2024-04-01", "value": "."},
+        {"date": "2024-07-01", "value": "-2e3", "note": 'é "q"'},
+    ],
+    "limit": 100000,
+}
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1 << 16])
+def test_items_and_header_any_chunking(size):
+    data = json.dumps(DOC, indent=1).encode("utf-8")
+    header: dict = {}
+    items = list(iter_array_items(_chunks(data, size), "observations", header))
+    assert items == DOC["observations"]
+    assert header == {"count": 3, "offset": 0, "limit": 100000}
+
+
+def test_empty_and_malformed():
+    header: dict = {}
+    assert (
+        list(iter_array_items([b'{"count": 0, "observations": []}'], "observations", header)) == []
+    )
+    assert header == {"count": 0}
+    with pytest.raises(ValueError):
+        list(iter_array_items([b'{"observations": [{"a": 1} {"b": 2}]}'], "observations", {}))
+    with pytest.raises(ValueError):
+        list(iter_array_items([b'{"observations": [{"a": 1'], "observations", {}))
+
+
+def test_memory_stays_bounded(tmp_path: Path):
+    n = 200_000
+
+    def body():
+        yield b'{"count": %d, "observations": [' % n
+        for i in range(n):
+            sep = b"," if i else b""
+            yield sep + b'{"realtime_start":"2025-01-01","date":"2000-01-01","value":"%d.5"}' % i
+        yield b"]}"
+
+    header: dict = {}
+    rows = iter_array_items(body(), "observations", header)
+    tracemalloc.start()
+    total = sum(len(c) for c in batched(rows, 1000))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert total == n and header["count"] == n
+    assert peak < 2_000_000  # a fully decoded response would take well over 100 MB
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("FRED_API_KEY", "test")
+    monkeypatch.setattr(alfred, "RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(alfred, "_BUCKET", alfred.TokenBucket(rate=1e6, capacity=1e3))
+    monkeypatch.setattr(alfred, "STREAM_READ_BYTES", 64)  # many partial reads per row
+
+    def _point(srv: AlfredStandIn) -> AlfredStandIn:
+        monkeypatch.setattr(alfred, "BASE_URL", srv.url)
+        return srv
+
+    return _point
+
+
+def test_streamed_fetch_against_stand_in(client, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=6, n_obs=40)}
+    vs = sorted(fixture["GDP"])
+    with client(AlfredStandIn(fixture)):
+        one = alfred.fetch_observations_for_vintage("GDP", vs[-1])
+        many = alfred.fetch_observations_for_vintages("GDP", vs)
+        blocks = list(
+            alfred.iter_observation_blocks("GDP", chunk_rows=7, vintage_dates=str(vs[-1]))
+        )
+    assert [str(o.date) for o in one] == [d for d, _ in fixture["GDP"][vs[-1]]]
+    assert many[vs[-1]] == one
+    assert all(len(b) <= 7 for b in blocks)
+    assert write_csv_blocks(tmp_path / "a.csv", blocks) == len(one)
+    one.write_csv(tmp_path / "b.csv")
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+
+def test_dropped_stream_resumes_from_last_row(monkeypatch):
+    rows = [{"date": f"2024-0{m}-01", "value": str(m)} for m in range(1, 7)]
+    calls: list[dict] = []
+
+    def fake_get(path, _stream=None, **params):
+        calls.append(params)
+        off = params["offset"]
+
+        def items():
+            for i, r in enumerate(rows[off:]):
+                if len(calls) == 1 and i == 4:
+                    raise requests.ConnectionError("connection reset")
+                yield r
+
+        return {"count": len(rows), "observations": items()}
+
+    monkeypatch.setattr(alfred, "_get", fake_get)
+    out = list(alfred.iter_observation_blocks("GDP", chunk_rows=2))
+    assert [b.values.tolist() for b in out] == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    assert [c["offset"] for c in calls] == [0, 4]
+
+
+def test_full_storage_ingest_streams_to_disk(client, monkeypatch, tmp_path: Path):
+    fixture = {"GDP": synthetic_series(n_vintages=2, n_obs=40)}
+    v = sorted(fixture["GDP"])[-1]
+    with client(AlfredStandIn(fixture)):
+        expected = alfred.fetch_observations_for_vintage("GDP", v)
+        METRICS.reset()
+
+        def no_concat(*a, **k):
+            raise AssertionError("full storage must not gather the vintage")
+
+        monkeypatch.setattr(ObservationBlock, "concat", staticmethod(no_concat))
+        path = ingest_alfred.persist_series_vintage("GDP", v, base=tmp_path)
+    expected.write_csv(tmp_path / "ref.csv")
+    assert path.read_bytes() == (tmp_path / "ref.csv").read_bytes()
+    got = METRICS.summary()["endpoints"]["series/observations"]["response_bytes"]
+    assert got["count"] == 1 and got["sum"] > 0
+
+
+def test_streamed_bytes_counted_without_content_length():
+    body = json.dumps(DOC).encode("utf-8")
+
+    class ChunkedResponse:  # no Content-Length, as with chunked transfer encoding
+        headers: dict = {}
+
+        def iter_content(self, size):
+            return _chunks(body, 5)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    seen: list[int] = []
+    payload = alfred._stream_payload(ChunkedResponse(), "observations", seen.append)
+    assert list(payload["observations"]) == DOC["observations"]
+    assert seen == [len(body)]
+
+
+@pytest.mark.parametrize("cut", range(1, 12))
+def test_numbers_split_inside_a_literal(cut):
+    data = b'{"count": 2, "observations": [-12.5e-3, 7.25E+2], "x": 1.0}'
+    at = data.index(b"-12.5e-3") + cut
+    header: dict = {}
+    items = list(iter_array_items([data[:at], data[at:]], "observations", header))
+    assert items == [-12.5e-3, 725.0]
+    assert header == {"count": 2, "x": 1.0}
+
+
+def test_random_splits_match_json_loads():
+    rng = random.Random(7)
+    doc = {
+        "observations": [
+            rng.choice([rng.uniform(-1e6, 1e6), rng.randint(-99, 99), "1.5"]) for _ in range(40)
+        ],
+        "n": 12345.678e-9,
+    }
+    data = json.dumps(doc).encode("utf-8")
+    for _ in range(300):
+        cuts = sorted(rng.sample(range(1, len(data)), 5))
+        parts = [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+        header: dict = {}
+        assert list(iter_array_items(parts, "observations", header)) == doc["observations"]
+        assert header == {"n": doc["n"]}
@@ -0,0 +1,54 @@
+# tests/test_metrics.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from nowcast_gdp import alfred
+from nowcast_gdp.fakealfred import AlfredStandIn, FaultConfig, synthetic_series
+from nowcast_gdp.ingest_alfred import main
+from nowcast_gdp.metrics import METRICS, Histogram
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram((0.1, 1.0))
+    for x in [0.05, 0.2, 0.3, 2.0]:
+        h.observe(x)
+    assert h.cumulative() == [1, 3, 4]
+    assert h.quantile(0.5) == 0.3 and h.summary()["max"] == 2.0
+
+
+def test_ingest_exports_metrics_and_request_log(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("FRED_API_KEY", "test")
+    monkeypatch.setattr(alfred, "RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(alfred, "_BUCKET", alfred.TokenBucket(rate=1e6, capacity=1e3))
+    METRICS.reset()
+
+    fixture = {"GDP": synthetic_series(n_vintages=8, n_obs=20)}
+    with AlfredStandIn(fixture, FaultConfig(error_rate=0.25, seed=3)) as srv:
+        monkeypatch.setattr(alfred, "BASE_URL", srv.url)
+        out = tmp_path / "out"
+        rc = main(
+            ["--series", "GDP", "--base", str(tmp_path / "alfred"), "--no-journal"]
+            + ["--metrics-json", str(out / "m.json"), "--metrics-prom", str(out / "m.prom")]
+            + ["--request-log", str(out / "requests.jsonl")]
+        )
+    assert rc == 0
+
+    summary = json.loads((out / "m.json").read_text())
+    obs = summary["endpoints"]["series/observations"]
+    assert obs["calls"] == 8 and obs["failures"] == 0
+    assert obs["attempts"] == sum(obs["status"].values()) >= 8
+    assert summary["totals"]["server_errors"] == srv.stats.by_status[503]
+    assert obs["latency_s"]["p50"] is not None
+    assert obs["response_bytes"]["count"] == obs["attempts"]
+    assert summary["stages_s"]["write_vintage"]["count"] == 8
+
+    prom = (out / "m.prom").read_text()
+    assert 'nowcast_alfred_calls_total{endpoint="series/observations",outcome="ok"} 8' in prom
+    assert "# TYPE nowcast_alfred_request_duration_seconds histogram" in prom
+    assert 'nowcast_ingest_stage_seconds_count{stage="write_vintage"} 8' in prom
+
+    log = [json.loads(ln) for ln in (out / "requests.jsonl").read_text().splitlines()]
+    assert len(log) == summary["totals"]["attempts"]
+    assert {r["series_id"] for r in log} == {"GDP"}
@@ -0,0 +1,111 @@
+# tests/test_mixfreq.py
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nowcast_gdp.mixfreq import MixedFrequencyAligner, aggregate, period_keys
+from nowcast_gdp.panel import Panel, align
+from nowcast_gdp.registry import SeriesCfg
+
+
+def _d(*s: str) -> np.ndarray:
+    return np.array(s, dtype="datetime64[D]")
+
+
+def test_monthly_to_quarterly_matches_pandas():
+    rng = np.random.default_rng(1)
+    dates = np.arange(np.datetime64("2019-01"), np.datetime64("2024-05")).astype("datetime64[D]")
+    vals = rng.normal(size=len(dates))
+    vals[[3, 17]] = np.nan
+    s = pd.Series(vals, index=pd.DatetimeIndex(dates))
+    for how, ref in (("mean", s.resample("QS").mean()), ("sum", s.resample("QS").sum(min_count=1))):
+        p, v, n = aggregate(dates, vals, "Q", how)
+        ref = ref.dropna()
+        np.testing.assert_array_equal(p, ref.index.values.astype("datetime64[D]"))
+        np.testing.assert_allclose(v, ref.values)
+    p, v, n = aggregate(dates, vals, "Q", "last")
+    np.testing.assert_allclose(v, s.dropna().resample("QS").last().values)
+    assert n[-1] == 1 and p[-1] == np.datetime64("2024-04-01")
+
+
+def test_weekly_to_month_uses_week_ending():
+    # Wed 2024-01-31 ends its week on Sat 2024-02-03 -> February
+    dates = _d("2024-01-24", "2024-01-31", "2024-02-07")
+    p, v, n = aggregate(dates, [1.0, 2.0, 4.0], "M", week_ending=True)
+    np.testing.assert_array_equal(p, _d("2024-01-01", "2024-02-01"))
+    np.testing.assert_allclose(v, [1.0, 3.0])
+    p, _, _ = aggregate(dates, [1.0, 2.0, 4.0], "M")
+    assert len(p) == 2 and n.tolist() == [1, 2]
+    assert period_keys(_d("2024-01-31"), "W")[0] == np.datetime64("2024-02-03").astype(np.int64)
+    with pytest.raises(ValueError):
+        aggregate(dates, [1.0, 2.0, 4.0], "M", how="median")
+
+
+def _aligner() -> MixedFrequencyAligner:
+    al = MixedFrequencyAligner()
+    al.add_series("GDP", _d("2023-10-01", "2024-01-01"), [1.0, 2.0], freq="Q")
+    months = np.arange(np.datetime64("2023-10"), np.datetime64("2024-05")).astype("datetime64[D]")
+    al.add_series("CPI", months, np.arange(len(months), dtype=float))
+    weeks = np.arange(np.datetime64("2024-01-06"), np.datetime64("2024-02-25"), 7)
+    al.add_series("CLAIMS", weeks, np.full(len(weeks), 10.0), freq="W", how="sum")
+    return al
+
+
+def test_blocks_ragged_edge():
+    b = _aligner().blocks()
+    np.testing.assert_array_equal(b.quarters, _d("2023-10-01", "2024-01-01", "2024-04-01"))
+    assert b.series == ["CPI", "CLAIMS"] and b.targets == ["GDP"]
+    assert b.values.shape == (3, 3, 2)
+    np.testing.assert_array_equal(b.values[:, :, 0].ravel()[:7], np.arange(7.0))
+    # April CPI observed, May/June not: the ragged edge
+    assert b.mask[2, :, 0].tolist() == [True, False, False]
+    # weeks ending in Jan (4) and Feb (4), summed per month
+    np.testing.assert_allclose(b.quarter(date(2024, 2, 15))[0][:, 1], [40.0, 40.0, np.nan])
+    assert b.target_mask[:, 0].tolist() == [True, True, False]
+    assert b.months_observed()[2].tolist() == [1, 0]
+    np.testing.assert_allclose(b.to_quarterly("mean")[:, 0], [1.0, 4.0, 6.0])
+    np.testing.assert_allclose(b.to_quarterly("last")[:, 0], [2.0, 5.0, 6.0])
+    with pytest.raises(LookupError):
+        b.index(date(2025, 1, 1))
+
+
+def test_incremental_update_matches_rebuild():
+    al = _aligner()
+    first = al.blocks()
+    assert al.blocks() is first  # cached
+    q = al.update("CPI", _d("2024-05-01"), [7.0])
+    assert q == (date(2024, 4, 1), date(2024, 4, 1))
+    assert al.update("CLAIMS", _d("2024-02-24", "2024-01-06"), [5.0, 1.0]) == (
+        date(2024, 1, 1),
+        date(2024, 1, 1),
+    )
+    b = al.blocks()
+    assert b is not first
+    assert b.mask[2, :, 0].tolist() == [True, True, False]
+    np.testing.assert_allclose(b.values[1, :2, 1], [31.0, 35.0])
+
+    ref = MixedFrequencyAligner()
+    ref.add_series("GDP", _d("2023-10-01", "2024-01-01"), [1.0, 2.0], freq="Q")
+    months = np.arange(np.datetime64("2023-10"), np.datetime64("2024-06")).astype("datetime64[D]")
+    ref.add_series("CPI", months, np.arange(len(months), dtype=float))
+    weeks = np.arange(np.datetime64("2024-01-06"), np.datetime64("2024-02-25"), 7)
+    claims = np.full(len(weeks), 10.0)
+    claims[0], claims[-1] = 1.0, 5.0
+    ref.add_series("CLAIMS", weeks, claims, freq="W", how="sum")
+    np.testing.assert_array_equal(b.values, ref.blocks().values)
+
+
+def test_from_panel():
+    cols = [(_d("2024-01-01", "2024-04-01"), np.array([1.0, 2.0]))]
+    cols.append((_d("2024-01-01", "2024-02-01", "2024-03-01"), np.array([3.0, 4.0, 5.0])))
+    dates, values = align(cols)
+    panel = Panel(dates, ["GDP", "CPI"], values, vintages={}, timings={})
+    reg = {"GDP": SeriesCfg(id="GDP", fred_id="GDP", frequency="quarterly")}
+    b = MixedFrequencyAligner.from_panel(panel, reg).blocks()
+    assert b.series == ["CPI"] and b.targets == ["GDP"]
+    np.testing.assert_allclose(b.target_values[:, 0], [1.0, 2.0])
+    np.testing.assert_allclose(b.values[0, :, 0], [3.0, 4.0, 5.0])
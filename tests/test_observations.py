@@ -0,0 +1,80 @@
+# tests/test_observations.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp import alfred
+from nowcast_gdp.dataio import read_vintage_block
+from nowcast_gdp.io import write_csv
+from nowcast_gdp.observations import Observation, ObservationBlock, as_block
+
+ROWS = [
+    {"date": "2024-10-01", "value": "99.5"},
+    {"date": "2025-01-01", "value": "."},
+    {"date": "2025-04-01", "value": "101"},
+]
+
+
+def test_block_from_json_and_lazy_views():
+    b = ObservationBlock.from_json_rows(ROWS)
+    assert b.days.dtype == np.int32 and b.values.dtype == np.float64
+    assert len(b) == 3
+    assert b[0] == Observation(date(2024, 10, 1), 99.5)
+    assert [o.value for o in b] == [99.5, None, 101.0]
+    assert b.dates[-1] == np.datetime64("2025-04-01")
+    assert as_block(list(b)) == b
+    assert (
+        ObservationBlock.from_json_rows([{"date": "2025-01-01", "value": "n/a"}])[0].value is None
+    )
+
+
+def test_csv_bytes_match_dictwriter(tmp_path: Path):
+    b = ObservationBlock.from_json_rows(ROWS)
+    write_csv(tmp_path / "a.csv", b.to_rows(), header=["date", "value"])
+    b.write_csv(tmp_path / "b.csv")
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+    ObservationBlock.empty().write_csv(tmp_path / "e.csv")
+    assert (tmp_path / "e.csv").read_bytes() == b"date,value\r\n"
+
+
+def test_reader_round_trip(tmp_path: Path):
+    b = ObservationBlock.from_json_rows(ROWS)
+    b.write_csv(tmp_path / "GDP" / "2025-07-30.csv")
+    (tmp_path / "GDP" / "index.csv").write_text("2025-07-30\n", encoding="utf-8")
+    assert read_vintage_block("GDP", date(2025, 7, 30), base=tmp_path) == b
+
+
+def test_batched_split_returns_sorted_blocks(monkeypatch):
+    rows = [
+        {
+            "realtime_start": "2025-06-01",
+            "realtime_end": "9999-12-31",
+            "date": "2025-04-01",
+            "value": "3",
+        },
+        {
+            "realtime_start": "2025-05-01",
+            "realtime_end": "9999-12-31",
+            "date": "2025-01-01",
+            "value": "2",
+        },
+        {
+            "realtime_start": "2025-05-01",
+            "realtime_end": "2025-05-31",
+            "date": "2025-04-01",
+            "value": ".",
+        },
+    ]
+    monkeypatch.setattr(
+        alfred, "_get", lambda path, **p: {"count": len(rows), "observations": rows}
+    )
+    out = alfred.fetch_observations_for_vintages("GDP", [date(2025, 6, 1), date(2025, 5, 1)])
+    assert [(str(o.date), o.value) for o in out[date(2025, 5, 1)]] == [
+        ("2025-01-01", 2.0),
+        ("2025-04-01", None),
+    ]
+    assert out[date(2025, 6, 1)].values.tolist() == pytest.approx([2.0, 3.0])
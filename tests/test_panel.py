@@ -0,0 +1,65 @@
+# tests/test_panel.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.panel import load_panel, main
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _setup(tmp_path: Path) -> Path:
+    base = tmp_path / "alfred"
+    _write(base / "GDP" / "index.csv", "2025-04-30\n2025-07-30\n")
+    _write(base / "GDP" / "2025-04-30.csv", "date,value\n2025-01-01,100\n")
+    _write(base / "GDP" / "2025-07-30.csv", "date,value\n2025-01-01,101\n2025-04-01,102\n")
+    _write(base / "CPIAUCSL" / "index.csv", "2025-07-15\n")
+    _write(
+        base / "CPIAUCSL" / "2025-07-15.csv",
+        "date,value\n2025-04-01,310.0\n2025-05-01,\n2025-06-01,311.5\n",
+    )
+    reg = tmp_path / "series.toml"
+    reg.write_text(
+        '[series.GDP]\nfred_id = "GDP"\n\n[series.CPI]\nfred_id = "CPIAUCSL"\n\n'
+        '[series.UNRATE]\nfred_id = "UNRATE"\nactive = false\n',
+        encoding="utf-8",
+    )
+    return reg
+
+
+def test_panel_aligns_series_on_union_axis(tmp_path: Path):
+    reg = _setup(tmp_path)
+    panel = load_panel(reg, base=tmp_path / "alfred", workers=4)
+    assert panel.series == ["GDP", "CPI"]
+    assert panel.dates.tolist() == [
+        date(2025, 1, 1),
+        date(2025, 4, 1),
+        date(2025, 5, 1),
+        date(2025, 6, 1),
+    ]
+    np.testing.assert_array_equal(panel.column("GDP"), [101.0, 102.0, np.nan, np.nan])
+    np.testing.assert_array_equal(panel.column("CPI"), [np.nan, 310.0, np.nan, 311.5])
+    assert set(panel.timings) == {"GDP", "CPI"} and all(t >= 0 for t in panel.timings.values())
+    assert list(panel.to_frame().columns) == ["GDP", "CPI"]
+
+
+def test_panel_asof_and_missing(tmp_path: Path, capsys):
+    reg = _setup(tmp_path)
+    panel = load_panel(reg, include=["GDP"], asof=date(2025, 5, 1), base=tmp_path / "alfred")
+    assert panel.vintages == {"GDP": date(2025, 4, 30)}
+    assert panel.values.tolist() == [[100.0]]
+
+    with pytest.raises(FileNotFoundError):
+        load_panel(reg, active_only=False, base=tmp_path / "alfred")
+    panel = load_panel(reg, active_only=False, base=tmp_path / "alfred", skip_missing=True)
+    assert panel.missing == ["UNRATE"]
+
+    assert main(["--registry", str(reg), "--base", str(tmp_path / "alfred")]) == 0
+    assert "[panel] 4 dates x 2 series" in capsys.readouterr().out
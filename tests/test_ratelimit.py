@@ -0,0 +1,73 @@
+# tests/test_ratelimit.py
+from __future__ import annotations
+
+import pytest
+
+from nowcast_gdp.ratelimit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, s: float) -> None:
+        self.slept.append(s)
+        self.now += s
+
+
+def test_burst_then_refill_rate():
+    clk = FakeClock()
+    b = TokenBucket(rate=2.0, capacity=3, clock=clk, sleep=clk.sleep)
+    for _ in range(3):
+        assert b.acquire() == 0.0  # burst
+    waited = b.acquire()
+    assert waited == pytest.approx(0.5)
+    assert clk.now == pytest.approx(0.5)
+
+
+def test_pause_blocks_and_drains_bucket():
+    clk = FakeClock()
+    b = TokenBucket(rate=1.0, capacity=5, clock=clk, sleep=clk.sleep)
+    b.pause(10.0)
+    assert b.paused_for == pytest.approx(10.0)
+    b.acquire()
+    # waited out the pause, then one refill interval (bucket restarts empty)
+    assert clk.now == pytest.approx(11.0)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    b = TokenBucket(rate=1.0, capacity=2)
+    with pytest.raises(ValueError):
+        b.acquire(3)
+
+
+def test_alfred_429_pauses_shared_bucket(monkeypatch):
+    from nowcast_gdp import alfred
+
+    class Resp:
+        def __init__(self, status, headers=None, payload=None):
+            self.status_code = status
+            self.headers = headers or {}
+            self._payload = payload or {}
+            self.content = b"{}"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self._payload
+
+    responses = [Resp(429, {"Retry-After": "7"}), Resp(200, payload={"vintage_dates": []})]
+    monkeypatch.setenv(alfred.API_KEY_ENV, "test")
+    monkeypatch.setattr(alfred.requests, "get", lambda *a, **k: responses.pop(0))
+    clk = FakeClock()
+    monkeypatch.setattr(alfred, "_BUCKET", TokenBucket(1.0, 5, clock=clk, sleep=clk.sleep))
+
+    assert alfred.list_vintage_dates("GDP") == []
+    assert clk.now >= 7.0  # the retry waited on the shared bucket's pause
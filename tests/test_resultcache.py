@@ -0,0 +1,140 @@
+# tests/test_resultcache.py
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nowcast_gdp.backtest import main as backtest_main
+from nowcast_gdp.backtest import run_backtest
+from nowcast_gdp.baselines.__main__ import main as baselines_main
+from nowcast_gdp.dataio import clear_cache
+from nowcast_gdp.resultcache import (
+    ResultCache,
+    column_digests,
+    result_key,
+    results_dir,
+    vintage_digest,
+)
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _tree(root: Path) -> Path:
+    sdir = root / "GDP"
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n")
+    _write(sdir / "2025-01-30.csv", "date,value\n2024-07-01,100\n2024-10-01,102\n")
+    _write(sdir / "2025-04-30.csv", "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,104\n")
+    return sdir
+
+
+def test_digest_and_key():
+    d = np.array(["2024-07-01", "2024-10-01"], dtype="datetime64[D]")
+    a = vintage_digest(d, [1.0, 2.0])
+    assert a == vintage_digest(d.tolist(), np.array([1.0, 2.0]))
+    assert a != vintage_digest(d, [1.0, 2.5])
+    # blanks do not change the content
+    d3 = np.append(d, np.datetime64("2025-01-01"))
+    assert a == vintage_digest(d3, [1.0, 2.0, np.nan])
+    block = np.array([[1.0, 1.0], [2.0, np.nan], [np.nan, 3.0]])
+    assert column_digests(d3, block) == [vintage_digest(d3, block[:, j]) for j in range(2)]
+    k = result_key("bl1", {"h": 2, "window": 4}, "GDP", a)
+    assert k == result_key("bl1", {"window": 4, "h": 2}, "GDP", a)
+    assert k != result_key("bl1", {"h": 3, "window": 4}, "GDP", a)
+    assert k != result_key("bl0", {"h": 2, "window": 4}, "GDP", a)
+    assert k != result_key("bl1", {"h": 2, "window": 4}, "GDP", a, kind="backtest")
+
+
+def test_put_get_and_lru_eviction(tmp_path: Path):
+    c = ResultCache(tmp_path / "r", max_bytes=10_000)
+    assert c.get("ab" * 32) is None
+    c.put("ab" * 32, np.array([1.0, 2.0]))
+    np.testing.assert_array_equal(c.get("ab" * 32), [1.0, 2.0])
+    assert (c.hits, c.misses) == (1, 1)
+    assert c.get("ab" * 32, shape=(3,)) is None  # wrong layout counts as a miss
+    assert c.get("ab" * 32, dtype=np.dtype([("x", "f8")])) is None
+    assert (c.hits, c.misses) == (1, 3)
+
+    entry = c.size_bytes()
+    keys = [f"{i:02d}" * 32 for i in range(3)]
+    for i, k in enumerate(keys):
+        c.put(k, np.array([float(i), 0.0]))
+        p = c._path(k)
+        os.utime(p, (1000 + i, 1000 + i))
+    os.utime(c._path("ab" * 32), (10, 10))  # oldest
+    c.get(keys[0])  # touched -> most recent
+    c.max_bytes = 3 * entry
+    c.put("ff" * 32, np.array([9.0, 9.0]))
+    assert c.size_bytes() <= c.max_bytes
+    assert c.get("ab" * 32) is None and c.get(keys[1]) is None
+    assert c.get(keys[0]) is not None and c.get("ff" * 32) is not None
+
+
+def test_backtest_reuses_results(tmp_path: Path, monkeypatch):
+    clear_cache()
+    sdir = _tree(tmp_path)
+    cache = ResultCache.for_base(tmp_path)
+    plain = run_backtest(["GDP"], h=2, base=tmp_path)
+    first = run_backtest(["GDP"], h=2, base=tmp_path, cache=cache)
+    pd.testing.assert_frame_equal(first, plain)
+    assert (cache.hits, cache.misses) == (0, 2)  # one entry per (series, model)
+    assert first.attrs == {"reused": 0, "computed": 4}
+    assert len(list(results_dir(tmp_path).glob("*/*.npy"))) == 2
+
+    # a new vintage arrives: only it costs compute
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n2025-07-30\n")
+    _write(
+        sdir / "2025-07-30.csv",
+        "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,105\n2025-04-01,107\n",
+    )
+    clear_cache()
+    again = run_backtest(["GDP"], h=2, base=tmp_path, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert again.attrs == {"reused": 4, "computed": 2}
+    pd.testing.assert_frame_equal(again, run_backtest(["GDP"], h=2, base=tmp_path))
+
+    # nothing new: one read per block and no writes
+    monkeypatch.setattr(cache, "put", lambda key, value: pytest.fail("unexpected write"))
+    warm = run_backtest(["GDP"], h=2, base=tmp_path, cache=cache)
+    assert (cache.hits, cache.misses) == (4, 2)
+    assert warm.attrs == {"reused": 6, "computed": 0}
+    pd.testing.assert_frame_equal(warm, again)
+
+
+def test_baselines_cli_cache(tmp_path: Path, capsys):
+    clear_cache()
+    _tree(tmp_path)
+    args = ["--series", "GDP", "--h", "2", "--model", "bl1", "--base", str(tmp_path)]
+    assert baselines_main(args) == 0
+    out1 = capsys.readouterr().out
+    assert len(list(results_dir(tmp_path).glob("*/*.npy"))) == 1
+    assert baselines_main(args) == 0
+    assert capsys.readouterr().out == out1
+    assert baselines_main(args + ["--window", "1"]) == 0
+    assert len(list(results_dir(tmp_path).glob("*/*.npy"))) == 2
+
+
+def test_backtest_and_baselines_cli_share_a_cache(tmp_path: Path, capsys):
+    _tree(tmp_path)
+    base = ["--series", "GDP", "--h", "2", "--model", "bl0", "--base", str(tmp_path)]
+    off = {backtest_main: [], baselines_main: ["--no-cache"]}
+    on = {backtest_main: ["--cache"], baselines_main: []}
+    expected = {}
+    for cli in (backtest_main, baselines_main):
+        clear_cache()
+        assert cli(base + off[cli]) == 0
+        expected[cli] = capsys.readouterr().out.splitlines()[-1]
+    # same model, params and latest vintage: each CLI must still get its own payload
+    for order in ((backtest_main, baselines_main), (baselines_main, backtest_main)):
+        for p in results_dir(tmp_path).glob("*/*.npy"):
+            p.unlink()
+        for cli in order:
+            clear_cache()
+            assert cli(base + on[cli]) == 0
+        assert capsys.readouterr().out.splitlines()[-1] == expected[order[-1]]
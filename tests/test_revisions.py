@@ -0,0 +1,109 @@
+# tests/test_revisions.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nowcast_gdp.dataio import clear_cache
+from nowcast_gdp.revisions import (
+    RevisionState,
+    from_triangle,
+    revision_matrix,
+    revision_state,
+    revision_stats,
+    state_path,
+)
+from nowcast_gdp.store import build_triangle
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _tree(root: Path) -> Path:
+    sdir = root / "GDP"
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n2025-07-30\n")
+    _write(sdir / "2025-01-30.csv", "date,value\n2024-07-01,100\n2024-10-01,102\n")
+    _write(sdir / "2025-04-30.csv", "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,104\n")
+    _write(
+        sdir / "2025-07-30.csv",
+        "date,value\n2024-07-01,101\n2024-10-01,103\n2025-01-01,105\n2025-04-01,107\n",
+    )
+    return sdir
+
+
+def test_releases_from_triangle(tmp_path: Path):
+    st = from_triangle(build_triangle(_tree(tmp_path)), max_k=2)
+    np.testing.assert_array_equal(st.first, [100, 102, 104, 107])
+    np.testing.assert_array_equal(st.kth(2), [100, 103, 105, np.nan])
+    np.testing.assert_array_equal(st.latest, [101, 103, 105, 107])
+    np.testing.assert_array_equal(st.n_releases, [3, 3, 2, 1])
+    assert st.release_vintages[2, 1] == np.datetime64("2025-07-30")
+    np.testing.assert_array_equal(st.revision(1), [1, 1, 1, 0])
+
+
+def test_revision_matrices(tmp_path: Path):
+    tri = build_triangle(_tree(tmp_path))
+    vs_first = revision_matrix(tri, "first")
+    np.testing.assert_array_equal(vs_first[1], [0, 1, 1])
+    np.testing.assert_array_equal(vs_first[3], [np.nan, np.nan, 0])
+    prev = revision_matrix(tri, "previous")
+    np.testing.assert_array_equal(prev[0], [np.nan, 0, 1])
+    np.testing.assert_array_equal(prev[2], [np.nan, np.nan, 1])
+    with pytest.raises(ValueError):
+        revision_matrix(tri, "final")
+
+
+def test_extend_matches_full_build(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    tri = build_triangle(sdir)
+    st = RevisionState.empty(max_k=3)
+    for j, v in enumerate(tri.vintages):
+        st.extend(v.item(), tri.obs_dates, tri.values[:, j])
+    full = from_triangle(tri, max_k=3)
+    for name, arr in full.__dict__.items():
+        np.testing.assert_array_equal(getattr(st, name), arr, err_msg=name)
+    with pytest.raises(ValueError):
+        st.extend(date(2025, 1, 30), tri.obs_dates, tri.values[:, 0])
+
+
+def test_state_is_saved_and_extended_incrementally(tmp_path: Path, monkeypatch):
+    sdir = _tree(tmp_path)
+    st = revision_state("GDP", base=tmp_path)
+    assert state_path(sdir).exists() and len(st.vintages) == 3
+
+    _write(
+        sdir / "2025-10-30.csv",
+        "date,value\n2024-07-01,101\n2024-10-01,103\n2025-01-01,106\n2025-04-01,107\n"
+        "2025-07-01,108\n",
+    )
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n2025-07-30\n2025-10-30\n")
+    clear_cache()
+
+    from nowcast_gdp import revisions
+
+    def _no_full_build(*a, **k):
+        raise AssertionError("should extend, not rebuild")
+
+    monkeypatch.setattr(revisions, "from_triangle", _no_full_build)
+    st = revision_state("GDP", base=tmp_path)
+    np.testing.assert_array_equal(st.kth(3), [101, 103, 106, np.nan, np.nan])
+    np.testing.assert_array_equal(st.first[-1], 108)
+    monkeypatch.undo()
+    full = from_triangle(build_triangle(sdir))
+    np.testing.assert_array_equal(st.latest, full.latest)
+
+
+def test_stats(tmp_path: Path):
+    st = from_triangle(build_triangle(_tree(tmp_path)), max_k=2)
+    df = revision_stats(st)
+    first = df[df["release"] == 1].iloc[0]
+    assert first["n"] == 4
+    assert first["mean_revision"] == pytest.approx(0.75)
+    assert first["mean_abs_revision"] == pytest.approx(0.75)
+    assert df[df["release"] == 2].iloc[0]["n"] == 3
+    assert revision_stats(st, min_releases=3).iloc[0]["n"] == 2
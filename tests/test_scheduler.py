@@ -0,0 +1,194 @@
+# tests/test_scheduler.py
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from nowcast_gdp import scheduler
+from nowcast_gdp.registry import SeriesCfg
+from nowcast_gdp.scheduler import (
+    PollPolicy,
+    ReleaseCalendar,
+    Scheduler,
+    load_calendar_file,
+    release_timestamp,
+)
+
+POLICY = PollPolicy(
+    pre_window=600, post_window=3600, hot_interval=60, idle_interval=6 * 3600, late_limit=86400
+)
+
+
+class Clock:
+    def __init__(self, t: float) -> None:
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _setup(release: date, newest: date, arrives: float):
+    """One series with a calendar release; the vintage shows up at `arrives`."""
+    clock = Clock(release_timestamp(release) - 2 * 86400)
+    stored = {"v": newest}
+    polls = []
+
+    def poll(cfg):
+        polls.append(clock.t)
+        if clock.t >= arrives and stored["v"] < release:
+            stored["v"] = release
+            return 1
+        return 0
+
+    reg = {"GDP": SeriesCfg(id="GDP", fred_id="GDP", frequency="quarterly")}
+    cal = ReleaseCalendar(
+        {"GDP": [release_timestamp(release), release_timestamp(date(2025, 11, 26))]}
+    )
+    sched = Scheduler(reg, poll, lambda cfg: stored["v"], cal, POLICY, clock)
+    return sched, clock, polls
+
+
+def _drive(sched, clock, until: float) -> None:
+    while (nxt := sched.next_due()) is not None and nxt <= until:
+        clock.t = max(clock.t, nxt)
+        sched.run_due()
+
+
+def test_polls_cluster_around_the_release():
+    release = date(2025, 10, 30)
+    t_rel = release_timestamp(release)
+    sched, clock, polls = _setup(release, date(2025, 9, 25), arrives=t_rel + 150)
+    _drive(sched, clock, t_rel + 2 * 86400)
+
+    before = [t for t in polls if t < t_rel - POLICY.pre_window]
+    assert len(before) <= 2 * 86400 / POLICY.idle_interval + 1  # idle polls only
+    hot = [t for t in polls if t_rel - POLICY.pre_window <= t <= t_rel + 150]
+    assert len(hot) >= 10  # minute-level polling around the release
+    picked_up = min(t for t in polls if t >= t_rel + 150)
+    assert picked_up - (t_rel + 150) <= POLICY.hot_interval
+    st = sched.state["GDP"]
+    assert st.hits == 1 and st.expected == release_timestamp(date(2025, 11, 26))
+    # after the release the series idles again
+    after = [t for t in polls if t > t_rel + 300]
+    assert len(after) <= 2 * 86400 / POLICY.idle_interval + 1
+
+
+def test_late_release_backs_off():
+    release = date(2025, 10, 30)
+    t_rel = release_timestamp(release)
+    sched, clock, polls = _setup(release, date(2025, 9, 25), arrives=float("inf"))
+    _drive(sched, clock, t_rel + 86400)
+    late = [t for t in polls if t > t_rel + POLICY.post_window]
+    gaps = [b - a for a, b in zip(late, late[1:])]
+    assert gaps == sorted(gaps) and gaps[-1] == POLICY.idle_interval
+
+
+def test_frequency_fallback_and_snapshot(tmp_path: Path):
+    clock = Clock(release_timestamp(date(2025, 10, 1)))
+    reg = {"CPI": SeriesCfg(id="CPI", fred_id="CPIAUCSL", frequency="monthly")}
+    sched = Scheduler(reg, lambda cfg: 0, lambda cfg: date(2025, 9, 11), policy=POLICY, clock=clock)
+    assert sched.state["CPI"].expected == release_timestamp(date(2025, 10, 11))
+    sched.run_due()
+    st = sched.state["CPI"]
+    assert st.polls == 1 and st.next_poll == clock.t + POLICY.idle_interval
+
+    path = tmp_path / "state.json"
+    sched.write_state(path)
+    snap = json.loads(path.read_text("utf-8"))
+    assert snap["queue"][0]["series"] == "CPI"
+    assert snap["queue"][0]["expected"].startswith("2025-10-11T12:30")
+
+
+def test_poll_errors_keep_the_loop_alive():
+    clock = Clock(0.0)
+
+    def boom(cfg):
+        raise RuntimeError("FRED down")
+
+    reg = {"GDP": SeriesCfg(id="GDP", fred_id="GDP")}
+    sched = Scheduler(reg, boom, lambda cfg: None, policy=POLICY, clock=clock)
+    assert sched.run_due() == [("GDP", 0)]
+    assert sched.next_due() == POLICY.idle_interval
+
+
+def test_calendar_file(tmp_path: Path):
+    p = tmp_path / "cal.csv"
+    p.write_text("series,date,time\nGDP,2025-10-30,\nCPIAUCSL,2025-10-15,10:00\n", "utf-8")
+    reg = {
+        "GDP": SeriesCfg(id="GDP", fred_id="GDP"),
+        "CPI": SeriesCfg(id="CPI", fred_id="CPIAUCSL"),
+    }
+    cal = load_calendar_file(p, reg)
+    assert cal.next_after("GDP", 0) == release_timestamp(date(2025, 10, 30))
+    assert cal.next_after("CPI", 0) - release_timestamp(date(2025, 10, 15)) == pytest.approx(5400)
+
+
+def test_calendar_is_refreshed_when_it_runs_out():
+    first, second = date(2025, 10, 30), date(2025, 11, 26)
+    clock = Clock(release_timestamp(first) + 3600)
+    loads = []
+
+    def load():
+        loads.append(clock.t)
+        dates = [first] if len(loads) == 1 else [first, second]
+        return ReleaseCalendar({"GDP": [release_timestamp(d) for d in dates]})
+
+    reg = {"GDP": SeriesCfg(id="GDP", fred_id="GDP", frequency="quarterly")}
+    sched = Scheduler(reg, lambda cfg: 0, lambda cfg: first, None, POLICY, clock, load)
+    assert len(loads) == 1
+    sched.run_due()
+    # the published schedule is exhausted: frequency guess, then an early reload
+    assert sched.state["GDP"].expected != release_timestamp(second)
+    clock.t += POLICY.idle_interval
+    sched.run_due()
+    assert len(loads) == 2
+    assert sched.state["GDP"].expected == release_timestamp(second)
+
+
+def test_calendar_refresh_cadence_and_failure():
+    clock = Clock(release_timestamp(date(2025, 10, 1)))
+    calls = []
+
+    def load():
+        calls.append(clock.t)
+        if len(calls) == 2:
+            raise RuntimeError("FRED down")
+        return ReleaseCalendar({"GDP": [release_timestamp(date(2026, 1, 29))]})
+
+    policy = PollPolicy(calendar_refresh=86400)
+    reg = {"GDP": SeriesCfg(id="GDP", fred_id="GDP", frequency="quarterly")}
+    sched = Scheduler(
+        reg, lambda cfg: 0, lambda cfg: None, policy=policy, clock=clock, load_calendar=load
+    )
+    sched.run_due()
+    assert len(calls) == 1
+    clock.t += 86400
+    sched.run_due()  # refresh fails: old calendar kept
+    assert len(calls) == 2 and "GDP" in sched.calendar
+    clock.t += 86400
+    sched.run_due()
+    assert len(calls) == 3
+
+
+def test_once_never_sleeps(monkeypatch, tmp_path: Path):
+    slept = []
+    monkeypatch.setattr(scheduler.time, "sleep", slept.append)
+    monkeypatch.setattr(scheduler, "ingest_poller", lambda base, storage: lambda cfg: 0)
+    reg = tmp_path / "series.toml"
+    reg.write_text('[series.GDP]\nfred_id = "GDP"\nfrequency = "quarterly"\n', "utf-8")
+    args = ["--registry", str(reg), "--base", str(tmp_path), "--no-fred-calendar", "--once"]
+    assert scheduler.main(args) == 0
+    assert slept == []
+
+    sched = Scheduler(
+        {"GDP": SeriesCfg(id="GDP", fred_id="GDP")},
+        lambda cfg: 0,
+        lambda cfg: None,
+        policy=POLICY,
+        clock=Clock(0.0),
+    )
+    sched.run_forever(sleep=slept.append, max_cycles=2)
+    assert slept == [POLICY.idle_interval]  # between the two cycles only
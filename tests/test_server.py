@@ -0,0 +1,128 @@
+# tests/test_server.py
+from __future__ import annotations
+
+import json
+import socket
+import time
+import urllib.error
+import urllib.request
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from nowcast_gdp.baselines.bl1 import drift_forecast
+from nowcast_gdp.server import ForecastServer, ForecastService, QueryError
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _tree(root: Path) -> Path:
+    sdir = root / "GDP"
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n")
+    _write(sdir / "2025-01-30.csv", "date,value\n2024-07-01,100\n2024-10-01,102\n")
+    _write(sdir / "2025-04-30.csv", "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,\n")
+    return sdir
+
+
+def _add_vintage(sdir: Path) -> None:
+    _write(
+        sdir / "2025-07-30.csv",
+        "date,value\n2024-07-01,100\n2024-10-01,103\n2025-01-01,105\n2025-04-01,107\n",
+    )
+    _write(sdir / "index.csv", "2025-01-30\n2025-04-30\n2025-07-30\n")
+
+
+def test_service_queries(tmp_path: Path):
+    _tree(tmp_path)
+    svc = ForecastService(["GDP", "MISSING"], base=tmp_path)
+    out = svc.forecast("GDP", model="bl1", h=2, window=4)
+    assert out["vintage"] == "2025-04-30" and out["origin"] == "2024-10-01"
+    assert out["forecast"] == pytest.approx(drift_forecast([100.0, 103.0], 2))
+    assert svc.forecast("GDP", model="bl1", h=2, window=4) is out  # memoised
+
+    old = svc.forecast("GDP", h=1, asof=date(2025, 3, 1))
+    assert old["vintage"] == "2025-01-30" and old["forecast"] == [102.0]
+    assert svc.asof("GDP", date(2025, 5, 1), tail=1) == {
+        "series": "GDP",
+        "vintage": "2025-04-30",
+        "dates": ["2024-10-01"],
+        "values": [103.0],
+    }
+    with pytest.raises(LookupError):
+        svc.asof("GDP", date(2024, 1, 1))
+    with pytest.raises(LookupError):
+        svc.forecast("MISSING")
+    with pytest.raises(QueryError):
+        svc.forecast("GDP", model="arima")
+
+
+def test_asof_queries_are_served_from_memory(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    _add_vintage(sdir)
+    svc = ForecastService(["GDP"], base=tmp_path)
+    for p in sdir.glob("*.csv"):
+        p.unlink()  # nothing left on disk to read
+    assert svc.asof("GDP", date(2025, 3, 1))["values"] == [100.0, 102.0]
+    assert svc.forecast("GDP", h=1, asof=date(2025, 5, 1))["forecast"] == [103.0]
+    assert svc.asof("GDP", date(2025, 8, 1), tail=2)["values"] == [105.0, 107.0]
+    for bad in (0, -1):
+        with pytest.raises(QueryError):
+            svc.asof("GDP", date(2025, 8, 1), tail=bad)
+
+
+def test_refresh_reloads_changed_series_only(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    svc = ForecastService(["GDP"], base=tmp_path)
+    assert svc.refresh() == []
+    _add_vintage(sdir)
+    assert svc.refresh() == ["GDP"]
+    assert svc.forecast("GDP", h=1)["forecast"] == [107.0]
+
+
+def _get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_and_hot_reload(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    svc = ForecastService(["GDP"], base=tmp_path)
+    with ForecastServer(svc, port=0, watch_interval=0.05) as srv:
+        status, body = _get(f"{srv.url}/forecast?series=GDP&model=bl0&h=2")
+        assert status == 200 and body["forecast"] == [103.0, 103.0]
+        assert _get(f"{srv.url}/forecast?series=GDP&h=x")[0] == 400
+        assert _get(f"{srv.url}/asof?series=GDP&date=2020-01-01")[0] == 404
+        assert _get(f"{srv.url}/nope")[0] == 404
+
+        _add_vintage(sdir)
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if _get(f"{srv.url}/series")[1]["series"][0]["latest_vintage"] == "2025-07-30":
+                break
+            time.sleep(0.02)
+        assert _get(f"{srv.url}/forecast?series=GDP&h=1")[1]["forecast"] == [107.0]
+        with urllib.request.urlopen(f"{srv.url}/metrics", timeout=5) as r:
+            assert 'stage="server_forecast"' in r.read().decode()
+
+
+def test_unix_socket(tmp_path: Path):
+    _tree(tmp_path)
+    sock_path = tmp_path / "s.sock"
+    with ForecastServer(ForecastService(["GDP"], base=tmp_path), unix_socket=sock_path):
+        with socket.socket(socket.AF_UNIX) as s:
+            s.connect(str(sock_path))
+            s.sendall(b"GET /forecast?series=GDP&h=1 HTTP/1.0\r\n\r\n")
+            data = b""
+            while chunk := s.recv(65536):
+                data += chunk
+    head, body = data.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body)["forecast"] == [103.0]
+    assert not sock_path.exists()
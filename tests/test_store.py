@@ -0,0 +1,73 @@
+# tests/test_store.py
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from nowcast_gdp.dataio import read_all_vintages, read_triangle_slice, read_vintage_array
+from nowcast_gdp.ingest_alfred import persist_all_vintages
+from nowcast_gdp.store import compact_series, has_store, main
+
+
+def _write(p: Path, text: str) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _tree(root: Path) -> Path:
+    sdir = root / "GDP"
+    _write(sdir / "index.csv", "2025-05-29\n2025-06-26\n")
+    _write(sdir / "2025-05-29.csv", "date,value\n2024-10-01,99\n2025-01-01,100\n")
+    _write(sdir / "2025-06-26.csv", "date,value\n2024-10-01,99\n2025-01-01,101\n2025-04-01,\n")
+    return sdir
+
+
+def test_compact_and_readers(tmp_path: Path):
+    sdir = _tree(tmp_path)
+    assert main(["--series", "GDP", "--base", str(tmp_path)]) == 0
+    assert has_store(sdir)
+
+    tri = read_all_vintages("GDP", base=tmp_path)
+    assert tri.shape == (3, 2)
+    assert isinstance(tri.values, np.memmap)
+    np.testing.assert_array_equal(
+        np.asarray(tri.values), [[99.0, 99.0], [100.0, 101.0], [np.nan, np.nan]]
+    )
+
+    dts, vals = read_vintage_array("GDP", date(2025, 6, 26), base=tmp_path)
+    assert dts.tolist() == [date(2024, 10, 1), date(2025, 1, 1)]
+    assert vals.tolist() == [99.0, 101.0]
+
+    sub = read_triangle_slice(
+        "GDP", obs_start=date(2025, 1, 1), vintage_end=date(2025, 5, 29), base=tmp_path
+    )
+    assert sub.shape == (2, 1)
+    assert sub.values[0, 0] == 100.0
+
+
+def test_ingest_keeps_store_current(monkeypatch, tmp_path: Path):
+    sdir = _tree(tmp_path)
+    compact_series(sdir)
+
+    class FakeObs:
+        def __init__(self, d, v):
+            self.date = d
+            self.value = v
+
+    new_v = date(2025, 7, 30)
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.list_vintage_dates",
+        lambda sid: [date(2025, 5, 29), date(2025, 6, 26), new_v],
+    )
+    monkeypatch.setattr(
+        "nowcast_gdp.ingest_alfred.iter_vintage_blocks",
+        lambda sid, v: [[FakeObs(date(2025, 4, 1), 102.5), FakeObs(date(2025, 7, 1), 103.0)]],
+    )
+    persist_all_vintages("GDP", base=tmp_path)
+
+    tri = read_all_vintages("GDP", base=tmp_path)
+    assert tri.shape == (4, 3)
+    assert np.asarray(tri.column(new_v))[-2:].tolist() == [102.5, 103.0]
+    assert len(list((sdir / "_store").glob("gen-*"))) == 1  # old generation cleaned up